@@ -1,83 +1,426 @@
 # backend/app.py
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-import psycopg2
-import os
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import wraps
+import hashlib
 import json
+import math
+import os
+import time
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from src.db import data_version, export, mention_bodies, ranking, rollups, search, topics, visibility
+from src.db.routing import ReplicaRouter
+from src.engines import brands
+from src.utils import compression
+from src.utils.fast_json import make_provider
+from src.utils.fields import Field, Projection, shorten
+from src.utils.pagination import decode_keyset, encode_cursor, estimate_count
+from src.utils.response_cache import ResponseCache
+
 load_dotenv()
 
 app = Flask(__name__)
+app.json = make_provider(app)
 CORS(app)
 
 # --- CONFIGURACIÓN Y HELPERS ---
 
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": int(os.getenv("DB_PORT", 5433)),
-    "database": os.getenv("DB_NAME", "ai_visibility"),
-    "user": os.getenv("DB_USER", "postgres"),
-    "password": os.getenv("DB_PASSWORD", "postgres")
+db_router = ReplicaRouter.from_env()
+
+# Lecturas que deben ver al momento lo escrito por cada endpoint (read-your-writes):
+# van a la primaria hasta que la réplica alcanza la escritura.
+READ_YOUR_WRITES = {
+    'archive_mention': ('get_mentions', 'get_mention', 'search_mentions', 'get_dashboard_kpis'),
+    'update_insight_item': ('get_insights',),
 }
 
+def read_only_request():
+    return request.method in ('GET', 'HEAD') and request.headers.get('X-Read-Consistency') != 'primary'
+
 def get_db_connection():
-    return psycopg2.connect(**DB_CONFIG)
+    """Los GET leen de la réplica si está configurada y al día; el resto, de la primaria."""
+    conn, g.db_route = db_router.connect(read_only=read_only_request(), endpoint=request.endpoint)
+    return conn
+
+def note_write(conn, version=None):
+    """
+    Llamar tras el commit de una escritura (con la versión devuelta por
+    data_version.bump) para aplicar READ_YOUR_WRITES e invalidar la caché.
+    """
+    db_router.note_write(conn, READ_YOUR_WRITES.get(request.endpoint, ()))
+    if version is not None:
+        response_cache.set_version(version)
+
+# Caché de respuestas GET por versión de datos (ver src/utils/response_cache.py).
+response_cache = ResponseCache.from_env()
+
+def load_data_version():
+    conn, _route = db_router.connect(read_only=True)
+    try:
+        with conn.cursor() as cur:
+            return data_version.current(cur)
+    finally:
+        conn.close()
+
+# Las ventanas relativas (range=24h...) terminan en el siguiente múltiplo de
+# WINDOW_BUCKET_SECONDS: dentro del mismo cubo todas las peticiones piden la
+# misma ventana y su respuesta se puede cachear y validar con ETag.
+WINDOW_BUCKET_SECONDS = int(os.getenv('WINDOW_BUCKET_SECONDS', 60))
+
+def window_end(now=None):
+    now = now or datetime.now()
+    return datetime.fromtimestamp(math.ceil(now.timestamp() / WINDOW_BUCKET_SECONDS) * WINDOW_BUCKET_SECONDS)
+
+# El navegador guarda la respuesta pero la revalida siempre (If-None-Match).
+CACHE_CONTROL = 'private, no-cache'
+
+def request_cache_key():
+    """Ruta + parámetros normalizados + cubo de la ventana de la petición en curso."""
+    return f"{response_cache.key(request.path, request.args)}#{window_end():%Y%m%d%H%M%S}"
+
+def response_etag(version, key):
+    return f"{version}-{hashlib.sha1(key.encode()).hexdigest()[:16]}"
+
+def cache_lookup():
+    """
+    (versión, clave, etag, respuesta) de la petición en curso. La respuesta es
+    un 304 o un HIT ya listos, o None si hay que calcularla; sin versión
+    (X-Read-Consistency: primary o data_version ilegible) no se cachea.
+    """
+    version = None
+    if request.headers.get('X-Read-Consistency') != 'primary':
+        version = response_cache.version(load_data_version)
+    if version is None:
+        response_cache.bypass()
+        return None, None, None, None
+
+    key = request_cache_key()
+    etag = response_etag(version, key)
+    matched = [tag for tag in compression.etag_variants(etag) if request.if_none_match.contains_weak(tag)]
+    if matched:
+        response_cache.not_modified()
+        g.cache_status = 'NOT_MODIFIED'
+        return version, key, matched[0], Response(status=304)
+    entry = response_cache.get(key, version) if response_cache.enabled else None
+    if entry:
+        g.cache_status = 'HIT'
+        return version, key, etag, Response(entry.body, mimetype=entry.mimetype)
+    return version, key, etag, None
+
+def cache_store(response, version, key, started):
+    """Guarda una respuesta 200 recién calculada (X-Cache: MISS)."""
+    if response_cache.enabled:
+        response_cache.put(key, version, response.get_data(), response.mimetype,
+                           (time.perf_counter() - started) * 1000)
+    g.cache_status = 'MISS'
+
+def cache_headers(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+def cached(view):
+    """
+    GET condicional y cacheado por versión de datos. El ETag (fuerte) sale de
+    la versión, la ruta con sus parámetros y el cubo de la ventana: si
+    coincide con If-None-Match se responde 304 sin tocar la base de datos; si
+    no, la respuesta sale de la caché o se calcula y se guarda.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version, key, etag, response = cache_lookup()
+        if version is None:
+            return view(*args, **kwargs)
+        if response is None:
+            started = time.perf_counter()
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            cache_store(response, version, key, started)
+        return cache_headers(response, etag)
+    return wrapper
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli según Accept-Encoding (se ejecuta el último: after_request va en orden inverso)."""
+    return compression.compress_response(response, request.accept_encodings)
+
+@app.after_request
+def add_db_route_header(response):
+    if 'db_route' in g:
+        response.headers['X-DB-Route'] = g.db_route
+    if 'cache_status' in g:
+        response.headers['X-Cache'] = g.cache_status
+    return response
 
 def parse_filters(request):
     range_param = request.args.get('range', '30d')
-    end_date = datetime.now()
+    end_date = window_end()
     if range_param == '24h': start_date = end_date - timedelta(hours=24)
     elif range_param == '7d': start_date = end_date - timedelta(days=7)
+    elif range_param == '90d': start_date = end_date - timedelta(days=90)
     else: start_date = end_date - timedelta(days=30)
     
     return { 'range': range_param, 'start_date': start_date, 'end_date': end_date }
 
+def brand_filter(request, params):
+    """Filtro opcional `brand=` tolerante a erratas (word_similarity de pg_trgm sobre mv_brand_daily.brand)."""
+    brand = request.args.get('brand', '').strip()
+    if not brand:
+        return ""
+    params['brand'] = brand
+    return " AND %(brand)s <%% brand"
+
 # --- ENDPOINTS DE LA API ---
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy"})
+    return jsonify({"status": "healthy", "database": db_router.status(), "cache": response_cache.stats()})
+
+def isoformat(value):
+    return value.isoformat() if value else None
+
+MENTION_FIELDS = Projection(
+    columns={
+        'id': "m.id", 'engine': "m.engine", 'source': "m.source", 'sentiment': "m.sentiment",
+        'emotion': "m.emotion", 'confidence_score': "m.confidence_score", 'created_at': "m.created_at",
+        'query': "q.query", 'summary': "m.summary", 'key_topics': "m.key_topics",
+        'generated_insight_id': "m.generated_insight_id", 'response': "b.response",
+        'source_title': "m.source_title", 'source_url': "m.source_url", 'status': "m.status",
+    },
+    fields={
+        'id': Field(('id',)), 'engine': Field(('engine',)), 'source': Field(('source',)),
+        'sentiment': Field(('sentiment',), lambda v: float(v or 0.0)),
+        'emotion': Field(('emotion',), lambda v: v or "neutral"),
+        'confidence_score': Field(('confidence_score',), lambda v: float(v or 0.0)),
+        'created_at': Field(('created_at',), isoformat),
+        'query': Field(('query',)), 'summary': Field(('summary',), text=True),
+        'key_topics': Field(('key_topics',), lambda v: v or []),
+        'generated_insight_id': Field(('generated_insight_id',)),
+        'response': Field(('response',), text=True),
+        'source_title': Field(('source_title',)), 'source_url': Field(('source_url',)),
+        'status': Field(('status',)),
+    },
+    default=('id', 'engine', 'source', 'sentiment', 'emotion', 'confidence_score', 'created_at',
+             'query', 'summary', 'key_topics', 'generated_insight_id'),
+    text_columns=('summary', 'response'),
+)
 
 @app.route('/api/mentions', methods=['GET'])
+@cached
 def get_mentions():
-    """Obtener menciones, con filtro de estado (active/archived)."""
+    """
+    Menciones de la ventana, más recientes primero, con filtro de estado
+    (active/archived) y paginación por cursor sobre (created_at, id): cada
+    página cuesta lo mismo por profunda que sea. El texto completo vive en
+    mention_bodies y solo se incluye con `include=response` (o `fields=`).
+
+    `fields=id,created_at,summary` limita columnas, JOINs y JSON a esos campos
+    y `excerpt_len=N` recorta summary/response a N caracteres en el SELECT.
+
+    `total=estimate` (por defecto en la primera página) da el recuento
+    estimado por el planificador, `total=exact` un COUNT(*) y `total=none`
+    (por defecto con `cursor`) lo omite.
+    """
     try:
         filters = parse_filters(request)
         status = request.args.get('status', 'active')
+        include = ['response'] if 'response' in request.args.get('include', '').split(',') else []
+        selected, excerpt_len = MENTION_FIELDS.parse(request.args, extra=include)
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        after = decode_keyset(request.args.get('cursor'), datetime.fromisoformat, int)
+        total_mode = request.args.get('total', 'none' if after else 'estimate')
+        if total_mode not in ('estimate', 'exact', 'none'):
+            raise ValueError("total debe ser estimate, exact o none")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    try:
         conn = get_db_connection()
         cur = conn.cursor()
-        
-        base_query = """
-        SELECT 
-            m.id, m.engine, m.source, m.response, m.sentiment, m.emotion,
-            m.confidence_score, m.created_at, q.query as query_text,
-            m.summary, m.key_topics, m.generated_insight_id
-        FROM mentions m
-        JOIN queries q ON m.query_id = q.id
-        WHERE m.created_at >= %s AND m.created_at <= %s AND m.status = %s
-        ORDER BY m.created_at DESC
-        """
-        params = [filters['start_date'], filters['end_date'], status]
-        
-        cur.execute(base_query, params)
+
+        where = "m.created_at >= %(start)s AND m.created_at <= %(end)s AND m.status = %(status)s"
+        params = {'start': filters['start_date'], 'end': filters['end_date'], 'status': status, 'limit': limit + 1}
+        page_where = where
+        if after:
+            page_where += " AND (m.created_at, m.id) < (%(after_created_at)s, %(after_id)s)"
+            params['after_created_at'], params['after_id'] = after
+
+        # id y created_at siempre, para el cursor
+        columns = MENTION_FIELDS.needed_columns(selected, always=('id', 'created_at'))
+        cur.execute(f"""
+            SELECT {MENTION_FIELDS.select_sql(columns, excerpt_len)}
+            FROM mentions m
+            {"JOIN queries q ON m.query_id = q.id" if 'query' in columns else ""}
+            {mention_bodies.BODY_JOIN_SQL if 'response' in columns else ""}
+            WHERE {page_where}
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT %(limit)s
+        """, params)
         rows = cur.fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        total = None
+        if total_mode == 'exact':
+            cur.execute(f"SELECT COUNT(*) FROM mentions m WHERE {where}", params)
+            total = cur.fetchone()[0]
+        elif total_mode == 'estimate':
+            total = estimate_count(cur, f"SELECT 1 FROM mentions m WHERE {where}", params)
+        cur.close()
+        conn.close()
         
-        mentions = []
-        for row in rows:
-            mentions.append({
-                "id": row[0], "engine": row[1], "source": row[2],
-                "response": row[3], "sentiment": float(row[4] or 0.0),
-                "emotion": row[5] or "neutral",
-                "confidence_score": float(row[6] or 0.0),
-                "created_at": row[7].isoformat() if row[7] else None, "query": row[8],
-                "summary": row[9], "key_topics": row[10] or [], "generated_insight_id": row[11]
-            })
-        
-        return jsonify({ "mentions": mentions })
+        mentions = [MENTION_FIELDS.shape(row, columns, selected, excerpt_len) for row in rows]
+
+        next_cursor = encode_cursor((rows[-1][1].isoformat(), rows[-1][0])) if has_more else None
+        return jsonify({
+            "mentions": mentions,
+            "pagination": {
+                "limit": limit, "next_cursor": next_cursor, "has_more": has_more,
+                "total": total, "total_is_estimate": total_mode == 'estimate'
+            }
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+MENTION_DETAIL_SQL = f"""
+    SELECT m.id, m.engine, m.source, b.response, m.sentiment, m.emotion,
+           m.confidence_score, m.created_at, q.query, m.summary, m.key_topics,
+           m.generated_insight_id, m.source_title, m.source_url, m.status
+    FROM mentions m
+    {mention_bodies.BODY_JOIN_SQL}
+    LEFT JOIN queries q ON m.query_id = q.id
+"""
+
+def mention_detail(row):
+    return {
+        "id": row[0], "engine": row[1], "source": row[2], "response": row[3],
+        "sentiment": float(row[4] or 0.0), "emotion": row[5] or "neutral",
+        "confidence_score": float(row[6] or 0.0),
+        "created_at": row[7].isoformat() if row[7] else None, "query": row[8],
+        "summary": row[9], "key_topics": row[10] or [], "generated_insight_id": row[11],
+        "source_title": row[12], "source_url": row[13], "status": row[14]
+    }
+
+@app.route('/api/mentions/<int:mention_id>', methods=['GET'])
+@cached
+def get_mention(mention_id):
+    """Detalle de una mención con su texto completo (lectura perezosa de mention_bodies)."""
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute(MENTION_DETAIL_SQL + " WHERE m.id = %s", (mention_id,))
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+
+        if not row:
+            return jsonify({"error": "Mention not found"}), 404
+        return jsonify(mention_detail(row))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/mentions/from-insight/<int:insight_id>', methods=['GET'])
+@cached
+def get_mention_from_insight(insight_id):
+    """Mención original (con texto completo) a partir de la que se generó un insight."""
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute(MENTION_DETAIL_SQL + " WHERE m.generated_insight_id = %s LIMIT 1", (insight_id,))
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+
+        if not row:
+            return jsonify({"error": "Mention not found"}), 404
+        return jsonify(mention_detail(row))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/mentions/search', methods=['GET'])
+@cached
+def search_mentions():
+    """Búsqueda de texto completo (índice GIN) con ranking, resaltado y paginación por cursor."""
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({"error": "El parámetro 'q' es obligatorio"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        after = decode_keyset(request.args.get('cursor'), float, datetime.fromisoformat, int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        start_date = end_date = None
+        if 'range' in request.args:
+            filters = parse_filters(request)
+            start_date, end_date = filters['start_date'], filters['end_date']
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        results, next_after = search.search_mentions(
+            cur, text, limit=limit, after=after, start=start_date, end=end_date,
+            language=request.args.get('lang'), status=request.args.get('status', 'active')
+        )
+        cur.close()
+        conn.close()
+
+        return jsonify({ "results": results, "next_cursor": encode_cursor(next_after) })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def kpi_windows(now):
+    return {
+        'day': (now - timedelta(hours=24), now),
+        'prev_day': (now - timedelta(hours=48), now - timedelta(hours=24)),
+        'week': (now - timedelta(days=7), now),
+    }
+
+def fetch_kpi_totals(cur, now):
+    """Totales de 24h, 24h previas y 7 días con una sola lectura de mention_rollups."""
+    return rollups.fetch_window_totals(cur, kpi_windows(now), granularity='hour')
+
+def fetch_active_queries(cur):
+    cur.execute("SELECT COUNT(*) FROM queries WHERE enabled = true")
+    return cur.fetchone()[0]
+
+def kpis_payload(totals, active_queries):
+    day, prev_day, week = totals['day'], totals['prev_day'], totals['week']
+    weekly_avg = week['mentions'] / 7
+    positive_pct = day['positive'] / day['mentions'] * 100 if day['mentions'] else 0.0
+    week_positive_pct = week['positive'] / week['mentions'] * 100 if week['mentions'] else 0.0
+
+    return {
+        "mentions_24h": day['mentions'],
+        "mentions_24h_delta": round((day['mentions'] - weekly_avg) / weekly_avg * 100, 1) if weekly_avg else 0.0,
+        "positive_sentiment": round(positive_pct, 1),
+        "positive_sentiment_delta": round(positive_pct - week_positive_pct, 1),
+        # Menciones negativas (sentiment < -0.2) en las últimas 24h frente a las 24h previas.
+        "alerts_triggered": day['negative'],
+        "alerts_delta": day['negative'] - prev_day['negative'],
+        "active_queries": active_queries,
+        "queries_delta": 0
+    }
+
+@app.route('/api/dashboard-kpis', methods=['GET'])
+@cached
+def get_dashboard_kpis():
+    """KPIs de la home leídos de mention_rollups (O(buckets), no O(menciones))."""
+    try:
+        now = window_end()
+        conn = get_db_connection()
+        cur = conn.cursor()
+        totals = fetch_kpi_totals(cur, now)
+        active_queries = fetch_active_queries(cur)
+        cur.close()
+        conn.close()
+        return jsonify(kpis_payload(totals, active_queries))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -91,7 +434,9 @@ def archive_mention(mention_id):
         conn = get_db_connection()
         cur = conn.cursor()
         cur.execute("UPDATE mentions SET status = %s WHERE id = %s", (new_status, mention_id))
+        version = data_version.bump(cur, 'api')
         conn.commit()
+        note_write(conn, version)
         cur.close()
         conn.close()
         
@@ -100,6 +445,7 @@ def archive_mention(mention_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/insights/<int:insight_id>', methods=['GET'])
+@cached
 def get_insight_by_id(insight_id):
     """Obtiene un único insight por su ID."""
     try:
@@ -118,6 +464,684 @@ def get_insight_by_id(insight_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Tipos de insight_items que se muestran como tarjetas en /api/insights.
+INSIGHT_CATEGORIES = {
+    'opportunities': ('Opportunity', 'positive'),
+    'risks': ('Risk', 'negative'),
+    'trends': ('Trend', 'neutral'),
+    'top_themes': ('Trend', 'neutral'),
+}
+# Origen de los CTAs: los calls_to_action del análisis y, como tareas
+# derivadas, las primeras tendencias y oportunidades de cada insight.
+CTA_KINDS_SQL = """
+    ((it.kind = 'calls_to_action' AND it.rank <= 3)
+     OR (it.kind IN ('trends', 'opportunities') AND it.rank <= 2))
+"""
+
+def source_domain(url):
+    domain = urlparse(url).netloc if url else ""
+    return domain.replace('www.', '') or "unknown.com"
+
+CARD_FIELDS = Projection(
+    columns={
+        'id': "it.id", 'insight_id': "it.insight_id", 'kind': "it.kind", 'text': "it.text",
+        'created_at': "it.created_at", 'query': "q.query", 'brand': "q.brand", 'topic': "q.topic",
+    },
+    fields={
+        'id': Field(('id',), str), 'insight_id': Field(('insight_id',)),
+        'title': Field(('text',), text=True, length=80),
+        'category': Field(('kind',), lambda kind: INSIGHT_CATEGORIES[kind][0]),
+        'sentiment': Field(('kind',), lambda kind: INSIGHT_CATEGORIES[kind][1]),
+        'excerpt': Field(('text',), text=True, length=200),
+        'tags': Field(('kind', 'brand', 'topic'), lambda kind, brand, topic: [kind, brand or "general", topic or "analysis"]),
+        'starred': Field((), lambda: False),
+        'date': Field(('created_at',), lambda created_at: created_at.strftime('%Y-%m-%d')),
+        'query': Field(('query',)), 'source': Field((), lambda: "ai_analysis"),
+    },
+    text_columns=('text',),
+)
+
+QUOTE_FIELDS = Projection(
+    columns={
+        'text': "it.text", 'source_url': "m.source_url", 'emotion': "m.emotion",
+        'sentiment': "m.sentiment", 'source_title': "m.source_title",
+    },
+    fields={
+        'text': Field(('text',), text=True, length=197),
+        'domain': Field(('source_url',), source_domain),
+        'emotion': Field(('emotion',), lambda v: v or "neutral"),
+        'sentiment': Field(('sentiment',), lambda v: float(v or 0.0)),
+        'source_title': Field(('source_title', 'source_url'), lambda title, url: title or source_domain(url)),
+    },
+    text_columns=('text',),
+)
+
+def cta_text(kind, text):
+    if kind == 'trends':
+        return f"Analyze trend: {text}"
+    if kind == 'opportunities':
+        return f"Leverage opportunity: {text[:60]}..."
+    return text
+
+CTA_SOURCES = {'trends': "trend_analysis", 'opportunities': "opportunity"}
+
+CTA_FIELDS = Projection(
+    columns={
+        'id': "it.id", 'insight_id': "it.insight_id", 'kind': "it.kind", 'text': "it.text",
+        'done': "it.done", 'created_at': "it.created_at",
+    },
+    fields={
+        'id': Field(('id',)), 'insight_id': Field(('insight_id',)), 'text': Field(('kind', 'text'), cta_text, text=True),
+        'done': Field(('done',)), 'source': Field(('kind',), lambda kind: CTA_SOURCES.get(kind, "ai_analysis")),
+        'created_at': Field(('created_at',), isoformat),
+    },
+    text_columns=('text',),
+)
+
+INSIGHT_PROJECTIONS = {'quote': QUOTE_FIELDS, 'cta': CTA_FIELDS}
+
+def fetch_insight_items(cur, insight_type, filters, limit, status='all', selected=None, excerpt_len=None):
+    """
+    Filas de insight_items de la ventana como tarjetas, citas o CTAs (ver
+    get_insights), ya proyectadas. Sin `selected` se devuelven los campos por defecto.
+    """
+    projection = INSIGHT_PROJECTIONS.get(insight_type, CARD_FIELDS)
+    if selected is None:
+        selected = list(projection.default)
+    columns = projection.needed_columns(selected)
+    select = projection.select_sql(columns, excerpt_len) or "1"
+    params = {'start': filters['start_date'], 'end': filters['end_date'], 'limit': limit}
+
+    if insight_type == 'quote':
+        mention_join = ""
+        if set(columns) - {'text'}:
+            mention_join = """
+            LEFT JOIN LATERAL (
+                SELECT source_url, emotion, sentiment, source_title FROM mentions
+                WHERE generated_insight_id = it.insight_id LIMIT 1
+            ) m ON TRUE"""
+        cur.execute(f"""
+            SELECT {select}
+            FROM insight_items it {mention_join}
+            WHERE it.kind = 'quotes' AND it.created_at >= %(start)s AND it.created_at <= %(end)s
+            ORDER BY it.created_at DESC, it.rank
+            LIMIT %(limit)s
+        """, params)
+
+    elif insight_type == 'cta':
+        done_filter = ""
+        if status in ('open', 'done'):
+            done_filter = " AND it.done = %(done)s"
+            params['done'] = status == 'done'
+        cur.execute(f"""
+            SELECT {select}
+            FROM insight_items it
+            WHERE {CTA_KINDS_SQL} AND it.created_at >= %(start)s AND it.created_at <= %(end)s {done_filter}
+            ORDER BY it.created_at DESC, it.insight_id DESC,
+                     array_position(ARRAY['calls_to_action', 'trends', 'opportunities'], it.kind), it.rank
+            LIMIT %(limit)s
+        """, params)
+
+    else:
+        params['kinds'] = list(INSIGHT_CATEGORIES)
+        query_join = "LEFT JOIN queries q ON q.id = it.query_id" if {'query', 'brand', 'topic'} & set(columns) else ""
+        cur.execute(f"""
+            SELECT {select}
+            FROM insight_items it
+            {query_join}
+            WHERE it.kind = ANY(%(kinds)s) AND it.created_at >= %(start)s AND it.created_at <= %(end)s
+              AND it.rank <= 2 AND length(it.text) > 10
+            ORDER BY it.created_at DESC, it.insight_id DESC, it.kind, it.rank
+            LIMIT %(limit)s
+        """, params)
+
+    return [projection.shape(row, columns, selected, excerpt_len) for row in cur.fetchall()]
+
+@app.route('/api/insights', methods=['GET'])
+@cached
+def get_insights():
+    """
+    Insights de la ventana como tarjetas (`type=all`), citas (`quote`) o CTAs
+    (`cta`, con `status=open|done`). Lee filas de insight_items por el índice
+    (kind, created_at) en lugar de recorrer los payloads. Admite `fields=` y
+    `excerpt_len=` como /api/mentions.
+    """
+    try:
+        filters = parse_filters(request)
+        insight_type = request.args.get('type', 'all')
+        status = request.args.get('status', 'all')
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        projection = INSIGHT_PROJECTIONS.get(insight_type, CARD_FIELDS)
+        selected, excerpt_len = projection.parse(request.args)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        result = fetch_insight_items(cur, insight_type, filters, limit, status, selected, excerpt_len)
+        cur.close()
+        conn.close()
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/insight-items/<int:item_id>', methods=['PATCH'])
+def update_insight_item(item_id):
+    """
+    Marca un CTA como hecho o pendiente. `item_id` es el `id` de las tarjetas
+    de /api/insights?type=cta (fila de insight_items), no el de un insight.
+    """
+    try:
+        data = request.get_json() or {}
+        done = bool(data.get('done', False))
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("UPDATE insight_items SET done = %s WHERE id = %s RETURNING id", (done, item_id))
+        updated = cur.fetchone()
+        version = data_version.bump(cur, 'api') if updated else None
+        conn.commit()
+        note_write(conn, version)
+        cur.close()
+        conn.close()
+
+        if not updated:
+            return jsonify({"error": "CTA not found"}), 404
+        return jsonify({"ok": True, "id": item_id, "done": done})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+QUERY_FIELDS = Projection(
+    columns={
+        'id': "id", 'query': "query", 'brand': "brand", 'topic': "topic",
+        'enabled': "enabled", 'created_at': "created_at", 'language': "language",
+    },
+    fields={
+        'id': Field(('id',)), 'query': Field(('query',), text=True), 'brand': Field(('brand',)),
+        'topic': Field(('topic',)), 'enabled': Field(('enabled',)),
+        'created_at': Field(('created_at',), isoformat),
+        'language': Field(('language',), lambda v: v or "en"),
+    },
+    text_columns=('query',),
+)
+
+@app.route('/api/queries', methods=['GET'])
+@cached
+def get_queries():
+    """Queries de monitorización, más recientes primero (admite `fields=`, `excerpt_len=` y `enabled=true|false`)."""
+    try:
+        selected, excerpt_len = QUERY_FIELDS.parse(request.args)
+        columns = QUERY_FIELDS.needed_columns(selected)
+        params = {}
+        enabled_filter = ""
+        if request.args.get('enabled') in ('true', 'false'):
+            enabled_filter = "WHERE enabled = %(enabled)s"
+            params['enabled'] = request.args['enabled'] == 'true'
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT {QUERY_FIELDS.select_sql(columns, excerpt_len) or "1"}
+            FROM queries {enabled_filter}
+            ORDER BY created_at DESC, id DESC
+        """, params)
+        queries = [QUERY_FIELDS.shape(row, columns, selected, excerpt_len) for row in cur.fetchall()]
+        cur.close()
+        conn.close()
+        return jsonify(queries)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def visibility_payload(cur, filters):
+    """
+    Visibility score: oportunidades / (oportunidades + riesgos + tendencias)
+    de los insights de la ventana, global, por día y por query. Sale de
+    visibility_rollups en una sola consulta (ver src/db/visibility.py).
+    """
+    data = visibility.fetch_visibility(cur, filters['start_date'], filters['end_date'])
+    overall_visibility = data['positive'] / max(data['total'], 1) * 100
+    series = [
+        {"date": day.strftime('%b %d'), "score": round(positive / max(total, 1) * 100, 1)}
+        for day, positive, total in data['series']
+    ]
+
+    ranking = []
+    for position, (query_id, positive, total) in enumerate(data['per_query'][:5], start=1):
+        score = positive / max(total, 1) * 100
+        ranking.append({
+            "position": position, "name": f"Query {query_id}", "score": round(score, 1),
+            "delta": round(score - 50, 1), "logo": "/placeholder.svg?height=40&width=40"
+        })
+
+    if not data['per_query']:
+        cur.execute("SELECT id FROM queries ORDER BY id LIMIT 5")
+        ranking = [
+            {"position": position, "name": f"Query {query_id}", "score": 0.0, "delta": 0.0,
+             "logo": "/placeholder.svg?height=40&width=40"}
+            for position, (query_id,) in enumerate(cur.fetchall(), start=1)
+        ]
+        series = [{"date": "No data", "score": 0.0}]
+
+    return {
+        "visibility_score": round(overall_visibility, 1),
+        "delta": round(overall_visibility - 50, 1),
+        "series": series,
+        "ranking": ranking,
+        "debug": {
+            "filters_applied": filters,
+            "total_insights": data['insights'],
+            "query_count": len(data['per_query'])
+        }
+    }
+
+@app.route('/api/visibility', methods=['GET'])
+@cached
+def get_visibility():
+    """Visibility score de la ventana (ver visibility_payload)."""
+    try:
+        filters = parse_filters(request)
+        conn = get_db_connection()
+        cur = conn.cursor()
+        payload = visibility_payload(cur, filters)
+        cur.close()
+        conn.close()
+        return jsonify(payload)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/industry/share-of-voice', methods=['GET'])
+@cached
+def get_share_of_voice():
+    """Share of voice diario por marca, leído de mv_brand_daily."""
+    try:
+        filters = parse_filters(request)
+
+        params = {"start": filters['start_date'].date(), "end": filters['end_date'].date()}
+        brand_sql = brand_filter(request, params)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT day, brand, SUM(mentions)
+            FROM mv_brand_daily
+            WHERE day >= %(start)s AND day <= %(end)s""" + brand_sql + """
+            GROUP BY day, brand
+            ORDER BY day
+        """, params)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+
+        daily_data = {}
+        for day, brand, mentions in rows:
+            daily_data.setdefault(day, {})[brand] = int(mentions)
+
+        sov_data = []
+        for day, brands in daily_data.items():
+            total_mentions = sum(brands.values())
+            day_entry = {"date": day.strftime('%b %d')}
+            for brand, mentions in brands.items():
+                day_entry[brand] = round(mentions / total_mentions * 100, 1)
+            sov_data.append(day_entry)
+
+        return jsonify({
+            "sov_data": sov_data,
+            "debug": { "filters_applied": filters, "days_found": len(sov_data) }
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+RANKING_LIMIT_MAX = 50
+
+def ranking_params(filters, args=None):
+    """
+    Periodo actual, periodo de comparación y top-N del ranking de marcas.
+    `compare=` previous (por defecto), wow, mom o custom (con compare_from y
+    compare_to, YYYY-MM-DD); `limit=` marcas (los empates en el último puesto
+    entran todas). ValueError si algún parámetro no es válido.
+    """
+    args = args or {}
+    compare = args.get('compare', 'previous')
+    compare_from = date.fromisoformat(args['compare_from']) if args.get('compare_from') else None
+    compare_to = date.fromisoformat(args['compare_to']) if args.get('compare_to') else None
+    limit = min(max(int(args.get('limit', ranking.DEFAULT_LIMIT)), 1), RANKING_LIMIT_MAX)
+    return ranking.period_params(filters['start_date'].date(), filters['end_date'].date(),
+                                 compare, compare_from, compare_to, limit)
+
+def industry_ranking_payload(cur, filters, params, brand_sql=""):
+    """
+    Ranking de marcas con variación de menciones y de posición frente al
+    periodo de comparación, en una sola consulta sobre mv_brand_cumulative (ver
+    src/db/ranking.py).
+    """
+    rows, brands_found = ranking.fetch_ranking(cur, params, brand_sql)
+    ranking_rows = [{
+        "pos": row['rank'], "name": row['brand'], "mentions": row['mentions'],
+        "sentiment": row['sentiment'], "delta": row['delta'],
+        "previous_pos": row['previous_rank'], "previous_mentions": row['previous_mentions'],
+        "previous_sentiment": row['previous_sentiment'], "rank_change": row['rank_change'],
+        "logo": f"/placeholder.svg?height=40&width=40&text={row['brand'].replace(' ', '+')}"
+    } for row in rows]
+
+    return {
+        "ranking": ranking_rows,
+        "debug": {
+            "filters_applied": filters,
+            "compare": params['compare'],
+            "comparison_period": f"{params['previous_start']} to {params['previous_end']}",
+            "brands_found": brands_found
+        }
+    }
+
+@app.route('/api/industry/ranking', methods=['GET'])
+@cached
+def get_industry_ranking():
+    """Ranking de marcas (ver industry_ranking_payload); admite `brand=`, `compare=` y `limit=`."""
+    try:
+        filters = parse_filters(request)
+        params = ranking_params(filters, request.args)
+        brand_sql = brand_filter(request, params)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        payload = industry_ranking_payload(cur, filters, params, brand_sql)
+        cur.close()
+        conn.close()
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/industry/competitors', methods=['GET'])
+@cached
+def get_industry_competitors():
+    """Scatter de competidores (sentimiento medio vs menciones), leído de mv_brand_daily."""
+    try:
+        filters = parse_filters(request)
+
+        params = {"start": filters['start_date'].date(), "end": filters['end_date'].date()}
+        brand_sql = brand_filter(request, params)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT brand,
+                   SUM(sentiment_sum) / NULLIF(SUM(sentiment_count), 0) AS avg_sentiment,
+                   SUM(mentions) AS mentions
+            FROM mv_brand_daily
+            WHERE day >= %(start)s AND day <= %(end)s""" + brand_sql + """
+            GROUP BY brand
+            ORDER BY mentions DESC, avg_sentiment DESC
+            LIMIT 15
+        """, params)
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+
+        competitors = [{
+            "name": brand, "sentiment_avg": float(avg_sentiment or 0.0), "mentions": int(mentions),
+            "logo": f"/placeholder.svg?height=40&width=40&text={brand.replace(' ', '+')}"
+        } for brand, avg_sentiment, mentions in rows]
+
+        return jsonify({
+            "competitors": competitors,
+            "debug": { "filters_applied": filters, "total_found": len(competitors) }
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+TOPIC_WORDS = 15
+TOPIC_THEMES = 6
+TOPIC_WORDS_MAX = 100
+
+def topic_words(args):
+    """Nº de palabras de la nube (`limit=`, entre 1 y TOPIC_WORDS_MAX)."""
+    return min(max(int(args.get('limit', TOPIC_WORDS)), 1), TOPIC_WORDS_MAX)
+
+def topics_payload(cur, filters, words=TOPIC_WORDS):
+    """
+    Nube de palabras (topic_frequency) y temas principales (top_themes) de
+    todos los insights de la ventana, con claves canonicalizadas y el top-K
+    cortado en SQL. Sale de topic_rollups (ver src/db/topics.py).
+    """
+    data = topics.fetch_topics(cur, filters['start_date'], filters['end_date'], words=words, themes=TOPIC_THEMES)
+    return {
+        "words": data['words'],
+        "themes": data['themes'],
+        "debug": {"filters_applied": filters, "words_found": data['words_found'], "themes_found": data['themes_found']}
+    }
+
+@app.route('/api/topics', methods=['GET'])
+@cached
+def get_topics():
+    """Temas y frecuencias de la ventana para la nube de palabras (ver topics_payload). `limit` = nº de palabras."""
+    try:
+        filters = parse_filters(request)
+        words = topic_words(request.args)
+        conn = get_db_connection()
+        cur = conn.cursor()
+        payload = topics_payload(cur, filters, words)
+        cur.close()
+        conn.close()
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Widgets de /api/dashboard: se calculan en paralelo, cada uno en una conexión del pool.
+DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', 4))
+DASHBOARD_QUOTES = 5
+dashboard_executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix='dashboard')
+
+def elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+def run_widget(route, fn, *args):
+    """(resultado, ms) de `fn(cur, *args)` en una conexión del pool de `route`."""
+    started = time.perf_counter()
+    with db_router.pooled(route) as conn:
+        with conn.cursor() as cur:
+            return fn(cur, *args), elapsed_ms(started)
+
+def kpi_data(cur, now):
+    return fetch_kpi_totals(cur, now), fetch_active_queries(cur)
+
+def dashboard_widgets(filters):
+    """nombre -> (función, *args) de cada widget de /api/dashboard; cada función recibe su cursor."""
+    ranking_window = ranking_params(filters, request.args)
+    brand_sql = brand_filter(request, ranking_window)
+    return {
+        'kpis': (kpi_data, filters['end_date']),
+        'visibility': (visibility_payload, filters),
+        'topics': (topics_payload, filters),
+        'ranking': (industry_ranking_payload, filters, ranking_window, brand_sql),
+        'quotes': (fetch_insight_items, 'quote', filters, DASHBOARD_QUOTES),
+    }
+
+def dashboard_payload(filters, route, results, timings, workers):
+    totals, active_queries = results.pop('kpis')
+    return {
+        "kpis": kpis_payload(totals, active_queries),
+        "mention_counts": {"24h": totals['day']['mentions'], "7d": totals['week']['mentions']},
+        **results,
+        "debug": {
+            "filters_applied": filters,
+            "db_route": route,
+            "workers": workers,
+            "timings_ms": timings
+        }
+    }
+
+@app.route('/api/dashboard', methods=['GET'])
+@cached
+def get_dashboard():
+    """
+    Todos los widgets de la home (KPIs, visibility, temas, ranking de marcas y
+    citas) para un mismo filtro en una sola petición, con las mismas formas
+    que sus endpoints. El destino (primaria o réplica) y la ventana se deciden
+    una vez; los widgets corren en paralelo en DASHBOARD_WORKERS hilos con
+    conexiones del pool. Los totales de 24h/48h/7d salen de una sola lectura
+    de mention_rollups y dan los KPIs y los contadores de menciones.
+    `debug.timings_ms` lleva el tiempo de cada widget y el total.
+    """
+    try:
+        started = time.perf_counter()
+        filters = parse_filters(request)
+        widgets = dashboard_widgets(filters)
+        route = g.db_route = db_router.choose(read_only_request(), request.endpoint)
+
+        futures = {name: dashboard_executor.submit(run_widget, route, *widget) for name, widget in widgets.items()}
+        results, timings = {}, {}
+        for name, future in futures.items():
+            results[name], timings[name] = future.result()
+
+        timings['total'] = elapsed_ms(started)
+        return jsonify(dashboard_payload(filters, route, results, timings, DASHBOARD_WORKERS))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+INSIGHT_EXPORT_FIELDS = Projection(
+    columns={
+        'id': "i.id", 'created_at': "i.created_at", 'query_id': "i.query_id", 'query': "q.query",
+        'brand': "q.brand", 'topic': "q.topic", 'payload': "i.payload",
+    },
+    fields={
+        'id': Field(('id',)), 'created_at': Field(('created_at',), isoformat),
+        'query_id': Field(('query_id',)), 'query': Field(('query',)), 'brand': Field(('brand',)),
+        'topic': Field(('topic',)), 'payload': Field(('payload',)),
+    },
+)
+
+# entidad -> (proyección, alias de la tabla, FROM/JOINs según las columnas pedidas)
+EXPORTS = {
+    'mentions': (MENTION_FIELDS, "m", lambda columns: "mentions m"
+                 + (" JOIN queries q ON m.query_id = q.id" if 'query' in columns else "")
+                 + (f" {mention_bodies.BODY_JOIN_SQL}" if 'response' in columns else "")),
+    'insights': (INSIGHT_EXPORT_FIELDS, "i", lambda columns: "insights i"
+                 + (" LEFT JOIN queries q ON q.id = i.query_id" if {'query', 'brand', 'topic'} & set(columns) else "")),
+}
+
+def export_window():
+    """`from`/`to` (ISO) si se dan; si no, `range` como el dashboard (`range=all`: sin límite)."""
+    if 'from' in request.args or 'to' in request.args:
+        start = datetime.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = datetime.fromisoformat(request.args['to']) if request.args.get('to') else None
+        return start, end
+    if request.args.get('range') == 'all':
+        return None, None
+    filters = parse_filters(request)
+    return filters['start_date'], filters['end_date']
+
+@app.route('/api/export/<entity>', methods=['GET'])
+def export_data(entity):
+    """
+    Exportación completa de menciones o insights en NDJSON (`format=ndjson`)
+    o CSV (`format=csv`), en streaming desde un cursor del servidor (ver
+    src/db/export.py). Filtros: `range` o `from`/`to`, `status` (menciones,
+    `all` para ambos), `engine`, `query_id`, y `fields`/`excerpt_len` como
+    los listados. `cursor` reanuda tras la última fila recibida.
+    """
+    if entity not in EXPORTS:
+        return jsonify({"error": f"Exportación desconocida: {entity}"}), 404
+    projection, alias, from_sql = EXPORTS[entity]
+    try:
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in export.MIMETYPES:
+            raise ValueError("format debe ser ndjson o csv")
+        selected, excerpt_len = projection.parse(request.args)
+        selected = ['id', 'created_at'] + [name for name in selected if name not in ('id', 'created_at')]
+        after = decode_keyset(request.args.get('cursor'), datetime.fromisoformat, int)
+        start, end = export_window()
+
+        conditions, params = [], {}
+        if start:
+            conditions.append(f"{alias}.created_at >= %(start)s")
+            params['start'] = start
+        if end:
+            conditions.append(f"{alias}.created_at <= %(end)s")
+            params['end'] = end
+        if after:
+            conditions.append(f"({alias}.created_at, {alias}.id) > (%(after_created_at)s, %(after_id)s)")
+            params['after_created_at'], params['after_id'] = after
+        if request.args.get('query_id'):
+            conditions.append(f"{alias}.query_id = %(query_id)s")
+            params['query_id'] = int(request.args['query_id'])
+        if entity == 'mentions':
+            status = request.args.get('status', 'active')
+            if status != 'all':
+                conditions.append("m.status = %(status)s")
+                params['status'] = status
+            if request.args.get('engine'):
+                conditions.append("m.engine = %(engine)s")
+                params['engine'] = request.args['engine']
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    columns = projection.needed_columns(selected)
+    sql = f"""
+        SELECT {projection.select_sql(columns, excerpt_len)}
+        FROM {from_sql(columns)}
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY {alias}.created_at, {alias}.id
+    """
+    try:
+        conn = get_db_connection()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    size = export.chunk_rows()
+    dumps = app.json.dumps
+
+    def generate():
+        try:
+            first = True
+            for rows in export.stream_rows(conn, sql, params, size):
+                records = [projection.shape(row, columns, selected, excerpt_len) for row in rows]
+                if fmt == 'csv':
+                    yield export.csv_chunk(records, selected, header=first)
+                else:
+                    yield export.ndjson_chunk(records, dumps)
+                first = False
+            if first and fmt == 'csv':
+                yield export.csv_chunk([], selected, header=True)
+        finally:
+            conn.close()
+
+    filename = f"{entity}-{datetime.now():%Y%m%d-%H%M%S}.{fmt}"
+    return Response(stream_with_context(generate()), mimetype=export.MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@app.route('/api/brands/discover', methods=['GET'])
+@cached
+def discover_brands():
+    """Candidatos de marca con nombre parecido (erratas, nombres parciales), ordenados por similitud."""
+    name = request.args.get('name', '').strip()
+    if len(name) < 3:
+        return jsonify({"error": "El parámetro 'name' debe tener al menos 3 caracteres"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+        threshold = float(request.args.get('threshold', 0.3))
+        if math.isnan(threshold):
+            raise ValueError("El parámetro 'threshold' debe ser un número entre 0 y 1")
+        threshold = min(max(threshold, 0.0), 1.0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        result = brands.discover(cur, name, limit=limit, threshold=threshold)
+        cur.close()
+        conn.close()
+        return jsonify({"name": name, **result})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # (Aquí puedes añadir el resto de tus endpoints si los necesitas)
 
 if __name__ == '__main__':
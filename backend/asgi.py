@@ -0,0 +1,304 @@
+# backend/asgi.py
+"""
+Modo de servicio asíncrono (ASGI) de la API, con las mismas rutas y
+respuestas que app.py:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5050 [--workers 2]
+
+• Las rutas de agregados (ASYNC_VIEWS: dashboard, KPIs, visibility, temas y
+  ranking) se atienden en el bucle de eventos con un pool asíncrono de
+  psycopg 3 por destino (primaria/réplica): una consulta lenta no ocupa un
+  hilo mientras espera a Postgres y los widgets de /api/dashboard se lanzan a
+  la vez, cada uno en su conexión.
+• El resto de rutas pasan a la app Flask tal cual, en un pool de hilos (a2wsgi).
+
+Las vistas asíncronas usan las funciones de payload de app.py sin cambios
+(`fn(cur, ...)`, síncronas): run_sync() las ejecuta en una greenlet y cada
+consulta de su cursor (SyncCursor) se espera en el bucle. También corren
+dentro del contexto de petición de Flask, así que comparten la caché de
+respuestas, los ETag/304, la compresión, CORS y las cabeceras X-DB-Route y
+X-Cache de la versión WSGI.
+"""
+import asyncio
+import contextvars
+import io
+import os
+import sys
+import time
+from functools import wraps
+from typing import Dict
+
+from a2wsgi import WSGIMiddleware
+from flask import g, jsonify, request
+from greenlet import getcurrent, greenlet
+from psycopg import AsyncClientCursor
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+import app as api
+from src.db.connection import DB_CONFIG
+from src.db.routing import DEFAULT_POOL_SIZE
+
+flask_app = api.app
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', DEFAULT_POOL_SIZE))
+# Hilos para las rutas que siguen en Flask (WSGI).
+ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 10))
+
+# destino ("primary" | "replica") -> pool asíncrono; se abren en el arranque (lifespan).
+pools: Dict[str, AsyncConnectionPool] = {}
+
+# --- CÓDIGO SÍNCRONO SOBRE EL BUCLE DE EVENTOS ---
+
+class _Bridge(greenlet):
+    """Greenlet de run_sync(): `driver` es la greenlet del bucle que espera por ella."""
+
+    def __init__(self, fn, driver):
+        super().__init__(fn, driver)
+        self.driver = driver
+
+def await_only(awaitable):
+    """Espera `awaitable` desde código síncrono que corre dentro de run_sync()."""
+    current = getcurrent()
+    if not isinstance(current, _Bridge):
+        raise RuntimeError("await_only() solo se puede usar dentro de run_sync()")
+    return current.driver.switch(awaitable)
+
+async def run_sync(fn, *args):
+    """Ejecuta `fn(*args)` en una greenlet; cada await_only() de dentro se espera aquí, sin bloquear el bucle."""
+    bridge = _Bridge(fn, getcurrent())
+    bridge.gr_context = contextvars.copy_context()
+    result = bridge.switch(*args)
+    while not bridge.dead:
+        try:
+            value = await result
+        except BaseException as exc:
+            result = bridge.throw(type(exc), exc, exc.__traceback__)
+        else:
+            result = bridge.switch(value)
+    return result
+
+class SyncCursor:
+    """Cursor con la interfaz de psycopg2 (execute/fetchone/fetchall) sobre un cursor asíncrono de psycopg 3."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, sql, params=None):
+        await_only(self._cursor.execute(sql, params))
+
+    def fetchone(self):
+        return await_only(self._cursor.fetchone())
+
+    def fetchall(self):
+        return await_only(self._cursor.fetchall())
+
+    def close(self):
+        pass
+
+# --- POOLS ---
+
+def conninfo(route):
+    if route == 'replica':
+        return api.db_router.replica_dsn
+    config = dict(DB_CONFIG)
+    config['dbname'] = config.pop('database')
+    return make_conninfo(**config)
+
+async def open_pools():
+    # ClientCursor: parámetros %(nombre)s interpolados en el cliente, como psycopg2.
+    routes = ('primary', 'replica') if api.db_router.replica_dsn else ('primary',)
+    for route in routes:
+        pools[route] = AsyncConnectionPool(
+            conninfo(route), min_size=1, max_size=DB_POOL_SIZE, open=False,
+            kwargs={'cursor_factory': AsyncClientCursor, 'autocommit': True},
+        )
+        await pools[route].open()
+
+async def close_pools():
+    for route in list(pools):
+        await pools.pop(route).close()
+
+async def choose_route():
+    """Como db_router.choose(); la comprobación de la réplica (psycopg2) va a un hilo."""
+    if not api.db_router.replica_dsn:
+        return 'primary'
+    return await asyncio.to_thread(api.db_router.choose, api.read_only_request(), request.endpoint)
+
+async def run_widget(route, fn, *args):
+    """(resultado, ms) de `fn(cur, *args)` en una conexión del pool asíncrono de `route`."""
+    started = time.perf_counter()
+    async with pools[route].connection() as conn:
+        async with conn.cursor() as cursor:
+            return await run_sync(fn, SyncCursor(cursor), *args), api.elapsed_ms(started)
+
+# --- VISTAS ASÍNCRONAS ---
+
+# ruta -> vista async (solo GET/HEAD); el resto de rutas las atiende Flask.
+ASYNC_VIEWS = {}
+
+def route(path):
+    def register(view):
+        ASYNC_VIEWS[path] = view
+        return view
+    return register
+
+def cached(view):
+    """`app.cached` para vistas async; la lectura de data_version (psycopg2, cada pocos segundos) va a un hilo."""
+    @wraps(view)
+    async def wrapper():
+        version, key, etag, response = await asyncio.to_thread(api.cache_lookup)
+        if version is None:
+            return await view()
+        if response is None:
+            started = time.perf_counter()
+            response = flask_app.make_response(await view())
+            if response.status_code != 200:
+                return response
+            api.cache_store(response, version, key, started)
+        return api.cache_headers(response, etag)
+    return wrapper
+
+def handle_errors(view):
+    """Errores como en las vistas de app.py: ValueError -> 400 y el resto -> 500."""
+    @wraps(view)
+    async def wrapper():
+        try:
+            return await view()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+    return wrapper
+
+@route('/api/dashboard')
+@cached
+@handle_errors
+async def get_dashboard():
+    """Como app.get_dashboard, con todos los widgets a la vez en conexiones del pool asíncrono."""
+    started = time.perf_counter()
+    filters = api.parse_filters(request)
+    widgets = api.dashboard_widgets(filters)
+    db_route = g.db_route = await choose_route()
+
+    done = await asyncio.gather(*(run_widget(db_route, *widget) for widget in widgets.values()))
+    results, timings = {}, {}
+    for name, (result, ms) in zip(widgets, done):
+        results[name], timings[name] = result, ms
+
+    timings['total'] = api.elapsed_ms(started)
+    return jsonify(api.dashboard_payload(filters, db_route, results, timings, DB_POOL_SIZE))
+
+@route('/api/dashboard-kpis')
+@cached
+@handle_errors
+async def get_dashboard_kpis():
+    db_route = g.db_route = await choose_route()
+    (totals, active_queries), _ms = await run_widget(db_route, api.kpi_data, api.window_end())
+    return jsonify(api.kpis_payload(totals, active_queries))
+
+@route('/api/visibility')
+@cached
+@handle_errors
+async def get_visibility():
+    filters = api.parse_filters(request)
+    db_route = g.db_route = await choose_route()
+    payload, _ms = await run_widget(db_route, api.visibility_payload, filters)
+    return jsonify(payload)
+
+@route('/api/topics')
+@cached
+@handle_errors
+async def get_topics():
+    filters = api.parse_filters(request)
+    words = api.topic_words(request.args)
+    db_route = g.db_route = await choose_route()
+    payload, _ms = await run_widget(db_route, api.topics_payload, filters, words)
+    return jsonify(payload)
+
+@route('/api/industry/ranking')
+@cached
+@handle_errors
+async def get_industry_ranking():
+    filters = api.parse_filters(request)
+    params = api.ranking_params(filters, request.args)
+    brand_sql = api.brand_filter(request, params)
+    db_route = g.db_route = await choose_route()
+    payload, _ms = await run_widget(db_route, api.industry_ranking_payload, filters, params, brand_sql)
+    return jsonify(payload)
+
+# --- APLICACIÓN ASGI ---
+
+def wsgi_environ(scope):
+    """Entorno WSGI de una petición ASGI sin cuerpo, para abrir el contexto de petición de Flask."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name, value = name.decode('latin-1').upper().replace('-', '_'), value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await open_pools()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_pools()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def respond(view, scope, send):
+    with flask_app.request_context(wsgi_environ(scope)):
+        response = flask_app.preprocess_request()
+        if response is None:
+            response = await view()
+        response = flask_app.process_response(flask_app.make_response(response))
+        body = b'' if scope['method'] == 'HEAD' else response.get_data()
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+wsgi_app = WSGIMiddleware(flask_app, workers=ASGI_WSGI_THREADS)
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    view = ASYNC_VIEWS.get(scope['path']) if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD') else None
+    if view is None:
+        return await wsgi_app(scope, receive, send)
+    await respond(view, scope, send)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run('asgi:app', host='0.0.0.0', port=5050, workers=int(os.getenv('ASGI_WORKERS', 1)))
@@ -0,0 +1,157 @@
+# backend/benchmark_ranking.py
+"""
+Benchmark del ranking de marcas (/api/industry/ranking).
+
+Crea tablas sintéticas UNLOGGED con la forma de mv_brand_daily (día × marca,
+--brands marcas durante --days días, 365 por defecto) y de
+mv_brand_cumulative, y mide para varias comparaciones (mediana de --repeat,
+de extremo a extremo con psycopg2):
+  • two_scans: una consulta por periodo y el cruce en Python (posiciones,
+    variación y cambio de puesto), como la primera versión del endpoint
+  • filter_scan: una sola lectura de los días de ambos periodos en
+    mv_brand_daily con SUM(...) FILTER y rank()
+  • cumulative: ranking.fetch_ranking() sobre los acumulados (4 filas por
+    marca), lo que usa ahora la API
+
+Uso:
+    python benchmark_ranking.py [--brands 1000] [--days 365] [--repeat 7] [--keep]
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+import psycopg2
+from tabulate import tabulate
+
+from src.db import industry_views, ranking
+from src.db.connection import DB_CONFIG
+
+FACTS = "bench_brand_daily"
+CUMULATIVE = "bench_brand_cumulative"
+
+# (nombre, días del periodo actual, comparación)
+CASES = (("7d wow", 7, "wow"), ("30d previous", 30, "previous"), ("30d mom", 30, "mom"),
+         ("90d previous", 90, "previous"), ("180d previous", 180, "previous"))
+
+
+def create_table(cur, brands, days, today):
+    cur.execute(f"DROP TABLE IF EXISTS {FACTS}, {CUMULATIVE}")
+    # Marcas con volumen muy desigual (unas pocas dominan) y huecos en días sin menciones.
+    cur.execute(f"""
+        CREATE UNLOGGED TABLE {FACTS} AS
+        SELECT %(today)s::date - d AS day, 'Marca ' || b AS brand,
+               (1 + random() * 2000 / b)::bigint AS mentions,
+               (1 + random() * 2000 / b)::bigint AS occurrences,
+               (random() * 2 - 1) * (1 + 2000 / b) AS sentiment_sum,
+               (1 + 2000 / b)::bigint AS sentiment_count
+        FROM generate_series(0, %(days)s - 1) d, generate_series(1, %(brands)s) b
+        WHERE random() < 0.8
+    """, {"today": today, "days": days, "brands": brands})
+    cur.execute(f"CREATE UNIQUE INDEX ON {FACTS} (day, brand)")
+    cur.execute(f"CREATE UNLOGGED TABLE {CUMULATIVE} AS {industry_views.BRAND_CUMULATIVE_SQL.format(source=FACTS)}")
+    cur.execute(f"CREATE UNIQUE INDEX ON {CUMULATIVE} (day, brand)")
+    for table in (FACTS, CUMULATIVE):
+        cur.execute(f"ANALYZE {table}")
+
+
+def two_scans(cur, params, limit):
+    """Un agregado por periodo y el cruce, las posiciones y las variaciones en Python."""
+    periods = {}
+    for period in ("current", "previous"):
+        cur.execute(f"""
+            SELECT brand, SUM(mentions), SUM(sentiment_sum) / NULLIF(SUM(sentiment_count), 0)
+            FROM {FACTS} WHERE day BETWEEN %s AND %s GROUP BY brand
+        """, (params[f"{period}_start"], params[f"{period}_end"]))
+        periods[period] = {brand: (int(mentions), sentiment) for brand, mentions, sentiment in cur.fetchall()}
+    previous_order = sorted(periods["previous"], key=lambda brand: -periods["previous"][brand][0])
+    previous_rank = {brand: position for position, brand in enumerate(previous_order, start=1)}
+    rows = []
+    for position, brand in enumerate(sorted(periods["current"], key=lambda b: -periods["current"][b][0])[:limit], start=1):
+        mentions, _ = periods["current"][brand]
+        previous = periods["previous"].get(brand, (0, None))[0]
+        rows.append((brand, mentions, previous, position, previous_rank.get(brand)))
+    return rows
+
+
+def filter_scan(cur, params, limit):
+    """Los dos periodos en una lectura de los hechos diarios, con FILTER y rank()."""
+    cur.execute(f"""
+        SELECT * FROM (
+            SELECT brand, current_mentions, previous_mentions,
+                   rank() OVER (ORDER BY current_mentions DESC NULLS LAST) AS current_rank,
+                   rank() OVER (ORDER BY previous_mentions DESC NULLS LAST) AS previous_rank
+            FROM (
+                SELECT brand,
+                       SUM(mentions) FILTER (WHERE day BETWEEN %(current_start)s AND %(current_end)s) AS current_mentions,
+                       SUM(sentiment_sum) FILTER (WHERE day BETWEEN %(current_start)s AND %(current_end)s)
+                           / NULLIF(SUM(sentiment_count) FILTER (WHERE day BETWEEN %(current_start)s AND %(current_end)s), 0),
+                       SUM(mentions) FILTER (WHERE day BETWEEN %(previous_start)s AND %(previous_end)s) AS previous_mentions,
+                       SUM(sentiment_sum) FILTER (WHERE day BETWEEN %(previous_start)s AND %(previous_end)s)
+                           / NULLIF(SUM(sentiment_count) FILTER (WHERE day BETWEEN %(previous_start)s AND %(previous_end)s), 0)
+                FROM {FACTS}
+                WHERE day BETWEEN %(current_start)s AND %(current_end)s OR day BETWEEN %(previous_start)s AND %(previous_end)s
+                GROUP BY brand
+            ) facts
+        ) ranked
+        WHERE current_mentions > 0 AND current_rank <= %(limit)s
+        ORDER BY current_rank
+    """, {**params, "limit": limit})
+    return cur.fetchall()
+
+
+def cumulative(cur, params, limit):
+    return ranking.fetch_ranking(cur, {**params, "limit": limit}, table=CUMULATIVE)[0]
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def run(brands, days, repeat, keep):
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    today = date.today()
+    started = time.perf_counter()
+    print(f"🏗️  Creando {FACTS} con {brands:,} marcas en {days} días...")
+    create_table(cur, brands, days, today)
+    conn.commit()
+    for table in (FACTS, CUMULATIVE):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        print(f"   {table}: {cur.fetchone()[0]:,} filas")
+    print(f"   {time.perf_counter() - started:.1f} s\n")
+
+    table = []
+    for name, window, compare in CASES:
+        params = ranking.period_params(today - timedelta(days=window - 1), today, compare)
+        if params["previous_start"] < today - timedelta(days=days - 1):
+            continue
+        row = [name]
+        for fn in (two_scans, filter_scan, cumulative):
+            ms, result = _median_ms(lambda: fn(cur, params, ranking.DEFAULT_LIMIT), repeat)
+            row.append(f"{ms:.1f}")
+        row.append(len(result))
+        table.append(row)
+    conn.rollback()
+
+    print(tabulate(table, headers=["comparación", "two_scans ms", "filter_scan ms", "cumulative ms", "filas"]))
+
+    if not keep:
+        cur.execute(f"DROP TABLE {FACTS}, {CUMULATIVE}")
+        conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--brands", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="No borrar las tablas sintéticas")
+    args = parser.parse_args()
+    run(args.brands, args.days, args.repeat, args.keep)
@@ -0,0 +1,133 @@
+# backend/benchmark_search.py
+"""
+Benchmark de la búsqueda de texto completo frente a ILIKE.
+
+Crea una tabla sintética `bench_search_mentions` (UNLOGGED) con N filas de
+texto aleatorio y la misma columna generada `search_vector` que `mentions`,
+la indexa con GIN y compara con EXPLAIN ANALYZE:
+  • ILIKE '%termino%' (lo que hacían los scripts ad hoc, seq scan)
+  • search_vector @@ tsquery, primera página ordenada por ranking
+  • segunda página con paginación por clave
+
+Uso:
+    python benchmark_search.py [--rows 1000000] [--keep]
+"""
+import argparse
+import re
+import time
+
+import psycopg2
+
+from src.db import search
+from src.db.connection import DB_CONFIG
+
+TABLE = "bench_search_mentions"
+
+WORDS = (
+    "galleta cookie biscuit chocolate vainilla crujiente receta tienda precio oferta "
+    "oreo biscoff keebler nabisco pepperidge sabor dulce salado integral avena "
+    "gluten vegano calidad marca opinión recomendación supermercado desayuno merienda "
+    "healthy snack crunchy flavor price brand quality review recipe store butter"
+).split()
+
+TERMS = ("biscoff", "galleta vegana", "chocolate crunchy")
+
+
+def create_table(cur, rows):
+    cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    cur.execute(f"""
+        CREATE UNLOGGED TABLE {TABLE} (
+            id BIGINT PRIMARY KEY,
+            created_at TIMESTAMP NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active',
+            search_config regconfig NOT NULL,
+            source_title TEXT,
+            summary TEXT,
+            response TEXT NOT NULL,
+            search_vector tsvector GENERATED ALWAYS AS ({search.SEARCH_VECTOR_SQL}) STORED
+        )
+    """)
+    # Texto realista: la mayoría de tokens son relleno pseudoaleatorio (~20k
+    # distintos) y cada fila lleva solo un par de palabras del dominio.
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in WORDS) + "]"
+    cur.execute(f"""
+        INSERT INTO {TABLE} (id, created_at, search_config, source_title, summary, response)
+        SELECT g,
+               now() - (random() * interval '90 days'),
+               CASE WHEN g %% 2 = 0 THEN 'spanish'::regconfig ELSE 'english'::regconfig END,
+               (SELECT string_agg(substr(md5(((random() * 20000)::int + 0 * s)::text), 1, 6), ' ') FROM generate_series(1, 5) AS s),
+               (SELECT string_agg(substr(md5(((random() * 20000)::int + 0 * s)::text), 1, 6), ' ') FROM generate_series(1, 15) AS s)
+                   || ' ' || w[1 + (random() * {len(WORDS) - 1})::int],
+               (SELECT string_agg(substr(md5(((random() * 20000)::int + 0 * s)::text), 1, 6), ' ') FROM generate_series(1, 60 + g %% 7) AS s)
+                   || ' ' || w[1 + (random() * {len(WORDS) - 1})::int]
+                   || ' ' || w[1 + (random() * {len(WORDS) - 1})::int]
+        FROM generate_series(1, %s) AS g,
+             (SELECT {words} AS w) v
+    """, (rows,))
+    cur.execute(f"CREATE INDEX ON {TABLE} USING GIN (search_vector)")
+    cur.execute(f"ANALYZE {TABLE}")
+
+
+def explain(cur, sql, params):
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+    plan = "\n".join(row[0] for row in cur.fetchall())
+    ms = float(re.search(r"Execution Time: ([\d.]+) ms", plan).group(1))
+    return ms, plan
+
+
+def run(rows, keep):
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    started = time.perf_counter()
+    print(f"🏗️  Creando {TABLE} con {rows:,} filas...")
+    create_table(cur, rows)
+    conn.commit()
+    print(f"   {time.perf_counter() - started:.1f} s")
+
+    tsquery = search.build_tsquery_sql()
+    ranked_sql = f"""
+        SELECT id, created_at, rank FROM (
+            SELECT id, created_at, ts_rank_cd(search_vector, q.tsq)::float8 AS rank
+            FROM {TABLE}, (SELECT {tsquery} AS tsq) q
+            WHERE search_vector @@ q.tsq AND status = 'active'
+        ) hits
+        {{keyset}}
+        ORDER BY rank DESC, created_at DESC, id DESC
+        LIMIT 20
+    """
+
+    print(f"\n{'término':<20} {'ILIKE (ms)':>12} {'FTS p1 (ms)':>12} {'FTS p2 (ms)':>12}")
+    for term in TERMS:
+        ilike_ms, _ = explain(
+            cur,
+            f"SELECT id FROM {TABLE} WHERE response ILIKE %(pattern)s OR summary ILIKE %(pattern)s "
+            f"ORDER BY created_at DESC LIMIT 20",
+            {"pattern": f"%{term.split()[0]}%"},
+        )
+        first_ms, plan = explain(cur, ranked_sql.format(keyset=""), {"q": term})
+        cur.execute(ranked_sql.format(keyset=""), {"q": term})
+        page = cur.fetchall()
+        second_ms = 0.0
+        if page:
+            last_id, last_created_at, last_rank = page[-1]
+            second_ms, _ = explain(
+                cur,
+                ranked_sql.format(keyset="WHERE (rank, created_at, id) < (%(r)s, %(c)s, %(i)s)"),
+                {"q": term, "r": last_rank, "c": last_created_at, "i": last_id},
+            )
+        print(f"{term:<20} {ilike_ms:>12.1f} {first_ms:>12.1f} {second_ms:>12.1f}")
+        if "Bitmap Index Scan" not in plan:
+            print("   ⚠️  El plan FTS no usa el índice GIN")
+
+    if not keep:
+        cur.execute(f"DROP TABLE {TABLE}")
+        conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keep", action="store_true", help="No borrar la tabla sintética")
+    args = parser.parse_args()
+    run(args.rows, args.keep)
@@ -0,0 +1,128 @@
+# backend/benchmark_serialization.py
+"""
+Benchmark de serialización JSON + compresión de las respuestas de la API.
+
+Genera páginas como las de /api/mentions?include=response (menciones con su
+texto completo, el peor caso) de varios tamaños y mide, para cada proveedor
+JSON (el de Flask por defecto, el de la stdlib de src/utils/fast_json.py y
+orjson) y cada codificación (sin comprimir, gzip, brotli si está instalado):
+  • tiempo de serialización y de compresión (mediana de --repeat)
+  • bytes en el cable
+
+Con --source db las menciones salen de la base de datos (vía la propia API)
+en lugar de generarse.
+
+Uso:
+    python benchmark_serialization.py [--rows 50,200,1000] [--repeat 7] [--source synthetic|db]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from tabulate import tabulate
+
+from src.utils import compression
+from src.utils.fast_json import OrjsonProvider, StdlibProvider, orjson
+
+WORDS = (
+    "galleta cookie biscuit chocolate vainilla crujiente receta tienda precio oferta "
+    "oreo biscoff keebler nabisco pepperidge sabor dulce salado integral avena "
+    "gluten vegano calidad marca opinión recomendación supermercado desayuno merienda "
+    "healthy snack crunchy flavor price brand quality review recipe store butter "
+    "according to several sources the most popular options include however many users "
+    "prefer alternatives with less sugar and more fiber while others value texture"
+).split()
+
+ENGINES = ("gpt-4", "pplx-7b-chat", "serpapi")
+EMOTIONS = ("alegría", "confianza", "neutral", "enojo", "tristeza")
+
+
+def _paragraph(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def synthetic_mentions(rows, seed=42):
+    """Menciones con la forma de /api/mentions?include=response (≈2 KB de texto cada una)."""
+    rng = random.Random(seed)
+    now = datetime(2026, 10, 19, 12, 0)
+    mentions = []
+    for i in range(rows):
+        response = "\n\n".join(_paragraph(rng, rng.randint(40, 90)) for _ in range(rng.randint(3, 6)))
+        mentions.append({
+            "id": 100000 - i, "engine": rng.choice(ENGINES), "source": rng.choice(ENGINES),
+            "sentiment": round(rng.uniform(-1, 1), 4), "emotion": rng.choice(EMOTIONS),
+            "confidence_score": round(rng.uniform(0.5, 1), 4),
+            "created_at": (now - timedelta(minutes=7 * i)).isoformat(),
+            "query": f"best cookies {i % 20}", "summary": _paragraph(rng, 20),
+            "key_topics": rng.sample(WORDS, 4), "generated_insight_id": rng.choice([None, 5000 + i]),
+            "response": response,
+        })
+    return mentions
+
+
+def db_mentions(rows):
+    from app import app
+
+    client = app.test_client()
+    mentions, cursor = [], None
+    while len(mentions) < rows:
+        url = f"/api/mentions?include=response&limit=200&total=none&range=30d{f'&cursor={cursor}' if cursor else ''}"
+        page = client.get(url, headers={"X-Read-Consistency": "primary"}).get_json()
+        mentions += page["mentions"]
+        cursor = page["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    return mentions[:rows]
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización JSON y compresión")
+    parser.add_argument("--rows", default="50,200,1000")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--source", choices=("synthetic", "db"), default="synthetic")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {"flask (por defecto)": DefaultJSONProvider(app), "stdlib": StdlibProvider(app)}
+    if orjson:
+        providers["orjson"] = OrjsonProvider(app)
+    encodings = ("identity",) + compression.ENCODINGS
+    if not compression.brotli:
+        print("ℹ️  brotli no está instalado: solo gzip")
+
+    table = []
+    with app.app_context():
+        for rows in (int(value) for value in args.rows.split(",")):
+            mentions = synthetic_mentions(rows) if args.source == "synthetic" else db_mentions(rows)
+            payload = {"mentions": mentions, "pagination": {"limit": rows, "next_cursor": None}}
+            for name, provider in providers.items():
+                serialize_ms, body = _median_ms(lambda: provider.response(payload).get_data(), args.repeat)
+                for encoding in encodings:
+                    compress_ms, wire = 0.0, body
+                    if encoding != "identity":
+                        compress_ms, wire = _median_ms(lambda: compression.compress(body, encoding), args.repeat)
+                    table.append([
+                        len(mentions), name, encoding, f"{serialize_ms:.1f}", f"{compress_ms:.1f}",
+                        f"{serialize_ms + compress_ms:.1f}", f"{len(wire) / 1024:,.0f}",
+                    ])
+
+    print(tabulate(table, headers=["menciones", "JSON", "codificación", "serializar ms", "comprimir ms",
+                                   "total ms", "KB en el cable"]))
+
+
+if __name__ == "__main__":
+    main()
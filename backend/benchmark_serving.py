@@ -0,0 +1,146 @@
+# backend/benchmark_serving.py
+"""
+Prueba de carga: servidor WSGI (app.py con el servidor de desarrollo de
+Flask, como `python app.py`, con hilos y sin depurador ni recarga) frente al
+modo ASGI (asgi.py con uvicorn).
+
+Arranca cada servidor en un puerto libre con la caché de respuestas
+desactivada (CACHE_MAX_ENTRIES=0, para medir el trabajo real contra
+Postgres), lanza --concurrency usuarios que piden en bucle una mezcla de
+rutas del dashboard durante --seconds segundos y saca peticiones por
+segundo, p50 y p99 (en ms) y errores, global y por ruta.
+
+Uso:
+    python benchmark_serving.py [--concurrency 32] [--seconds 20] [--asgi-workers 1]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+from tabulate import tabulate
+
+# Lo que pide la home al cargar, más un listado que sigue en Flask también en el modo ASGI.
+PATHS = (
+    "/api/dashboard?range=30d",
+    "/api/dashboard-kpis",
+    "/api/visibility?range=7d",
+    "/api/topics?range=30d",
+    "/api/industry/ranking?range=30d&compare=mom",
+    "/api/mentions?limit=20",
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, port, asgi_workers):
+    if mode == "wsgi":
+        return [sys.executable, "-c", f"import app; app.app.run(host='127.0.0.1', port={port}, debug=False, threaded=True)"]
+    return [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(asgi_workers), "--log-level", "warning", "--no-access-log"]
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout} s")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def user(client, url, index, deadline, samples, errors):
+    position = index
+    while time.monotonic() < deadline:
+        path = PATHS[position % len(PATHS)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(url + path)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        if ok:
+            samples[path].append(elapsed)
+        else:
+            errors[path] += 1
+
+
+async def load(url, concurrency, seconds):
+    samples, errors = defaultdict(list), defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        # Calentamiento: abre conexiones y pools antes de medir.
+        await asyncio.gather(*(client.get(url + path) for path in PATHS))
+        started = time.monotonic()
+        deadline = started + seconds
+        await asyncio.gather(*(user(client, url, i, deadline, samples, errors) for i in range(concurrency)))
+        duration = time.monotonic() - started
+    return samples, errors, duration
+
+
+def run_mode(mode, concurrency, seconds, asgi_workers):
+    port = free_port()
+    env = dict(os.environ, CACHE_MAX_ENTRIES="0")
+    server = subprocess.Popen(server_command(mode, port, asgi_workers), env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(url)
+        return asyncio.run(load(url, concurrency, seconds))
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait(timeout=10)
+
+
+def summary(name, latencies, failures, duration):
+    if not latencies:
+        return [name, 0, "-", "-", failures]
+    return [name, f"{len(latencies) / duration:.1f}", f"{statistics.median(latencies):.1f}",
+            f"{percentile(latencies, 0.99):.1f}", failures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=int, default=20)
+    parser.add_argument("--asgi-workers", type=int, default=1)
+    parser.add_argument("--modes", default="wsgi,asgi")
+    args = parser.parse_args()
+
+    totals, per_path = [], []
+    for mode in args.modes.split(","):
+        print(f"🏋️  {mode}: {args.concurrency} usuarios durante {args.seconds} s...")
+        samples, errors, duration = run_mode(mode, args.concurrency, args.seconds, args.asgi_workers)
+        every = [ms for path in PATHS for ms in samples[path]]
+        totals.append(summary(mode, every, sum(errors.values()), duration))
+        per_path += [summary(f"{mode} {path}", samples[path], errors[path], duration) for path in PATHS]
+
+    headers = ["servidor", "req/s", "p50 ms", "p99 ms", "errores"]
+    print("\n" + tabulate(totals, headers=headers))
+    print("\n" + tabulate(per_path, headers=headers))
+    print(f"\nℹ️  {os.cpu_count()} CPU; el generador de carga corre en la misma máquina que el servidor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# backend/benchmark_topics.py
+"""
+Benchmark de la nube de palabras (/api/topics).
+
+Crea tablas sintéticas UNLOGGED con N insights (100.000 por defecto)
+repartidos en un año, cada uno con 8 palabras de un vocabulario de --vocabulary
+términos (con variantes de mayúsculas y tildes) y 3 temas, sus topic_rollups y
+topic_labels, y mide para varias ventanas (mediana de --repeat, de extremo a
+extremo con psycopg2):
+  • jsonb_each: sumar topic_frequency y top_themes de todos los insights de la
+    ventana en SQL, canonicalizando con topic_key()
+  • rollups: fetch_topics() sobre topic_rollups (src/db/topics.py), lo que usa
+    ahora la API
+
+Uso:
+    python benchmark_topics.py [--insights 100000] [--vocabulary 500] [--days 365] [--repeat 7] [--keep]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import psycopg2
+from tabulate import tabulate
+
+from src.db import topics
+from src.db.connection import DB_CONFIG
+
+INSIGHTS = "bench_topics_insights"
+ROLLUPS = "bench_topic_rollups"
+LABELS = "bench_topic_labels"
+
+WINDOWS = (1, 7, 30, 90, 365)
+THEMES = 30
+
+
+def create_tables(cur, insights, vocabulary, days, now):
+    cur.execute(f"DROP TABLE IF EXISTS {INSIGHTS}, {ROLLUPS}, {LABELS}")
+    # Palabras con sesgo hacia las primeras (power law) y una de cada tres con grafía alternativa.
+    cur.execute(f"""
+        CREATE UNLOGGED TABLE {INSIGHTS} AS
+        SELECT g AS id, %(now)s::timestamp - random() * %(days)s * interval '1 day' AS created_at,
+               jsonb_build_object(
+                   'topic_frequency', (
+                       SELECT jsonb_object_agg(
+                           CASE WHEN w %% 3 = 0 THEN 'Término ' || w ELSE 'termino ' || w END, 1 + (random() * 5)::int)
+                       FROM (SELECT DISTINCT 1 + (power(random(), 3) * %(vocabulary)s)::int + 0 * g AS w
+                             FROM generate_series(1, 8)) words
+                   ),
+                   'top_themes', (
+                       SELECT jsonb_agg(DISTINCT theme)
+                       FROM (SELECT 'Tema ' || (1 + (random() * {THEMES - 1})::int + 0 * g) AS theme
+                             FROM generate_series(1, 3)) themes
+                   ),
+                   'summary', repeat('texto de relleno ', 30)
+               ) AS payload
+        FROM generate_series(1, %(insights)s) AS g
+    """, {"now": now, "days": days, "insights": insights, "vocabulary": vocabulary})
+    cur.execute(f"CREATE INDEX ON {INSIGHTS} (created_at)")
+
+    cur.execute(topics.TOPIC_KEY_FUNCTION_SQL)
+    cur.execute(topics.TABLE_SQL.format(table=ROLLUPS, table_labels=LABELS).replace("CREATE TABLE", "CREATE UNLOGGED TABLE"))
+    cur.execute(topics.upsert_sql(f"SELECT payload, created_at, 1 AS sign FROM {INSIGHTS}", table=ROLLUPS))
+    cur.execute(topics.labels_sql(f"SELECT payload FROM {INSIGHTS}", table=LABELS))
+    for table in (INSIGHTS, ROLLUPS, LABELS):
+        cur.execute(f"ANALYZE {table}")
+
+
+def jsonb_counts(cur, start, end):
+    """Suma directa de los payloads de la ventana."""
+    cur.execute(f"""
+        SELECT kind, topic, SUM(n) FROM (
+            SELECT 'word' AS kind, topic_key(t.key) AS topic, (t.value)::numeric AS n
+            FROM {INSIGHTS} i, jsonb_each(i.payload -> 'topic_frequency') t
+            WHERE i.created_at >= %(start)s AND i.created_at <= %(end)s AND jsonb_typeof(t.value) = 'number'
+            UNION ALL
+            SELECT 'theme', topic_key(e.theme), 1
+            FROM {INSIGHTS} i, jsonb_array_elements_text(i.payload -> 'top_themes') e(theme)
+            WHERE i.created_at >= %(start)s AND i.created_at <= %(end)s
+        ) elements
+        GROUP BY 1, 2
+        ORDER BY 3 DESC
+    """, {"start": start, "end": end})
+    rows = cur.fetchall()
+    return [row for row in rows if row[0] == "word"][:topics.DEFAULT_WORDS]
+
+
+def rollup_counts(cur, start, end):
+    return topics.fetch_topics(cur, start, end, table=ROLLUPS, table_labels=LABELS)["words"]
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def run(insights, vocabulary, days, repeat, keep):
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    now = datetime.now().replace(microsecond=0)
+    started = time.perf_counter()
+    print(f"🏗️  Creando {INSIGHTS} con {insights:,} insights y {vocabulary} palabras en {days} días...")
+    create_tables(cur, insights, vocabulary, days, now)
+    conn.commit()
+    for table in (ROLLUPS, LABELS):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        print(f"   {table}: {cur.fetchone()[0]:,} filas")
+    print(f"   {time.perf_counter() - started:.1f} s\n")
+
+    table = []
+    for window in (w for w in WINDOWS if w <= days):
+        start = now - timedelta(days=window)
+        row = [f"{window}d"]
+        for fn in (jsonb_counts, rollup_counts):
+            ms, result = _median_ms(lambda: fn(cur, start, now), repeat)
+            row.append(f"{ms:.1f}")
+        row.append(", ".join(word["text"] for word in result[:3]))
+        table.append(row)
+    conn.rollback()
+
+    print(tabulate(table, headers=["ventana", "jsonb_each ms", "rollups ms", "top 3"]))
+    print("\nℹ️  rollups redondea los bordes de la ventana a la hora o al día")
+
+    if not keep:
+        cur.execute(f"DROP TABLE {INSIGHTS}, {ROLLUPS}, {LABELS}")
+        conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--insights", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="No borrar las tablas sintéticas")
+    args = parser.parse_args()
+    run(args.insights, args.vocabulary, args.days, args.repeat, args.keep)
@@ -0,0 +1,170 @@
+# backend/benchmark_visibility.py
+"""
+Benchmark del visibility score (/api/visibility).
+
+Crea tablas sintéticas UNLOGGED con N insights (100.000 por defecto)
+repartidos en un año y 20 queries, sus filas de insight_items y sus
+visibility_rollups, y mide para varias ventanas (mediana de --repeat, de
+extremo a extremo con psycopg2):
+  • python: los payloads de la ventana a Python contando las listas, más la
+    serie desde el inicio de la ventana (lo que hacía app.py.backup)
+  • insight_items: los tres agregados SQL (por query, por día y recuento de
+    insights) de la versión anterior
+  • rollups: una sola consulta con GROUPING SETS sobre visibility_rollups
+    (src/db/visibility.py), lo que usa ahora la API
+
+Uso:
+    python benchmark_visibility.py [--insights 100000] [--days 365] [--repeat 7] [--keep]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import psycopg2
+from tabulate import tabulate
+
+from src.db import insight_items, visibility
+from src.db.connection import DB_CONFIG
+
+INSIGHTS = "bench_visibility_insights"
+ITEMS = "bench_visibility_items"
+ROLLUPS = "bench_visibility_rollups"
+
+WINDOWS = (7, 30, 90, 365)
+KINDS = ("opportunities", "risks", "trends")
+QUERIES = 20
+
+
+def create_tables(cur, insights, days, now):
+    cur.execute(f"DROP TABLE IF EXISTS {INSIGHTS}, {ITEMS}, {ROLLUPS}")
+    # Payloads de ~700 bytes como los reales: 0-3 oportunidades y riesgos, 0-2 tendencias y relleno.
+    cur.execute(f"""
+        CREATE UNLOGGED TABLE {INSIGHTS} AS
+        SELECT g AS id, 1 + g %% {QUERIES} AS query_id,
+               %(now)s::timestamp - random() * %(days)s * interval '1 day' AS created_at,
+               jsonb_build_object(
+                   'opportunities', (SELECT COALESCE(jsonb_agg('Oportunidad ' || s), '[]') FROM generate_series(1, (random() * 3)::int + 0 * g) s),
+                   'risks', (SELECT COALESCE(jsonb_agg('Riesgo ' || s), '[]') FROM generate_series(1, (random() * 3)::int + 0 * g) s),
+                   'trends', (SELECT COALESCE(jsonb_agg('Tendencia ' || s), '[]') FROM generate_series(1, (random() * 2)::int + 0 * g) s),
+                   'top_themes', '["Sabor", "Precio", "Salud"]'::jsonb,
+                   'quotes', '["Una cita del análisis", "Otra cita"]'::jsonb,
+                   'summary', repeat('texto de relleno ', 30)
+               ) AS payload
+        FROM generate_series(1, %(insights)s) AS g
+    """, {"now": now, "days": days, "insights": insights})
+    cur.execute(f"CREATE INDEX ON {INSIGHTS} (created_at)")
+
+    kinds = "', '".join(KINDS)
+    cur.execute(f"""
+        CREATE UNLOGGED TABLE {ITEMS} AS
+        SELECT * FROM ({insight_items.items_select(INSIGHTS)}) AS items(insight_id, query_id, kind, text, rank, created_at)
+        WHERE kind IN ('{kinds}')
+    """)
+    cur.execute(f"CREATE INDEX ON {ITEMS} (kind, created_at)")
+
+    cur.execute(visibility.ITEM_COUNT_FUNCTION_SQL)
+    cur.execute(visibility.TABLE_SQL.format(table=ROLLUPS).replace("CREATE TABLE", "CREATE UNLOGGED TABLE"))
+    cur.execute(visibility.upsert_sql(f"SELECT query_id, payload, created_at, 1 AS sign FROM {INSIGHTS}", table=ROLLUPS))
+    for table in (INSIGHTS, ITEMS, ROLLUPS):
+        cur.execute(f"ANALYZE {table}")
+
+
+def python_counts(cur, start, end):
+    """Como app.py.backup: payloads a Python y la serie en otra consulta."""
+    cur.execute(f"SELECT query_id, payload FROM {INSIGHTS} WHERE created_at >= %s AND created_at <= %s", (start, end))
+    per_query, positive_all, total_all = {}, 0, 0
+    for query_id, payload in cur.fetchall():
+        counts = per_query.setdefault(query_id, [0, 0])
+        positive = len(payload.get("opportunities") or [])
+        total = positive + sum(len(payload.get(kind) or []) for kind in KINDS[1:])
+        counts[0] += positive
+        counts[1] += total
+        positive_all += positive
+        total_all += total
+    cur.execute(f"SELECT DATE(created_at), payload FROM {INSIGHTS} WHERE created_at >= %s ORDER BY 1", (start,))
+    daily = {}
+    for day, payload in cur.fetchall():
+        counts = daily.setdefault(day, [0, 0])
+        counts[0] += len(payload.get("opportunities") or [])
+        counts[1] += sum(len(payload.get(kind) or []) for kind in KINDS)
+    return positive_all, total_all
+
+
+def items_counts(cur, start, end):
+    """Versión anterior: tres agregados sobre insight_items."""
+    params = {"start": start, "end": end, "kinds": list(KINDS)}
+    cur.execute(f"""
+        SELECT query_id, COUNT(*) FILTER (WHERE kind = 'opportunities'), COUNT(*)
+        FROM {ITEMS}
+        WHERE kind = ANY(%(kinds)s) AND created_at >= %(start)s AND created_at <= %(end)s AND query_id IS NOT NULL
+        GROUP BY query_id
+    """, params)
+    per_query = cur.fetchall()
+    cur.execute(f"""
+        SELECT DATE(created_at), COUNT(*) FILTER (WHERE kind = 'opportunities'), COUNT(*)
+        FROM {ITEMS}
+        WHERE kind = ANY(%(kinds)s) AND created_at >= %(start)s AND created_at <= %(end)s
+        GROUP BY 1 ORDER BY 1
+    """, params)
+    cur.fetchall()
+    cur.execute(f"SELECT COUNT(*) FROM {INSIGHTS} WHERE created_at >= %(start)s AND created_at <= %(end)s", params)
+    cur.fetchone()
+    return sum(row[1] for row in per_query), sum(row[2] for row in per_query)
+
+
+def rollup_counts(cur, start, end):
+    data = visibility.fetch_visibility(cur, start, end, table=ROLLUPS)
+    return data["positive"], data["total"]
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def run(insights, days, repeat, keep):
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    now = datetime.now().replace(microsecond=0)
+    started = time.perf_counter()
+    print(f"🏗️  Creando {INSIGHTS} con {insights:,} insights en {days} días...")
+    create_tables(cur, insights, days, now)
+    conn.commit()
+    for table in (ITEMS, ROLLUPS):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        print(f"   {table}: {cur.fetchone()[0]:,} filas")
+    print(f"   {time.perf_counter() - started:.1f} s\n")
+
+    table = []
+    for window in (w for w in WINDOWS if w <= days):
+        start = now - timedelta(days=window)
+        row = [f"{window}d"]
+        for fn in (python_counts, items_counts, rollup_counts):
+            ms, (positive, total) = _median_ms(lambda: fn(cur, start, now), repeat)
+            row.append(f"{ms:.1f}")
+        row.append(f"{positive / max(total, 1) * 100:.1f}%")
+        table.append(row)
+    conn.rollback()
+
+    print(tabulate(table, headers=["ventana", "python ms", "insight_items ms", "rollups ms", "score"]))
+    print("\nℹ️  rollups redondea los bordes de la ventana al bucket (hora o día)")
+
+    if not keep:
+        cur.execute(f"DROP TABLE {INSIGHTS}, {ITEMS}, {ROLLUPS}")
+        conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--insights", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="No borrar las tablas sintéticas")
+    args = parser.parse_args()
+    run(args.insights, args.days, args.repeat, args.keep)
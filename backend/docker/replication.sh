@@ -0,0 +1,4 @@
+#!/bin/bash
+# Permite conexiones de replicación (las usa el servicio db-replica de docker-compose).
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -30,8 +30,15 @@ def generate_html_report():
     cur.execute("SELECT COUNT(*) FROM queries")
     total_queries = cur.fetchone()[0]
     
-    cur.execute("SELECT COUNT(*) FROM mentions")
-    total_mentions = cur.fetchone()[0]
+    # Agregados de menciones desde mention_rollups (granularidad semanal)
+    cur.execute("""
+        SELECT COALESCE(SUM(mention_count), 0),
+               SUM(sentiment_sum) / NULLIF(SUM(sentiment_count), 0)
+        FROM mention_rollups
+        WHERE granularity = 'week'
+    """)
+    total_mentions, avg_sentiment = cur.fetchone()
+    avg_sentiment = avg_sentiment or 0
     
     cur.execute("SELECT COUNT(*) FROM insights")
     total_insights = cur.fetchone()[0]
@@ -39,9 +46,6 @@ def generate_html_report():
     cur.execute("SELECT COUNT(*) FROM queries WHERE enabled = true")
     active_queries = cur.fetchone()[0]
     
-    cur.execute("SELECT AVG(sentiment) FROM mentions WHERE sentiment IS NOT NULL")
-    avg_sentiment = cur.fetchone()[0] or 0
-    
     # 2. Queries
     cur.execute("""
         SELECT id, query, brand, enabled, created_at
@@ -57,7 +61,7 @@ def generate_html_report():
             m.query_id,
             m.source_url,
             m.source_title,
-            m.response,
+            b.response,
             m.source,
             m.engine,
             m.sentiment,
@@ -65,6 +69,7 @@ def generate_html_report():
             q.query,
             q.brand
         FROM mentions m
+        JOIN mention_bodies b ON b.mention_id = m.id AND b.created_at = m.created_at
         LEFT JOIN queries q ON m.query_id = q.id
         ORDER BY m.created_at DESC
         LIMIT 20
@@ -93,11 +98,11 @@ def generate_html_report():
             q.id,
             q.query,
             q.brand,
-            COUNT(m.id) as total_mentions,
-            COUNT(CASE WHEN m.sentiment > 0.2 THEN 1 END) as positive_mentions,
-            AVG(m.sentiment) as avg_sentiment
+            COALESCE(SUM(r.mention_count), 0) as total_mentions,
+            COALESCE(SUM(r.positive_count), 0) as positive_mentions,
+            SUM(r.sentiment_sum) / NULLIF(SUM(r.sentiment_count), 0) as avg_sentiment
         FROM queries q
-        LEFT JOIN mentions m ON q.id = m.query_id
+        LEFT JOIN mention_rollups r ON q.id = r.query_id AND r.granularity = 'week'
         GROUP BY q.id, q.query, q.brand
         ORDER BY total_mentions DESC
         LIMIT 15
@@ -0,0 +1,78 @@
+# backend/migrate_v10_add_full_text_search.py
+"""
+Búsqueda de texto completo en `mentions`:
+  1. Añade `search_config` (regconfig) y lo rellena por lotes desde
+     `queries.language` (`batched_update`, MIGRATION_BATCH_SIZE filas por
+     transacción); un trigger BEFORE INSERT lo mantiene para filas nuevas.
+  2. Añade `search_vector`, columna generada STORED con source_title (A),
+     summary (B) y response (C). Esto reescribe la tabla con bloqueo exclusivo:
+     ejecutar con el poller parado.
+  3. Crea el índice GIN partición a partición con CONCURRENTLY.
+
+Uso:
+    python migrate_v10_add_full_text_search.py
+"""
+import sys
+
+import psycopg2
+
+from src.db import search
+from src.db.connection import DB_CONFIG
+from src.db.migrate import batched_update
+from src.db.partitions import create_index_online
+
+
+def backfill_search_config(conn):
+    batched_update(
+        conn,
+        """
+        UPDATE mentions m SET search_config = search_config_for(q.language)
+        FROM queries q
+        WHERE q.id = m.query_id AND m.id >= %(lo)s AND m.id < %(hi)s
+          AND m.search_config <> search_config_for(q.language)
+        """,
+        "mentions",
+        label="search_config",
+    )
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Añadiendo search_config a mentions...")
+        cur.execute(search.FUNCTIONS_SQL)
+        cur.execute(
+            "ALTER TABLE mentions ADD COLUMN IF NOT EXISTS search_config regconfig "
+            "NOT NULL DEFAULT 'simple'::regconfig"
+        )
+        cur.execute(search.TRIGGER_SQL)
+        conn.commit()
+
+    backfill_search_config(conn)
+
+    with conn.cursor() as cur:
+        print("🧮 Añadiendo la columna generada search_vector (reescribe la tabla)...")
+        cur.execute(
+            f"ALTER TABLE mentions ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({search.SEARCH_VECTOR_SQL}) STORED"
+        )
+        conn.commit()
+
+    print("🗂️  Creando índice GIN...")
+    conn.autocommit = True
+    create_index_online(conn, "mentions", "idx_mentions_search_vector", "USING GIN (search_vector)")
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE mentions")
+    print("✅ ¡Búsqueda de texto completo lista!")
+
+def upgrade_schema():
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        upgrade(conn)
+        conn.close()
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
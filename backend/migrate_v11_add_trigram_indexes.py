@@ -0,0 +1,65 @@
+# backend/migrate_v11_add_trigram_indexes.py
+"""
+Índices trigram (pg_trgm) para búsquedas por subcadena y por similitud.
+
+Con `gin_trgm_ops` los `ILIKE '%x%'` y los operadores de similitud (`%`, `<%`)
+dejan de ser un seq scan. Se usan en:
+  • /api/brands/discover y `python -m src.engines.brands backfill --alias`
+    (texto de la respuesta, brand_dictionary.alias)
+  • el filtro `brand=` de los endpoints de industry (mv_brand_daily.brand)
+  • búsquedas por título de fuente y por texto de query
+
+Los índices se crean con CONCURRENTLY (partición a partición en `mentions`).
+
+Uso:
+    python migrate_v11_add_trigram_indexes.py
+"""
+import sys
+
+import psycopg2
+
+from src.db import mention_bodies
+from src.db.connection import DB_CONFIG
+from src.db.partitions import create_index_online
+
+
+# (nombre, tabla, definición)
+INDEXES = [
+    ("idx_mentions_source_title_trgm", "mentions", "USING GIN (source_title gin_trgm_ops)"),
+    ("idx_queries_query_trgm", "queries", "USING GIN (query gin_trgm_ops)"),
+    ("idx_brand_dictionary_alias_trgm", "brand_dictionary", "USING GIN (lower(alias) gin_trgm_ops)"),
+    ("idx_mv_brand_daily_brand_trgm", "mv_brand_daily", "USING GIN (brand gin_trgm_ops)"),
+]
+
+
+def upgrade(conn):
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        print("🚀 Activando la extensión pg_trgm...")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+        # Tras la migración v12 la respuesta vive en mention_bodies.
+        response_table = "mention_bodies" if mention_bodies.has_bodies(cur) else "mentions"
+
+    indexes = [(f"idx_{response_table}_response_trgm", response_table, "USING GIN (response gin_trgm_ops)")]
+    for name, table, definition in indexes + INDEXES:
+        print(f"🗂️  {name} ON {table}...")
+        create_index_online(conn, table, name, definition)
+
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE mentions")
+        cur.execute("ANALYZE queries")
+    print("✅ ¡Índices trigram creados!")
+
+def upgrade_schema():
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        upgrade(conn)
+        conn.close()
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,176 @@
+# backend/migrate_v12_split_mention_bodies.py
+"""
+Estrecha `mentions` moviendo el texto grande a `mention_bodies`.
+
+  1. Mide las lecturas de buffers (EXPLAIN ANALYZE, BUFFERS) de las consultas
+     de agregados y listados.
+  2. Crea `mention_bodies` (particionada por mes, con compresión lz4 si el
+     servidor la soporta) y copia `response` mes a mes con `mentions`
+     bloqueada para escritura.
+  3. Quita `response` de `mentions` y rehace su `search_vector` solo con
+     título y resumen; la respuesta tiene su propio vector en `mention_bodies`.
+     Añadir la columna generada reescribe las particiones, lo que además
+     libera el espacio de las columnas eliminadas.
+  4. Crea los índices GIN (y el trigram del texto si pg_trgm está instalada)
+     y repite la medición. El informe se guarda en buffer_report_<fecha>.txt.
+
+Ejecutar con el poller parado.
+
+Uso:
+    python migrate_v12_split_mention_bodies.py
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+
+import psycopg2
+
+from src.db import mention_bodies, search
+from src.db.connection import DB_CONFIG
+from src.db.partitions import add_months, create_index_online, ensure_monthly_partitions, month_start
+
+
+# Consultas que no necesitan el texto (las mismas antes y después).
+MEASURED_QUERIES = {
+    "agregado 30d por motor": """
+        SELECT engine, COUNT(*), AVG(sentiment) FROM mentions
+        WHERE created_at >= %(start)s GROUP BY engine
+    """,
+    "negativas por status": """
+        SELECT status, COUNT(*) FROM mentions WHERE sentiment < -0.2 GROUP BY status
+    """,
+    "listado /api/mentions 30d": """
+        SELECT id, engine, sentiment, emotion, created_at, summary FROM mentions
+        WHERE status = 'active' AND created_at >= %(start)s ORDER BY created_at DESC
+    """,
+}
+
+
+def measure(cur):
+    """{consulta: (buffers leídos, ms)} usando el nodo raíz del plan."""
+    results = {}
+    params = {"start": datetime.now() - timedelta(days=30)}
+    for name, sql in MEASURED_QUERIES.items():
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+        plan = "\n".join(row[0] for row in cur.fetchall())
+        buffers = re.search(r"Buffers: shared(?: hit=(\d+))?(?: read=(\d+))?", plan)
+        total = sum(int(value or 0) for value in buffers.groups()) if buffers else 0
+        ms = float(re.search(r"Execution Time: ([\d.]+) ms", plan).group(1))
+        results[name] = (total, ms)
+    return results
+
+
+def create_bodies_table(cur):
+    cur.execute("SELECT 'lz4' = ANY(enumvals) FROM pg_settings WHERE name = 'default_toast_compression'")
+    compression = " COMPRESSION lz4" if cur.fetchone()[0] else ""
+    print(f"   🗜️  Compresión TOAST: {'lz4' if compression else 'pglz (lz4 no disponible)'}")
+    cur.execute(f"""
+        CREATE TABLE mention_bodies (
+            mention_id INTEGER NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            search_config regconfig NOT NULL DEFAULT 'simple'::regconfig,
+            response TEXT NOT NULL{compression},
+            search_vector tsvector GENERATED ALWAYS AS ({search.BODY_VECTOR_SQL}) STORED,
+            PRIMARY KEY (mention_id, created_at),
+            CONSTRAINT {mention_bodies.FOREIGN_KEY_NAME} {mention_bodies.FOREIGN_KEY_SQL}
+        ) PARTITION BY RANGE (created_at)
+    """)
+    cur.execute("CREATE INDEX idx_mention_bodies_mention_id ON mention_bodies (mention_id)")
+
+
+def copy_bodies(cur):
+    cur.execute("LOCK TABLE mentions IN EXCLUSIVE MODE")
+    cur.execute("SELECT MIN(created_at) FROM mentions")
+    oldest = cur.fetchone()[0] or datetime.now()
+    ensure_monthly_partitions(cur, "mention_bodies", start=oldest)
+
+    copy_sql = """
+        INSERT INTO mention_bodies (mention_id, created_at, search_config, response)
+        SELECT id, created_at, search_config, response FROM mentions
+        WHERE created_at >= %s AND created_at < %s
+    """
+    month = month_start(oldest)
+    while month <= month_start(datetime.now()):
+        cur.execute(copy_sql, (month, add_months(month, 1)))
+        print(f"   📦 {month:%Y-%m}: {cur.rowcount} cuerpos")
+        month = add_months(month, 1)
+    cur.execute(copy_sql, (month, datetime.max))
+
+    cur.execute("SELECT (SELECT COUNT(*) FROM mentions), (SELECT COUNT(*) FROM mention_bodies)")
+    expected, copied = cur.fetchone()
+    if copied != expected:
+        raise RuntimeError(f"mention_bodies: copiadas {copied} filas de {expected}")
+
+
+def narrow_mentions(cur):
+    cur.execute("ALTER TABLE mentions DROP COLUMN search_vector")
+    cur.execute("ALTER TABLE mentions DROP COLUMN response")
+    cur.execute(
+        f"ALTER TABLE mentions ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({search.MENTION_VECTOR_SQL}) STORED"
+    )
+
+
+def write_report(before, after):
+    lines = [f"{'consulta':<28} {'buffers antes':>14} {'después':>10} {'ms antes':>10} {'después':>10}"]
+    for name in MEASURED_QUERIES:
+        (b_buf, b_ms), (a_buf, a_ms) = before[name], after[name]
+        lines.append(f"{name:<28} {b_buf:>14} {a_buf:>10} {b_ms:>10.1f} {a_ms:>10.1f}")
+    report = "\n".join(lines)
+    filename = f"buffer_report_{datetime.now():%Y%m%d_%H%M%S}.txt"
+    with open(filename, "w") as f:
+        f.write(report + "\n")
+    print(report)
+    print(f"📄 Informe guardado en {filename}")
+
+
+def upgrade(conn):
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        if mention_bodies.has_bodies(cur):
+            print("✓ mention_bodies ya existe")
+            return
+
+        print("📏 Midiendo lecturas de buffers (antes)...")
+        cur.execute("VACUUM ANALYZE mentions")
+        before = measure(cur)
+    conn.autocommit = False
+
+    with conn.cursor() as cur:
+        print("🚀 Creando mention_bodies y copiando respuestas...")
+        create_bodies_table(cur)
+        copy_bodies(cur)
+        print("✂️  Quitando response de mentions (reescribe las particiones)...")
+        narrow_mentions(cur)
+        conn.commit()
+
+    conn.autocommit = True
+    print("🗂️  Creando índices...")
+    create_index_online(conn, "mentions", "idx_mentions_search_vector", "USING GIN (search_vector)")
+    create_index_online(conn, "mention_bodies", "idx_mention_bodies_search_vector", "USING GIN (search_vector)")
+    with conn.cursor() as cur:
+        cur.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        if cur.fetchone()[0]:
+            create_index_online(conn, "mention_bodies", "idx_mention_bodies_response_trgm",
+                                "USING GIN (response gin_trgm_ops)")
+        cur.execute("VACUUM ANALYZE mentions")
+        cur.execute("VACUUM ANALYZE mention_bodies")
+
+        print("📏 Midiendo lecturas de buffers (después)...")
+        after = measure(cur)
+
+    write_report(before, after)
+    print("✅ ¡mentions estrechada; el texto vive en mention_bodies!")
+
+def upgrade_schema():
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        upgrade(conn)
+        conn.close()
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,32 @@
+# backend/migrate_v13_add_enrichment_jobs.py
+"""
+Crea `enrichment_jobs`, los checkpoints de `python -m src.scheduler.reenrich`
+(último id procesado, contadores y rango de fechas de cada job).
+"""
+import sys
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+from src.scheduler import reenrich
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'enrichment_jobs'...")
+        reenrich.install(cur)
+    conn.commit()
+    print("✅ ¡Checkpoints de re-enriquecimiento listos!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,49 @@
+# backend/migrate_v14_add_insight_items.py
+"""
+Normaliza `insights.payload` en `insight_items` (una fila por oportunidad,
+riesgo, tendencia, tema, cita, CTA...):
+  1. Crea la tabla particionada, sus índices y los triggers sobre `insights`.
+  2. Rellena los elementos de los insights existentes por lotes.
+  3. Indexa `mentions.generated_insight_id` (citas de /api/insights y
+     /api/mentions/from-insight buscan la mención de cada insight).
+"""
+import sys
+
+import psycopg2
+
+from src.db import insight_items
+from src.db.connection import DB_CONFIG
+from src.db.partitions import create_index_online
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando insight_items y sus triggers...")
+        insight_items.install(cur)
+    conn.commit()
+
+    print("📦 Rellenando elementos desde insights.payload...")
+    rows = insight_items.backfill(conn)
+    print(f"   {rows} elementos insertados")
+
+    conn.autocommit = True
+    print("🗂️  Indexando mentions.generated_insight_id...")
+    create_index_online(conn, "mentions", "idx_mentions_generated_insight_id",
+                        "(generated_insight_id) WHERE generated_insight_id IS NOT NULL")
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE insight_items")
+    print("✅ ¡insight_items lista!")
+
+
+def upgrade_schema():
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        upgrade(conn)
+        conn.close()
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,33 @@
+# backend/migrate_v15_add_archive_manifest.py
+"""
+Crea `archive_manifest`, el registro de los ficheros Parquet a los que
+`python -m src.db.archive archive` mueve las menciones archivadas o fuera de
+la ventana de retención.
+"""
+import sys
+
+import psycopg2
+
+from src.db import archive
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'archive_manifest'...")
+        archive.install(cur)
+    conn.commit()
+    print("✅ ¡Manifiesto del archivado en frío listo!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
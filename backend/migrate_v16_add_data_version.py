@@ -0,0 +1,32 @@
+# backend/migrate_v16_add_data_version.py
+"""
+Crea `data_version`, el contador que incrementan el poller y el resto de
+escritores al terminar y con el que la API invalida su caché de respuestas.
+"""
+import sys
+
+import psycopg2
+
+from src.db import data_version
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'data_version'...")
+        data_version.install(cur)
+    conn.commit()
+    print("✅ ¡Versión de datos lista para la caché de la API!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,33 @@
+# backend/migrate_v17_add_visibility_rollups.py
+"""
+Crea `visibility_rollups` (hora/día × query), los triggers que la mantienen
+al insertar, actualizar o borrar insights y la rellena con el histórico.
+"""
+import sys
+
+import psycopg2
+
+from src.db import visibility
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'visibility_rollups' y triggers incrementales...")
+        visibility.install(cur)
+        print("📦 Recalculando rollups de visibilidad desde el histórico de insights...")
+        rows = visibility.rebuild(cur)
+    conn.commit()
+    print(f"✅ ¡{rows} filas de rollup generadas!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
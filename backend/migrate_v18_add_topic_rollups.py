@@ -0,0 +1,33 @@
+# backend/migrate_v18_add_topic_rollups.py
+"""
+Crea `topic_rollups` (hora/día/semana × palabra o tema) y `topic_labels`, los triggers que las mantienen
+al insertar, actualizar o borrar insights y las rellena con el histórico.
+"""
+import sys
+
+import psycopg2
+
+from src.db import topics
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'topic_rollups' y triggers incrementales...")
+        topics.install(cur)
+        print("📦 Recalculando rollups de temas desde el histórico de insights...")
+        rows = topics.rebuild(cur)
+    conn.commit()
+    print(f"✅ ¡{rows} filas de rollup generadas!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
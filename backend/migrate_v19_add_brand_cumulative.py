@@ -0,0 +1,32 @@
+# backend/migrate_v19_add_brand_cumulative.py
+"""
+Crea la vista materializada `mv_brand_cumulative` (acumulados por marca y día
+sobre mv_brand_daily) que usa el ranking de marcas con comparación entre
+periodos. Se refresca junto a mv_brand_daily (industry_views.refresh).
+"""
+import sys
+
+import psycopg2
+
+from src.db import industry_views
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando vista materializada 'mv_brand_cumulative'...")
+        industry_views.install(cur)
+    conn.commit()
+    print("✅ ¡mv_brand_cumulative creada y poblada!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,40 @@
+# backend/migrate_v1_base_schema.py
+"""
+Esquema base (`queries`, `mentions`, `insights`, `citations`) desde
+`ai_visibility_schema.sql`. Solo se aplica en una base de datos vacía; en una
+existente basta con `python -m src.db.migrate baseline <versión>`.
+"""
+import os
+import sys
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_visibility_schema.sql")
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('public.queries') IS NOT NULL")
+        if cur.fetchone()[0]:
+            print("✓ El esquema base ya existe")
+            return
+        print("🧱 Creando el esquema base...")
+        with open(SCHEMA_PATH, encoding="utf-8") as f:
+            cur.execute(f.read())
+    conn.commit()
+    print("✅ Esquema base creado.")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except psycopg2.Error as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
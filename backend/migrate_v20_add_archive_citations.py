@@ -0,0 +1,37 @@
+# backend/migrate_v20_add_archive_citations.py
+"""
+Prepara el archivado en frío para las citas: índice sobre
+`citations.mention_id` (sin FK desde migrate_v6, el archivado las borra y
+exporta por mención) y trigger de `mention_rollups` que se puede saltar en
+una transacción (rollups.skip_in_transaction) para restaurar sin
+ALTER TABLE ... DISABLE TRIGGER.
+"""
+import sys
+
+import psycopg2
+
+from src.db import archive, rollups
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando índice 'idx_citations_mention_id'...")
+        archive.install(cur)
+        print("🔁 Actualizando el trigger de 'mention_rollups'...")
+        rollups.install(cur)
+    conn.commit()
+    print("✅ ¡Archivado de citas listo!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,63 @@
+# backend/migrate_v21_signed_mention_rollups.py
+"""
+Sustituye el trigger AFTER INSERT de `mention_rollups` por triggers de
+INSERT, UPDATE y DELETE con filas firmadas (cambios de sentimiento, emoción,
+engine o estado y borrados) y deja de contar las menciones archivadas.
+
+Recalcula los rollups desde el primer mes que sigue entero en `mentions`
+(posterior a la retención de cualquier archivado ya borrado); solo los
+buckets que caen enteros a partir de ese mes. Los anteriores, con menciones
+ya archivadas en frío, conservan sus rollups.
+"""
+import sys
+
+import psycopg2
+
+from datetime import datetime
+
+from src.db import rollups
+from src.db.connection import DB_CONFIG
+from src.db.partitions import add_months, month_start
+
+
+def first_complete_month(cur):
+    """
+    Primer mes del que el archivado no ha borrado menciones activas (las
+    anteriores a su retención), o None si nunca se ha borrado nada.
+    """
+    cur.execute("SELECT to_regclass('public.archive_manifest') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute("""
+        SELECT MAX(retention_cutoff) FROM archive_manifest
+        WHERE table_name = 'mentions' AND deleted_at IS NOT NULL
+    """)
+    cutoff = cur.fetchone()[0]
+    if cutoff is None:
+        return None
+    month = datetime.combine(month_start(cutoff), datetime.min.time())
+    return month if month == cutoff else datetime.combine(add_months(month, 1), datetime.min.time())
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Instalando triggers firmados de 'mention_rollups'...")
+        rollups.install(cur)
+        since = first_complete_month(cur)
+        print(f"📦 Recalculando rollups {f'desde {since:%Y-%m-%d}' if since else 'completos'}...")
+        rows = rollups.rebuild(cur, since=since)
+    conn.commit()
+    print(f"✅ ¡{rows} filas de rollup generadas!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,41 @@
+# backend/migrate_v22_add_mention_bodies_fk.py
+"""
+FK de `mention_bodies` a `mentions` con ON DELETE CASCADE: borrar una query
+(o cualquier mención fuera de archive.py) ya no deja cuerpos huérfanos que
+aparecían como candidatos en la búsqueda. Antes se borran los huérfanos que
+ya existan.
+
+Añadir la FK valida todas las filas con `mentions` bloqueada para escritura:
+ejecutar con el poller parado.
+"""
+import sys
+
+import psycopg2
+
+from src.db import mention_bodies
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        if not mention_bodies.has_bodies(cur):
+            print("✓ mention_bodies no existe todavía (la crea migrate_v12 con la FK)")
+            return
+        print("🔗 Añadiendo FK de mention_bodies a mentions...")
+        orphans = mention_bodies.add_foreign_key(cur)
+        print(f"   {orphans} cuerpos huérfanos borrados")
+    conn.commit()
+    print("✅ ¡mention_bodies ligada a mentions!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
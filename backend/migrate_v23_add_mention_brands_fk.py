@@ -0,0 +1,39 @@
+# backend/migrate_v23_add_mention_brands_fk.py
+"""
+FK de `mention_brands` a `mentions` con ON DELETE CASCADE: las menciones
+borradas fuera de archive.py (p. ej. en cascada al borrar una query) dejaban
+marcas huérfanas que seguían contando en `mv_brand_daily`. Antes se borran
+los huérfanos que ya existan y después se refresca la vista.
+"""
+import sys
+
+import psycopg2
+
+from src.db import industry_views
+from src.db.connection import DB_CONFIG
+from src.engines import brands
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🔗 Añadiendo FK de mention_brands a mentions...")
+        orphans = brands.add_foreign_key(cur)
+        print(f"   {orphans} filas huérfanas borradas")
+        if orphans:
+            print("🔄 Refrescando vistas de industria...")
+            industry_views.refresh(cur)
+    conn.commit()
+    print("✅ ¡mention_brands ligada a mentions!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
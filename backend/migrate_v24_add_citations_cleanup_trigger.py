@@ -0,0 +1,35 @@
+# backend/migrate_v24_add_citations_cleanup_trigger.py
+"""
+Recupera el borrado en cascada de `citations` que se perdió en migrate_v6 al
+quitar su FK a `mentions`: un trigger de sentencia AFTER DELETE ON mentions
+borra las citas de las menciones eliminadas, también cuando el borrado viene
+en cascada desde `queries`. Antes se borran las citas ya huérfanas.
+"""
+import sys
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+from src.db.partitions import install_citations_cleanup
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🔗 Instalando trg_citations_cleanup sobre mentions...")
+        orphans = install_citations_cleanup(cur)
+        print(f"   {orphans} citas huérfanas borradas")
+    conn.commit()
+    print("✅ ¡Las citas se borran con sus menciones!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
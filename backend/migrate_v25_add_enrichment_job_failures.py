@@ -0,0 +1,33 @@
+# backend/migrate_v25_add_enrichment_job_failures.py
+"""
+Crea `enrichment_job_failures`: las menciones que un job de
+`python -m src.scheduler.reenrich` no pudo re-enriquecer, para reintentarlas
+con `--retry-failed` en lugar de perderlas al avanzar el checkpoint.
+"""
+import sys
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+from src.scheduler import reenrich
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'enrichment_job_failures'...")
+        reenrich.install(cur)
+    conn.commit()
+    print("✅ ¡Las menciones fallidas se pueden reintentar!")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,53 @@
+# backend/migrate_v2_extend_schema.py
+"""
+Columnas de fuente y emoción en `mentions` y tabla `alerts_emitted`.
+(Antes migrations/v2_extend_schema.py y scripts/migrate_v2_extend_mentions.py.)
+"""
+import sys
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🧩 Extendiendo schema...")
+
+        # Nuevos campos en mentions
+        cur.execute("""
+        ALTER TABLE mentions
+            ADD COLUMN IF NOT EXISTS source_name TEXT,
+            ADD COLUMN IF NOT EXISTS origin_url TEXT,
+            ADD COLUMN IF NOT EXISTS title TEXT,
+            ADD COLUMN IF NOT EXISTS snippet TEXT,
+            ADD COLUMN IF NOT EXISTS emotion TEXT,
+            ADD COLUMN IF NOT EXISTS confidence_score REAL;
+        """)
+
+        # Crear tabla para alertas emitidas
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS alerts_emitted (
+            id SERIAL PRIMARY KEY,
+            query_id INTEGER REFERENCES queries(id),
+            engine TEXT,
+            alert_type TEXT,
+            severity TEXT,
+            emitted_at TIMESTAMP DEFAULT NOW()
+        );
+        """)
+    conn.commit()
+    print("✅ Esquema extendido correctamente.")
+
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except psycopg2.Error as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
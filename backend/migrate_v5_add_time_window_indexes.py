@@ -0,0 +1,188 @@
+# backend/migrate_v5_add_time_window_indexes.py
+"""
+Índices compuestos y parciales para los filtros por ventana de tiempo.
+
+Todos los endpoints filtran `mentions` e `insights` por rango de `created_at`,
+casi siempre combinado con `status`, `engine` o `query_id`. Esta migración crea
+los índices que encajan con esos predicados usando `CREATE INDEX CONCURRENTLY`
+(no bloquea escrituras del poller) y genera un informe EXPLAIN ANALYZE de cada
+consulta de endpoint antes y después de crearlos.
+
+Uso:
+    python migrate_v5_add_time_window_indexes.py            # crea índices + informe
+    python migrate_v5_add_time_window_indexes.py --report   # solo informe
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+
+
+# (nombre, tabla, definición) — cada índice corresponde a un predicado real.
+INDEXES = [
+    # /api/mentions: WHERE status = %s AND created_at BETWEEN ... ORDER BY created_at DESC
+    ("idx_mentions_status_created_at", "mentions", "(status, created_at DESC)"),
+    # Caso por defecto de /api/mentions (status='active'): índice parcial, más pequeño.
+    ("idx_mentions_active_created_at", "mentions", "(created_at DESC) WHERE status = 'active'"),
+    # Series por query y joins desde queries (visibility, report por query).
+    ("idx_mentions_query_id_created_at", "mentions", "(query_id, created_at)"),
+    # Filtro de modelo (`model=`) combinado con ventana.
+    ("idx_mentions_engine_created_at", "mentions", "(engine, created_at)"),
+    # Endpoints de industry: solo ventana de tiempo, sin status.
+    ("idx_mentions_created_at", "mentions", "(created_at)"),
+    # /api/insights, /api/visibility, CTAs: ventana de tiempo sobre insights.
+    ("idx_insights_created_at", "insights", "(created_at)"),
+    ("idx_insights_query_id_created_at", "insights", "(query_id, created_at)"),
+    # /api/topics: solo insights con topic_frequency, los más recientes primero.
+    ("idx_insights_topics_created_at", "insights", "(created_at DESC) WHERE payload ? 'topic_frequency'"),
+]
+
+# Consultas representativas de cada endpoint (mismos predicados que en app.py).
+ENDPOINT_QUERIES = {
+    "/api/mentions": """
+        SELECT m.id, m.engine, m.source, m.sentiment, m.created_at, q.query
+        FROM mentions m
+        JOIN queries q ON m.query_id = q.id
+        WHERE m.created_at >= %(start)s AND m.created_at <= %(end)s AND m.status = 'active'
+        ORDER BY m.created_at DESC
+        LIMIT 50
+    """,
+    "/api/mentions?status=archived": """
+        SELECT m.id, m.engine, m.created_at
+        FROM mentions m
+        WHERE m.created_at >= %(start)s AND m.created_at <= %(end)s AND m.status = 'archived'
+        ORDER BY m.created_at DESC
+        LIMIT 50
+    """,
+    "/api/mentions?model=gpt-4": """
+        SELECT COUNT(*) FROM mentions m
+        WHERE m.created_at >= %(start)s AND m.created_at <= %(end)s AND m.engine = 'gpt-4'
+    """,
+    "/api/industry/ranking": """
+        SELECT m.query_id, COUNT(*), AVG(m.sentiment)
+        FROM mentions m
+        WHERE m.created_at >= %(start)s AND m.created_at <= %(end)s
+        GROUP BY m.query_id
+    """,
+    "/api/visibility": """
+        SELECT i.query_id, i.payload
+        FROM insights i
+        JOIN queries q ON i.query_id = q.id
+        WHERE i.created_at >= %(start)s AND i.created_at <= %(end)s
+    """,
+    "/api/visibility (series por query)": """
+        SELECT DATE(i.created_at), COUNT(*)
+        FROM insights i
+        WHERE i.query_id = 1 AND i.created_at >= %(start)s AND i.created_at <= %(end)s
+        GROUP BY 1
+    """,
+    "/api/topics": """
+        SELECT i.payload
+        FROM insights i
+        WHERE i.created_at >= %(start)s AND i.created_at <= %(end)s
+        AND i.payload ? 'topic_frequency'
+        ORDER BY i.created_at DESC
+        LIMIT 10
+    """,
+}
+
+
+def explain_endpoints(cur, params):
+    """Ejecuta EXPLAIN ANALYZE de cada consulta y devuelve {endpoint: (ms, plan)}."""
+    results = {}
+    for endpoint, sql in ENDPOINT_QUERIES.items():
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+        plan = "\n".join(row[0] for row in cur.fetchall())
+        match = re.search(r"Execution Time: ([\d.]+) ms", plan)
+        results[endpoint] = (float(match.group(1)) if match else None, plan)
+    return results
+
+
+def create_indexes(cur):
+    """Crea cada índice con CONCURRENTLY; reconstruye los que quedaron inválidos."""
+    for name, table, definition in INDEXES:
+        # Un CREATE INDEX CONCURRENTLY interrumpido deja un índice INVALID.
+        cur.execute("""
+            SELECT i.indisvalid FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+        """, (name,))
+        row = cur.fetchone()
+        if row and not row[0]:
+            print(f"   ♻️  {name} inválido, recreando...")
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        elif row:
+            print(f"   ✓ {name} ya existe")
+            continue
+
+        started = datetime.now()
+        cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"   ✅ {name} creado en {elapsed:.1f}s")
+
+    cur.execute("ANALYZE mentions")
+    cur.execute("ANALYZE insights")
+
+
+def format_ms(ms):
+    """Milisegundos con dos decimales, o '-' si el plan no trae Execution Time."""
+    return "-" if ms is None else f"{ms:.2f}"
+
+
+def write_report(before, after):
+    """Escribe el informe comparativo y devuelve la ruta del fichero."""
+    path = f"explain_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("EXPLAIN ANALYZE — consultas de endpoints (ventana 30d)\n\n")
+        f.write(f"{'endpoint':<40} {'antes (ms)':>12} {'después (ms)':>14}\n")
+        for endpoint, (ms_after, _) in after.items():
+            ms_before = before.get(endpoint, (None, ""))[0] if before else None
+            f.write(f"{endpoint:<40} {format_ms(ms_before):>12} {format_ms(ms_after):>14}\n")
+        for label, results in (("ANTES", before), ("DESPUÉS", after)):
+            if not results:
+                continue
+            f.write(f"\n\n===== {label} =====\n")
+            for endpoint, (_, plan) in results.items():
+                f.write(f"\n--- {endpoint}\n{plan}\n")
+    return path
+
+
+def upgrade(conn, report_only=False):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        end = datetime.now()
+        params = {"start": end - timedelta(days=30), "end": end}
+
+        print("📊 EXPLAIN ANALYZE antes de la migración...")
+        before = explain_endpoints(cur, params)
+
+        after = None
+        if not report_only:
+            print("🚀 Creando índices para filtros por ventana de tiempo...")
+            create_indexes(cur)
+            print("📊 EXPLAIN ANALYZE después de la migración...")
+            after = explain_endpoints(cur, params)
+
+        path = write_report(None if report_only else before, after or before)
+        for endpoint, (ms, _) in (after or before).items():
+            ms_before = before[endpoint][0]
+            print(f"   {endpoint:<40} {format_ms(ms_before):>9} ms → {format_ms(ms):>9} ms")
+        print(f"📝 Informe guardado en {path}")
+
+
+def upgrade_schema(report_only=False):
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        upgrade(conn, report_only)
+        conn.close()
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema(report_only="--report" in sys.argv)
@@ -0,0 +1,168 @@
+# backend/migrate_v6_partition_tables.py
+"""
+Convierte `mentions` e `insights` en tablas particionadas por mes (`created_at`).
+
+Para cada tabla:
+  1. Crea `<tabla>_partitioned` con las mismas columnas y PARTITION BY RANGE.
+  2. Crea las particiones mensuales desde la fila más antigua hasta 3 meses por
+     delante, más una partición DEFAULT de seguridad.
+  3. Copia los datos mes a mes con la tabla original bloqueada para escritura
+     (las lecturas del API siguen funcionando) y replica sus índices.
+  4. Intercambia los nombres: la tabla original queda como `<tabla>_legacy`.
+
+Notas:
+  • La clave primaria pasa a ser (id, created_at): Postgres exige que incluya
+    la columna de partición. El id sigue saliendo de la misma secuencia.
+  • `citations.mention_id` deja de tener FOREIGN KEY, porque una FK no puede
+    apuntar solo a `id` en una tabla particionada. Su ON DELETE CASCADE lo
+    sustituye el trigger `trg_citations_cleanup` sobre `mentions`.
+
+Uso:
+    python migrate_v6_partition_tables.py [--drop-legacy]
+"""
+import sys
+from datetime import datetime
+
+import psycopg2
+
+from src.db.connection import DB_CONFIG
+from src.db.partitions import (
+    add_months, ensure_monthly_partitions, install_citations_cleanup, is_partitioned, month_start,
+    partition_name,
+)
+
+
+TABLES = ("mentions", "insights")
+
+# Triggers que hay que volver a crear sobre la tabla nueva.
+TRIGGERS = {
+    "insights": [
+        "CREATE TRIGGER trg_insights_ai BEFORE INSERT ON insights "
+        "FOR EACH ROW EXECUTE FUNCTION insights_after_insert()",
+    ],
+}
+
+
+def clone_indexes(cur, source, target):
+    """Replica los índices secundarios de `source` en `target` con sufijo _part."""
+    cur.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = 'public' AND tablename = %s",
+        (source,),
+    )
+    renames = []
+    for name, definition in cur.fetchall():
+        if name == f"{source}_pkey":
+            continue
+        new_name = f"{name}_part"
+        definition = definition.replace(
+            f"INDEX {name} ON public.{source} ", f"INDEX {new_name} ON public.{target} "
+        )
+        cur.execute(definition)
+        renames.append((name, new_name))
+    return renames
+
+
+def migrate_table(cur, table):
+    staging = f"{table}_partitioned"
+    legacy = f"{table}_legacy"
+
+    # Bloquea escrituras (el poller espera) pero no lecturas del dashboard.
+    cur.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+
+    cur.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    cur.execute(f"""
+        CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (created_at)
+    """)
+    cur.execute(f"ALTER TABLE {staging} ALTER COLUMN created_at SET NOT NULL")
+    cur.execute(f"ALTER TABLE {staging} ADD PRIMARY KEY (id, created_at)")
+
+    cur.execute(f"SELECT MIN(created_at) FROM {table}")
+    oldest = cur.fetchone()[0] or datetime.now()
+    created = ensure_monthly_partitions(cur, staging, start=oldest)
+    print(f"   🧩 {len(created)} particiones creadas para {table}")
+
+    month = month_start(oldest)
+    last = month_start(datetime.now())
+    while month <= last:
+        cur.execute(
+            f"INSERT INTO {staging} SELECT * FROM {table} WHERE created_at >= %s AND created_at < %s",
+            (month, add_months(month, 1)),
+        )
+        print(f"   📦 {partition_name(table, month)}: {cur.rowcount} filas")
+        month = add_months(month, 1)
+    cur.execute(f"INSERT INTO {staging} SELECT * FROM {table} WHERE created_at >= %s", (month,))
+
+    cur.execute(f"SELECT COUNT(*) FROM {table}")
+    expected = cur.fetchone()[0]
+    cur.execute(f"SELECT COUNT(*) FROM {staging}")
+    copied = cur.fetchone()[0]
+    if copied != expected:
+        raise RuntimeError(f"{table}: copiadas {copied} filas de {expected}")
+
+    renames = clone_indexes(cur, table, staging)
+    cur.execute(f"""
+        ALTER TABLE {staging} ADD CONSTRAINT {table}_query_id_fkey_part
+        FOREIGN KEY (query_id) REFERENCES queries(id) ON DELETE CASCADE
+    """)
+
+    if table == "mentions":
+        cur.execute("ALTER TABLE citations DROP CONSTRAINT IF EXISTS citations_mention_id_fkey")
+
+    # Intercambio de nombres: tabla, índices, PK, FK y particiones.
+    cur.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    cur.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+    cur.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_query_id_fkey TO {legacy}_query_id_fkey")
+    for old_name, new_name in renames:
+        cur.execute(f"ALTER INDEX {old_name} RENAME TO {old_name}_legacy")
+        cur.execute(f"ALTER INDEX {new_name} RENAME TO {old_name}")
+    cur.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    cur.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey")
+    cur.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {table}_query_id_fkey_part TO {table}_query_id_fkey")
+    cur.execute(
+        """
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        """,
+        (f"public.{table}",),
+    )
+    for (partition,) in cur.fetchall():
+        cur.execute(f"ALTER TABLE {partition} RENAME TO {partition.replace(staging, table, 1)}")
+
+    cur.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    for statement in TRIGGERS.get(table, []):
+        cur.execute(statement)
+    if table == "mentions":
+        install_citations_cleanup(cur)
+    cur.execute(f"ANALYZE {table}")
+
+
+def upgrade(conn, drop_legacy=False):
+    with conn.cursor() as cur:
+        for table in TABLES:
+            if is_partitioned(cur, table):
+                print(f"✓ {table} ya está particionada")
+                continue
+            print(f"🚀 Particionando '{table}' por mes...")
+            migrate_table(cur, table)
+            conn.commit()
+            print(f"✅ '{table}' particionada (original en {table}_legacy)")
+
+        if drop_legacy:
+            for table in TABLES:
+                cur.execute(f"DROP TABLE IF EXISTS {table}_legacy")
+            conn.commit()
+            print("🗑️  Tablas *_legacy eliminadas")
+
+
+def upgrade_schema(drop_legacy=False):
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn, drop_legacy)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema(drop_legacy="--drop-legacy" in sys.argv)
@@ -0,0 +1,33 @@
+# backend/migrate_v7_add_mention_rollups.py
+"""
+Crea `mention_rollups` (hora/día/semana × query × engine), el trigger que la
+mantiene al insertar menciones y la rellena con el histórico.
+"""
+import sys
+
+import psycopg2
+
+from src.db import rollups
+from src.db.connection import DB_CONFIG
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando tabla 'mention_rollups' y trigger incremental...")
+        rollups.install(cur)
+        print("📦 Recalculando rollups desde el histórico de menciones...")
+        rows = rollups.rebuild(cur)
+    conn.commit()
+    print(f"✅ ¡{rows} filas de rollup generadas!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
@@ -0,0 +1,36 @@
+# backend/migrate_v8_add_industry_views.py
+"""
+Crea la vista materializada `mv_brand_daily` (menciones y sentimiento por día
+y marca) y la tabla `mv_refresh_log` usadas por los endpoints de industry.
+
+Desde la v9 la vista agrega desde `mention_brands`; en una base de datos nueva
+se crean aquí sus tablas (vacías) y la v9 las rellena y recrea la vista.
+"""
+import sys
+
+import psycopg2
+
+from src.db import industry_views
+from src.db.connection import DB_CONFIG
+from src.engines import brands
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando vistas materializadas de industry...")
+        brands.install(cur)
+        industry_views.install(cur)
+    conn.commit()
+    print("✅ ¡mv_brand_daily creada y poblada!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
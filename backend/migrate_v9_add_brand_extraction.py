@@ -0,0 +1,46 @@
+# backend/migrate_v9_add_brand_extraction.py
+"""
+Extracción de marcas en la ingesta:
+  1. Crea `brand_dictionary` (marcas/competidores y alias por queries.brand)
+     y `mention_brands`, y carga el diccionario por defecto.
+  2. Rellena `mention_brands` para todas las menciones históricas.
+  3. Recrea `mv_brand_daily` para que agregue desde `mention_brands` en lugar
+     de los CASE con ILIKE.
+"""
+import sys
+
+import psycopg2
+
+from src.db import industry_views
+from src.db.connection import DB_CONFIG
+from src.engines import brands
+
+
+def upgrade(conn):
+    with conn.cursor() as cur:
+        print("🚀 Creando brand_dictionary y mention_brands...")
+        brands.install(cur)
+        conn.commit()
+
+        print("🏷️  Extrayendo marcas de las menciones históricas...")
+        total = brands.backfill(cur)
+        conn.commit()
+        print(f"   {total} menciones procesadas")
+
+        print("🔄 Recreando mv_brand_daily sobre mention_brands...")
+        cur.execute("DROP MATERIALIZED VIEW IF EXISTS mv_brand_daily")
+        industry_views.install(cur)
+    conn.commit()
+    print("✅ ¡Extracción de marcas lista!")
+
+def upgrade_schema():
+    try:
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            upgrade(conn)
+    except Exception as e:
+        print(f"❌ Error al actualizar la base de datos: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
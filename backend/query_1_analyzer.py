@@ -8,6 +8,8 @@ import os
 import json
 from datetime import datetime
 
+from src.db.mention_bodies import BODY_JOIN_SQL
+
 load_dotenv()
 
 def analyze_query_1():
@@ -48,12 +50,12 @@ def analyze_query_1():
     print(f"   Creada: {created}")
     
     # 2. Menciones de Query 1
-    cur.execute("""
+    cur.execute(f"""
         SELECT 
             m.id,
             m.source_url,
             m.source_title,
-            m.response,
+            b.response,
             m.source,
             m.engine,
             m.sentiment,
@@ -61,6 +63,7 @@ def analyze_query_1():
             m.confidence,
             m.created_at
         FROM mentions m
+        LEFT {BODY_JOIN_SQL}
         WHERE m.query_id = 1
         ORDER BY m.created_at DESC
     """)
@@ -8,6 +8,8 @@ import os
 import json
 from datetime import datetime, timedelta
 
+from src.db.mention_bodies import BODY_JOIN_SQL
+
 load_dotenv()
 
 conn = psycopg2.connect(
@@ -90,13 +92,13 @@ total_mentions = cur.fetchone()[0]
 print(f"📊 Total de menciones: {total_mentions}")
 
 if total_mentions > 0:
-    cur.execute("""
+    cur.execute(f"""
         SELECT 
             m.id,
             m.query_id,
             m.source_url,
             m.source_title,
-            m.response,
+            b.response,
             m.source,
             m.engine,
             m.sentiment,
@@ -106,6 +108,7 @@ if total_mentions > 0:
             q.query,
             q.brand
         FROM mentions m
+        LEFT {BODY_JOIN_SQL}
         LEFT JOIN queries q ON m.query_id = q.id
         ORDER BY m.created_at DESC
     """)
@@ -292,7 +295,7 @@ orphan_insights = cur.fetchone()[0]
 print(f"⚠️ Insights huérfanos (sin query): {orphan_insights}")
 
 # Menciones sin respuesta
-cur.execute("SELECT COUNT(*) FROM mentions WHERE response IS NULL OR response = ''")
+cur.execute(f"SELECT COUNT(*) FROM mentions m LEFT {BODY_JOIN_SQL} WHERE b.response IS NULL OR b.response = ''")
 no_response = cur.fetchone()[0]
 print(f"⚠️ Menciones sin respuesta IA: {no_response}")
 
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# backend/scripts/export_data.py
+"""
+Descarga una exportación completa de la API (/api/export/<entidad>) a un
+fichero, en streaming y reanudable: si el fichero ya existe, continúa tras la
+última fila completa (descarta una línea a medias) en lugar de empezar de
+cero. Sustituye a los `fetchall()` de show_all.py, view_insights.py y
+preview_mentions.py para volcados grandes.
+
+Uso:
+    python scripts/export_data.py mentions menciones.ndjson --param range=all --param status=all
+    python scripts/export_data.py insights insights.csv --format csv --param from=2026-06-01
+"""
+import argparse
+import csv
+import io
+import json
+import os
+
+import requests
+
+from src.db.export import resume_cursor
+
+BASE_URL = os.getenv("API_URL", "http://localhost:5050")
+
+
+def _tail(f, size: int, terminator: bytes) -> bytes:
+    """Final del fichero con al menos dos terminadores (o el fichero entero)."""
+    block = 64 * 1024
+    while True:
+        start = max(size - block, 0)
+        f.seek(start)
+        data = f.read()
+        if start == 0 or data.count(terminator) >= 2:
+            return data
+        block *= 4
+
+
+def last_record(path: str, fmt: str):
+    """
+    Última fila completa del fichero (id, created_at); recorta una fila a
+    medias. En CSV las filas terminan en \\r\\n (csv.writer) y los saltos de
+    línea dentro de un campo son \\n, así que el corte es seguro.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    terminator = b"\r\n" if fmt == "csv" else b"\n"
+    with open(path, "rb+") as f:
+        size = os.path.getsize(path)
+        tail = _tail(f, size, terminator)
+        end = tail.rfind(terminator)
+        if end < 0:
+            return None
+        complete = size - len(tail) + end + len(terminator)
+        if complete != size:
+            f.truncate(complete)
+        records = tail[:end].split(terminator)
+    if fmt == "csv":
+        if size - len(tail) == 0 and len(records) == 1:
+            return None  # solo la cabecera
+        row = next(csv.reader(io.StringIO(records[-1].decode())))
+        return {"id": int(row[0]), "created_at": row[1]}
+    return json.loads(records[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportación reanudable de menciones o insights")
+    parser.add_argument("entity", choices=("mentions", "insights"))
+    parser.add_argument("output")
+    parser.add_argument("--format", choices=("ndjson", "csv"))
+    parser.add_argument("--param", action="append", default=[], help="filtro clave=valor (range, from, to, status...)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "ndjson")
+    params = dict(param.split("=", 1) for param in args.param)
+    params["format"] = fmt
+
+    last = last_record(args.output, fmt)
+    if last:
+        params["cursor"] = resume_cursor(last)
+        print(f"↪️  Reanudando tras la fila {last['id']} ({last['created_at']})")
+
+    written = 0
+    with requests.get(f"{args.base_url}/api/export/{args.entity}", params=params, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(args.output, "ab") as f:
+            skip_header = fmt == "csv" and f.tell() > 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if skip_header:
+                    if b"\n" not in chunk:
+                        continue
+                    chunk = chunk[chunk.index(b"\n") + 1:]
+                    skip_header = False
+                f.write(chunk)
+                written += len(chunk)
+    print(f"✅ {written / 1e6:,.1f} MB escritos en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import psycopg2
 
+from src.db import bulk_load
+
 # Queries adaptadas a The Core Entertainment Science School
 QUERIES = [
     # Indecisión y Motivaciones
@@ -41,15 +43,13 @@ def insert_thecore_queries():
 
     # Insertar las queries de The Core
     print(f"🎯 Insertando las {len(QUERIES)} queries de The Core School...")
-    for i, (query, brand, topic, lang) in enumerate(QUERIES, 1):
-        cur.execute("""
-            INSERT INTO queries (query, brand, topic, enabled, language)
-            VALUES (%s, %s, %s, TRUE, %s)
-            ON CONFLICT (query) DO NOTHING;
-        """, (query, brand, topic, lang))
+    bulk_load.load(conn, "queries", (
+        {"query": query, "brand": brand, "topic": topic, "enabled": True, "language": lang}
+        for query, brand, topic, lang in QUERIES
+    ))
+    for i, (query, _brand, _topic, _lang) in enumerate(QUERIES, 1):
         print(f"   {i:2d}. {query[:80]}...")
 
-    conn.commit()
     print(f"✅ Insertadas las {len(QUERIES)} queries de The Core School correctamente.\n")
 
     # Mostrar queries activas
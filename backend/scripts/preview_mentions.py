@@ -1,6 +1,8 @@
 import psycopg2
 import pandas as pd
 
+from src.db.mention_bodies import BODY_JOIN_SQL
+
 # Conexión a PostgreSQL
 conn = psycopg2.connect(
     host="localhost",
@@ -11,10 +13,11 @@ conn = psycopg2.connect(
 )
 
 # Consulta SQL corregida
-query = """
-SELECT q.query, q.brand, m.engine, m.sentiment, m.response, m.created_at
+query = f"""
+SELECT q.query, q.brand, m.engine, m.sentiment, b.response, m.created_at
 FROM mentions m
 JOIN queries q ON m.query_id = q.id
+LEFT {BODY_JOIN_SQL}
 ORDER BY m.created_at DESC
 LIMIT 20;
 """
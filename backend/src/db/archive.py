@@ -0,0 +1,552 @@
+# backend/src/db/archive.py
+"""
+Archivado en frío de menciones a ficheros Parquet.
+
+Las menciones archivadas (`status = 'archived'`, ver PATCH
+/api/mentions/<id>/archive) y las que superan la ventana de retención
+(ARCHIVE_RETENTION_DAYS, 365 por defecto) salen de la tabla caliente:
+
+  1. Se escriben, mes a mes, en `ARCHIVE_DIR/mentions/month=YYYY-MM/part-*.parquet`
+     (columnar, zstd) con el texto de `mention_bodies`, las marcas de
+     `mention_brands` (JSON {marca: veces}) y las `citations` (lista JSON)
+     en la misma fila.
+  2. Se registran en `archive_manifest` (ruta, filas, rango de ids, sha256)
+     en estado 'written'; solo entonces se borran de Postgres por lotes, un
+     lote por transacción, y la entrada pasa a 'deleted'. Si el proceso se
+     corta entre ambos pasos, la siguiente ejecución termina el borrado.
+     Los meses enteros fuera de la retención se eliminan separando y
+     borrando sus particiones (O(1)) en lugar de fila a fila.
+  3. `read_archive()` consulta los ficheros con pyarrow.dataset y `restore()`
+     devuelve un mes completo a Postgres.
+
+`mention_rollups` no se toca al archivar: los KPIs históricos siguen contando
+las menciones activas que salen por la retención (las `archived` ya no
+contaban). Por eso el borrado por lotes y la restauración se saltan su trigger
+en la transacción (rollups.skip_in_transaction).
+
+Uso por línea de comandos:
+    python -m src.db.archive install
+    python -m src.db.archive archive [--retention-days 365] [--batch-size 5000] [--dry-run]
+    python -m src.db.archive manifest
+    python -m src.db.archive query [--from 2025-01] [--to 2025-03] [--engine gpt-4] [--csv out.csv]
+    python -m src.db.archive restore 2025-01
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import psycopg2.errors
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from psycopg2.extras import execute_values
+
+from src.db import data_version, industry_views, rollups
+from src.db.migrate import BATCH_LOCK_RETRIES, BATCH_LOCK_TIMEOUT
+from src.db.partitions import (_relation_exists, add_months, detach_partition, ensure_monthly_partitions,
+                               month_start, partition_name)
+
+ARCHIVE_DIR = os.getenv(
+    "ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "archive"),
+)
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_BATCH_SIZE = 5000
+COMPRESSION = "zstd"
+
+# Tipos de Postgres (udt_name) → Arrow. El resto se exporta como texto.
+ARROW_TYPES = {
+    "int2": pa.int16(),
+    "int4": pa.int32(),
+    "int8": pa.int64(),
+    "float4": pa.float32(),
+    "float8": pa.float64(),
+    "bool": pa.bool_(),
+    "text": pa.string(),
+    "varchar": pa.string(),
+    "timestamp": pa.timestamp("us"),
+    "date": pa.date32(),
+    "_text": pa.list_(pa.string()),
+}
+
+# Columnas añadidas a las de `mentions` en cada fila archivada.
+EXTRA_FIELDS = [pa.field("response", pa.string()), pa.field("brands", pa.string()),
+                pa.field("citations", pa.string())]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS archive_manifest (
+    id SERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    month DATE NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    row_count INTEGER NOT NULL,
+    deleted_count INTEGER,
+    bytes BIGINT NOT NULL,
+    sha256 TEXT NOT NULL,
+    min_id INTEGER,
+    max_id INTEGER,
+    retention_cutoff TIMESTAMP NOT NULL,
+    whole_month BOOLEAN NOT NULL DEFAULT FALSE,
+    state TEXT NOT NULL DEFAULT 'written' CHECK (state IN ('written', 'deleted', 'restored')),
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    deleted_at TIMESTAMP,
+    restored_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_archive_manifest_table_month ON archive_manifest (table_name, month);
+-- citations.mention_id ya no tiene FK (ver migrate_v6): el trigger que borra
+-- las citas de las menciones eliminadas y la exportación van por este índice.
+CREATE INDEX IF NOT EXISTS idx_citations_mention_id ON citations (mention_id);
+"""
+
+# Menciones candidatas: archivadas o fuera de la retención.
+CANDIDATE_SQL = "(m.status = 'archived' OR m.created_at < %(cutoff)s)"
+
+# Borra un lote (ids + created_at del fichero) de las cuatro tablas. El filtro se
+# repite por si alguna mención se desarchivó entre la escritura y el borrado:
+# se queda en la tabla caliente y `restore()` la ignora (ON CONFLICT).
+DELETE_BATCH_SQL = """
+    WITH doomed AS (
+        DELETE FROM mentions m
+        USING unnest(%(ids)s::int[], %(created)s::timestamp[]) AS d(id, created_at)
+        WHERE m.id = d.id AND m.created_at = d.created_at AND """ + CANDIDATE_SQL + """
+        RETURNING m.id, m.created_at
+    ), bodies AS (
+        DELETE FROM mention_bodies b USING doomed d
+        WHERE b.mention_id = d.id AND b.created_at = d.created_at
+    ), brands AS (
+        DELETE FROM mention_brands x USING doomed d WHERE x.mention_id = d.id
+    ), cited AS (
+        DELETE FROM citations c USING doomed d WHERE c.mention_id = d.id
+    )
+    SELECT COUNT(*) FROM doomed
+"""
+
+
+def install(cur) -> None:
+    """Crea `archive_manifest` (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+
+
+def _columns(cur, table: str) -> List[Tuple[str, str]]:
+    """(columna, udt_name) de `table` sin las generadas."""
+    cur.execute(
+        """
+        SELECT column_name, udt_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+        """,
+        (table,),
+    )
+    return cur.fetchall()
+
+
+def arrow_schema(columns: List[Tuple[str, str]]) -> pa.Schema:
+    """Esquema Parquet de una mención archivada: columnas de `mentions` + EXTRA_FIELDS."""
+    fields = [pa.field(name, ARROW_TYPES.get(udt, pa.string())) for name, udt in columns]
+    return pa.schema(fields + EXTRA_FIELDS)
+
+
+def _select_sql(columns: List[Tuple[str, str]], whole_month: bool) -> str:
+    select = ", ".join(f"m.{name}" if udt in ARROW_TYPES else f"m.{name}::text" for name, udt in columns)
+    return f"""
+        SELECT {select}, b.response,
+               (SELECT jsonb_object_agg(x.brand, x.count) FROM mention_brands x WHERE x.mention_id = m.id)::text,
+               (SELECT jsonb_agg(jsonb_build_object('title', c.title, 'url', c.url, 'created_at', c.created_at)
+                                 ORDER BY c.id)
+                FROM citations c WHERE c.mention_id = m.id)::text
+        FROM mentions m
+        LEFT JOIN mention_bodies b ON b.mention_id = m.id AND b.created_at = m.created_at
+        WHERE m.created_at >= %(lo)s AND m.created_at < %(hi)s
+        {"" if whole_month else "AND " + CANDIDATE_SQL}
+        ORDER BY m.id
+    """
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def candidate_months(cur, cutoff: datetime) -> List[Tuple[date, int]]:
+    """(mes, menciones a archivar) de los meses con candidatas."""
+    cur.execute(
+        f"""
+        SELECT date_trunc('month', m.created_at)::date, COUNT(*)
+        FROM mentions m WHERE {CANDIDATE_SQL}
+        GROUP BY 1 ORDER BY 1
+        """,
+        {"cutoff": cutoff},
+    )
+    return cur.fetchall()
+
+
+def write_month(conn, month: date, cutoff: datetime, directory: str = ARCHIVE_DIR,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Optional[Dict]:
+    """
+    Escribe las candidatas de `month` en un Parquet nuevo y lo registra en el
+    manifiesto como 'written'. Devuelve la entrada (None si no había filas).
+    """
+    whole_month = add_months(month, 1) <= cutoff.date()
+    folder = os.path.join(directory, "mentions", f"month={month:%Y-%m}")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"part-{datetime.now():%Y%m%dT%H%M%S%f}.parquet")
+    tmp_path = path + ".tmp"
+
+    with conn.cursor() as cur:
+        columns = _columns(cur, "mentions")
+    schema = arrow_schema(columns)
+    schema = schema.with_metadata({"table": "mentions", "month": f"{month:%Y-%m}",
+                                   "retention_cutoff": cutoff.isoformat()})
+
+    written, min_id, max_id = 0, None, None
+    with conn.cursor(name="archive_stream") as cur, pq.ParquetWriter(tmp_path, schema, compression=COMPRESSION) as writer:
+        cur.itersize = batch_size
+        cur.execute(_select_sql(columns, whole_month), {"lo": month, "hi": add_months(month, 1), "cutoff": cutoff})
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema,
+            ))
+            written += len(rows)
+            min_id = rows[0][0] if min_id is None else min_id
+            max_id = rows[-1][0]
+    conn.commit()
+
+    if not written:
+        os.remove(tmp_path)
+        return None
+    if pq.ParquetFile(tmp_path).metadata.num_rows != written:
+        raise RuntimeError(f"{tmp_path}: el fichero no tiene las {written} filas escritas")
+    os.replace(tmp_path, path)
+
+    entry = {
+        "table_name": "mentions", "month": month, "path": path, "row_count": written,
+        "bytes": os.path.getsize(path), "sha256": _file_sha256(path), "min_id": min_id, "max_id": max_id,
+        "retention_cutoff": cutoff, "whole_month": whole_month,
+    }
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            INSERT INTO archive_manifest ({", ".join(entry)})
+            VALUES ({", ".join(f"%({key})s" for key in entry)})
+            RETURNING id
+            """,
+            entry,
+        )
+        entry["id"] = cur.fetchone()[0]
+    conn.commit()
+    return entry
+
+
+def _drop_month_partitions(conn, entry: Dict) -> Optional[int]:
+    """
+    Camino rápido para un mes entero fuera de la retención: si las particiones
+    de `mentions` y `mention_bodies` contienen exactamente las filas del
+    fichero se separan y eliminan. Devuelve las filas borradas o None si no
+    se puede (particiones inexistentes o filas nuevas desde la escritura).
+    """
+    month = entry["month"]
+    with conn.cursor() as cur:
+        names = [partition_name(table, month) for table in ("mentions", "mention_bodies")]
+        if not all(_relation_exists(cur, name) for name in names):
+            return None
+        cur.execute(f"LOCK TABLE {names[0]}, {names[1]} IN ACCESS EXCLUSIVE MODE")
+        cur.execute(f"SELECT COUNT(*) FROM {names[0]}")
+        if cur.fetchone()[0] != entry["row_count"]:
+            conn.rollback()
+            return None
+        cur.execute(
+            "DELETE FROM mention_brands WHERE created_at >= %s AND created_at < %s",
+            (month, add_months(month, 1)),
+        )
+        cur.execute(f"DELETE FROM citations c USING {names[0]} m WHERE c.mention_id = m.id")
+        # Primero los cuerpos: su FK impide separar una partición de mentions aún referenciada.
+        detach_partition(cur, "mention_bodies", month, drop=True)
+        detach_partition(cur, "mentions", month, drop=True)
+    conn.commit()
+    return entry["row_count"]
+
+
+def delete_archived_rows(conn, entry: Dict, batch_size: int = DEFAULT_BATCH_SIZE, pause: float = 0.0) -> int:
+    """
+    Borra de Postgres las menciones del fichero de `entry`, un lote por
+    transacción con `lock_timeout` corto, y marca la entrada como 'deleted'.
+    """
+    deleted = _drop_month_partitions(conn, entry) if entry["whole_month"] else None
+    if deleted is None:
+        keys = pq.read_table(entry["path"], columns=["id", "created_at"])
+        ids, created = keys.column("id").to_pylist(), keys.column("created_at").to_pylist()
+        deleted = 0
+        for start in range(0, len(ids), batch_size):
+            params = {"ids": ids[start:start + batch_size], "created": created[start:start + batch_size],
+                      "cutoff": entry["retention_cutoff"]}
+            for attempt in range(BATCH_LOCK_RETRIES + 1):
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(f"SET LOCAL lock_timeout = '{BATCH_LOCK_TIMEOUT}'")
+                        rollups.skip_in_transaction(cur)
+                        cur.execute(DELETE_BATCH_SQL, params)
+                        deleted += cur.fetchone()[0]
+                    conn.commit()
+                    break
+                except psycopg2.errors.LockNotAvailable:
+                    conn.rollback()
+                    if attempt == BATCH_LOCK_RETRIES:
+                        raise
+                    time.sleep(2 ** attempt)
+            if pause:
+                time.sleep(pause)
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE archive_manifest SET state = 'deleted', deleted_count = %s, deleted_at = NOW() WHERE id = %s",
+            (deleted, entry["id"]),
+        )
+    conn.commit()
+    return deleted
+
+
+def manifest(cur, state: Optional[str] = None, month: Optional[date] = None) -> List[Dict]:
+    """Entradas del manifiesto (filtradas por estado y/o mes), por mes y antigüedad."""
+    where, params = [], []
+    if state:
+        where.append("state = %s")
+        params.append(state)
+    if month:
+        where.append("month = %s")
+        params.append(month_start(month))
+    cur.execute(
+        f"""
+        SELECT id, table_name, month, path, row_count, deleted_count, bytes, sha256, min_id, max_id,
+               retention_cutoff, whole_month, state, archived_at, deleted_at, restored_at
+        FROM archive_manifest {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY month, id
+        """,
+        params,
+    )
+    names = [column[0] for column in cur.description]
+    return [dict(zip(names, row)) for row in cur.fetchall()]
+
+
+def archive(conn, retention_days: Optional[int] = None, directory: str = ARCHIVE_DIR,
+            batch_size: int = DEFAULT_BATCH_SIZE, pause: float = 0.0, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Archiva y borra todas las candidatas. Antes termina el borrado de las
+    entradas que quedaron en 'written'. Devuelve {ficheros, filas, borradas}.
+    """
+    retention_days = retention_days or int(os.getenv("ARCHIVE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    totals = {"files": 0, "rows": 0, "deleted": 0}
+
+    with conn.cursor() as cur:
+        unfinished = manifest(cur, state="written")
+        months = candidate_months(cur, cutoff)
+    conn.commit()
+
+    if dry_run:
+        for month, count in months:
+            print(f"   🧊 {month:%Y-%m}: {count} menciones a archivar")
+        totals["rows"] = sum(count for _month, count in months)
+        return totals
+
+    for entry in unfinished:
+        print(f"   ♻️  Terminando el borrado de {entry['path']}")
+        totals["deleted"] += delete_archived_rows(conn, entry, batch_size, pause)
+
+    for month, _count in months:
+        entry = write_month(conn, month, cutoff, directory, batch_size)
+        if entry is None:
+            continue
+        deleted = delete_archived_rows(conn, entry, batch_size, pause)
+        totals["files"] += 1
+        totals["rows"] += entry["row_count"]
+        totals["deleted"] += deleted
+        print(f"   🧊 {month:%Y-%m}: {entry['row_count']} filas → {entry['path']} "
+              f"({entry['bytes'] / 1024:,.0f} KB), {deleted} borradas")
+
+    if totals["deleted"]:
+        with conn.cursor() as cur:
+            industry_views.refresh(cur)
+            data_version.bump(cur, "archive")
+        conn.commit()
+    return totals
+
+
+def read_archive(cur, month_from: Optional[date] = None, month_to: Optional[date] = None,
+                 columns: Optional[List[str]] = None, engine: Optional[str] = None,
+                 query_id: Optional[int] = None) -> pa.Table:
+    """
+    Lee las menciones archivadas (entradas 'deleted') de los meses
+    [month_from, month_to] como una tabla Arrow. Los filtros se empujan a los
+    ficheros (row groups con estadísticas) en lugar de cargarlo todo.
+    """
+    paths = [
+        entry["path"] for entry in manifest(cur, state="deleted")
+        if (month_from is None or entry["month"] >= month_start(month_from))
+        and (month_to is None or entry["month"] <= month_start(month_to))
+    ]
+    if not paths:
+        return pa.table({name: pa.array([], type=pa.string()) for name in columns or ["id"]})
+
+    expression = None
+    for condition in (
+        ds.field("engine") == engine if engine else None,
+        ds.field("query_id") == query_id if query_id is not None else None,
+    ):
+        if condition is not None:
+            expression = condition if expression is None else expression & condition
+    return ds.dataset(paths, format="parquet").to_table(columns=columns, filter=expression)
+
+
+def restore(conn, month: date, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Devuelve a Postgres las menciones archivadas de `month` (con su texto,
+    marcas y citas) y marca sus entradas como 'restored'. Cada fichero se restaura en
+    una transacción; las filas que ya existan se ignoran. Devuelve las
+    menciones insertadas.
+    """
+    month = month_start(month)
+    restored = 0
+    with conn.cursor() as cur:
+        entries = manifest(cur, state="deleted", month=month)
+        insertable = {name for name, _udt in _columns(cur, "mentions")}
+    conn.commit()
+
+    for entry in entries:
+        if _file_sha256(entry["path"]) != entry["sha256"]:
+            raise RuntimeError(f"{entry['path']}: el sha256 no coincide con el manifiesto")
+        parquet = pq.ParquetFile(entry["path"])
+        columns = [name for name in parquet.schema_arrow.names if name in insertable]
+        inserted = 0
+        with conn.cursor() as cur:
+            ensure_monthly_partitions(cur, "mentions", start=month)
+            ensure_monthly_partitions(cur, "mention_bodies", start=month)
+            # Los rollups ya cuentan estas menciones (nunca se restaron).
+            rollups.skip_in_transaction(cur)
+            for batch in parquet.iter_batches(batch_size=batch_size):
+                rows = batch.to_pylist()
+                new_ids = {mention_id for (mention_id,) in execute_values(
+                    cur,
+                    f"INSERT INTO mentions ({', '.join(columns)}) VALUES %s "
+                    f"ON CONFLICT DO NOTHING RETURNING id",
+                    [tuple(row[name] for name in columns) for row in rows],
+                    page_size=len(rows),
+                    fetch=True,
+                )}
+                inserted += len(new_ids)
+                execute_values(
+                    cur,
+                    "INSERT INTO mention_bodies (mention_id, created_at, search_config, response) VALUES %s "
+                    "ON CONFLICT DO NOTHING",
+                    [(row["id"], row["created_at"], row.get("search_config") or "simple", row["response"])
+                     for row in rows if row["response"] is not None],
+                    page_size=len(rows),
+                )
+                execute_values(
+                    cur,
+                    "INSERT INTO mention_brands (mention_id, brand, count, created_at) VALUES %s "
+                    "ON CONFLICT DO NOTHING",
+                    [(row["id"], brand, count, row["created_at"])
+                     for row in rows if row["brands"] for brand, count in json.loads(row["brands"]).items()],
+                    page_size=len(rows),
+                )
+                # Las citas no tienen clave única: solo las de las menciones insertadas ahora.
+                execute_values(
+                    cur,
+                    "INSERT INTO citations (mention_id, title, url, created_at) VALUES %s",
+                    [(row["id"], citation["title"], citation["url"], citation["created_at"])
+                     for row in rows if row["id"] in new_ids and row.get("citations")
+                     for citation in json.loads(row["citations"])],
+                    page_size=len(rows),
+                )
+            cur.execute("UPDATE archive_manifest SET state = 'restored', restored_at = NOW() WHERE id = %s",
+                        (entry["id"],))
+            data_version.bump(cur, "restore")
+        conn.commit()
+        restored += inserted
+        print(f"   ♨️  {entry['path']}: {inserted} de {entry['row_count']} menciones restauradas")
+    return restored
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Archivado en frío de menciones (Parquet)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+
+    p_archive = sub.add_parser("archive")
+    p_archive.add_argument("--retention-days", type=int, help="Por defecto ARCHIVE_RETENTION_DAYS o 365")
+    p_archive.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p_archive.add_argument("--pause", type=float, default=0.0, help="Segundos de pausa entre lotes de borrado")
+    p_archive.add_argument("--dry-run", action="store_true", help="Solo contar las candidatas por mes")
+
+    sub.add_parser("manifest")
+
+    p_query = sub.add_parser("query")
+    p_query.add_argument("--from", dest="month_from", help="Primer mes, formato YYYY-MM")
+    p_query.add_argument("--to", dest="month_to", help="Último mes, formato YYYY-MM")
+    p_query.add_argument("--engine")
+    p_query.add_argument("--query-id", type=int)
+    p_query.add_argument("--columns", help="Columnas separadas por comas")
+    p_query.add_argument("--csv", help="Guardar el resultado en un CSV")
+
+    p_restore = sub.add_parser("restore")
+    p_restore.add_argument("month", help="Mes a restaurar, formato YYYY-MM")
+    p_restore.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    args = parser.parse_args(argv)
+
+    def parse_month(value):
+        return datetime.strptime(value, "%Y-%m").date() if value else None
+
+    with get_db_connection() as conn:
+        if args.command == "install":
+            with conn.cursor() as cur:
+                install(cur)
+            conn.commit()
+            print("✅ archive_manifest instalada")
+        elif args.command == "archive":
+            totals = archive(conn, args.retention_days, batch_size=args.batch_size, pause=args.pause,
+                             dry_run=args.dry_run)
+            if args.dry_run:
+                print(f"✓ {totals['rows']} menciones a archivar (dry-run)")
+            else:
+                print(f"✅ {totals['rows']} menciones en {totals['files']} ficheros, {totals['deleted']} borradas")
+        elif args.command == "manifest":
+            with conn.cursor() as cur:
+                for entry in manifest(cur):
+                    print(f"{entry['month']:%Y-%m}  {entry['state']:<9} {entry['row_count']:>8} filas "
+                          f"{entry['bytes'] / 1024:>10,.0f} KB  {entry['path']}")
+        elif args.command == "query":
+            columns = args.columns.split(",") if args.columns else None
+            with conn.cursor() as cur:
+                table = read_archive(cur, parse_month(args.month_from), parse_month(args.month_to),
+                                     columns, args.engine, args.query_id)
+            print(f"✓ {table.num_rows} menciones archivadas")
+            if args.csv:
+                import pyarrow.csv
+
+                pyarrow.csv.write_csv(table.drop_columns([
+                    name for name in table.column_names if pa.types.is_list(table.schema.field(name).type)
+                ]), args.csv)
+                print(f"📄 Guardado en {args.csv}")
+            else:
+                print(table.slice(0, 10).to_pandas().to_string())
+        elif args.command == "restore":
+            restored = restore(conn, parse_month(args.month), args.batch_size)
+            print(f"✅ {restored} menciones restauradas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# backend/src/db/bulk_load.py
+"""
+Carga masiva de queries, menciones e insights con COPY FROM STDIN.
+
+Los registros se leen de CSV (cabecera con los nombres de columna), JSONL (un
+objeto por línea) o JSON: una lista, un objeto suelto o las respuestas de la
+API guardadas en `scripts/*_output.json` ({"mentions": [...]}, las tarjetas
+de /api/insights...). Se copian por bloques a una tabla temporal y de ahí un
+único INSERT ... SELECT los lleva a su tabla, así que los triggers de
+sentencia (rollups, insight_items) agregan una vez por carga y no por fila.
+
+    • queries:  upsert sobre `unique_query_text` (brand, topic, language y
+                enabled se actualizan si vienen en el fichero).
+    • mentions: `query_id` o el texto de la query en `query` (las que no
+                existen se crean). El texto va a `mention_bodies`. Los ids del
+                fichero se ignoran: cada fila recibe uno nuevo.
+    • insights: `payload` (objeto JSON) o una tarjeta de /api/insights, que se
+                convierte en {kind: [texto]}.
+
+Todo va en una transacción: si una fila falla no se carga nada. Las marcas de
+las menciones cargadas se extraen después con `python -m src.engines.brands backfill`.
+
+Uso por línea de comandos:
+    python -m src.db.bulk_load queries scripts/queries.csv
+    python -m src.db.bulk_load mentions fixtures/mentions.jsonl [--chunk-rows 100000]
+    python -m src.db.bulk_load insights scripts/insights_sample.json
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.db import data_version
+from src.db.insight_items import KINDS
+from src.db.partitions import ensure_monthly_partitions
+
+DEFAULT_CHUNK_ROWS = 100000
+FORMATS = ("csv", "jsonl", "json")
+
+# Columnas de la tabla temporal de cada entidad (el orden es el de COPY).
+STAGE_COLUMNS = {
+    "queries": (
+        ("query", "TEXT"), ("brand", "TEXT"), ("topic", "TEXT"), ("enabled", "BOOLEAN"), ("language", "TEXT"),
+    ),
+    "mentions": (
+        ("query_id", "INTEGER"), ("query_text", "TEXT"), ("engine", "TEXT"), ("source", "TEXT"),
+        ("response", "TEXT"), ("sentiment", "DOUBLE PRECISION"), ("emotion", "TEXT"),
+        ("confidence_score", "DOUBLE PRECISION"), ("source_title", "TEXT"), ("source_url", "TEXT"),
+        ("language", "TEXT"), ("created_at", "TIMESTAMP"), ("summary", "TEXT"), ("key_topics", "TEXT[]"),
+        ("status", "TEXT"),
+    ),
+    "insights": (
+        ("query_id", "INTEGER"), ("query_text", "TEXT"), ("payload", "JSONB"), ("created_at", "TIMESTAMP"),
+    ),
+}
+
+# Queries referenciadas por texto que todavía no existen.
+MISSING_QUERIES_SQL = """
+    INSERT INTO queries (query)
+    SELECT DISTINCT s.query_text FROM bulk_stage s
+    WHERE s.query_id IS NULL AND s.query_text IS NOT NULL
+    ON CONFLICT ON CONSTRAINT unique_query_text DO NOTHING
+"""
+
+MERGE_SQL = {
+    # DISTINCT ON: una misma query repetida en el fichero no puede actualizarse
+    # dos veces en el mismo INSERT. Gana la última aparición. Los valores por
+    # defecto de enabled y language solo se aplican a las queries nuevas: en las
+    # que ya existen, una columna que no viene en el fichero no se toca.
+    "queries": """
+        INSERT INTO queries (query, brand, topic, enabled, language)
+        SELECT DISTINCT ON (s.query) s.query, s.brand, s.topic,
+               CASE WHEN existing.id IS NULL THEN COALESCE(s.enabled, TRUE) ELSE s.enabled END,
+               CASE WHEN existing.id IS NULL THEN COALESCE(s.language, 'en') ELSE s.language END
+        FROM bulk_stage s
+        LEFT JOIN queries existing ON existing.query = s.query
+        ORDER BY s.query, s.row_number DESC
+        ON CONFLICT ON CONSTRAINT unique_query_text DO UPDATE SET
+            brand    = COALESCE(EXCLUDED.brand, queries.brand),
+            topic    = COALESCE(EXCLUDED.topic, queries.topic),
+            enabled  = COALESCE(EXCLUDED.enabled, queries.enabled),
+            language = COALESCE(EXCLUDED.language, queries.language)
+        RETURNING (xmax = 0)
+    """,
+    # Ids, query y search_config (lo mismo que calcula el trigger) se resuelven
+    # antes, así el texto se inserta desde `staged` sin volver a casar las filas.
+    "mentions": """
+        WITH staged AS MATERIALIZED (
+            SELECT nextval(pg_get_serial_sequence('mentions', 'id')) AS id, s.*,
+                   q.id AS resolved_query_id, COALESCE(s.created_at, NOW()) AS resolved_created_at,
+                   COALESCE(search_config_for(q.language), 'simple'::regconfig) AS resolved_config
+            FROM bulk_stage s
+            LEFT JOIN queries by_text ON s.query_id IS NULL AND by_text.query = s.query_text
+            LEFT JOIN queries q ON q.id = COALESCE(s.query_id, by_text.id)
+        ), inserted AS (
+            INSERT INTO mentions (
+                id, query_id, engine, source, sentiment, emotion, confidence_score, source_title,
+                source_url, language, created_at, summary, key_topics, status
+            )
+            SELECT id, COALESCE(query_id, resolved_query_id), COALESCE(engine, 'unknown'), source, sentiment,
+                   emotion, confidence_score, source_title, source_url, COALESCE(language, 'auto'),
+                   resolved_created_at, summary, key_topics, COALESCE(status, 'active')
+            FROM staged
+        )
+        INSERT INTO mention_bodies (mention_id, created_at, search_config, response)
+        SELECT id, resolved_created_at, resolved_config, COALESCE(response, '') FROM staged
+    """,
+    "insights": """
+        INSERT INTO insights (query_id, payload, created_at)
+        SELECT COALESCE(s.query_id, q.id), s.payload, COALESCE(s.created_at, NOW())
+        FROM bulk_stage s
+        LEFT JOIN queries q ON s.query_id IS NULL AND q.query = s.query_text
+    """,
+}
+
+# Tarjetas de /api/insights: categoría → clave del payload (ver INSIGHT_CATEGORIES en app.py).
+CARD_CATEGORY_KINDS = {"Opportunity": "opportunities", "Risk": "risks", "Trend": "trends"}
+
+# Claves con las que las respuestas de la API envuelven las listas.
+JSON_WRAPPERS = ("queries", "mentions", "insights", "items", "results", "data")
+
+
+# --- Lectura de ficheros ---
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension == "ndjson":
+        return "jsonl"
+    if extension not in FORMATS:
+        raise ValueError(f"Formato no reconocido para {path}: usa --format {'|'.join(FORMATS)}")
+    return extension
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Registros (dicts) del fichero. CSV y JSONL se leen en streaming."""
+    fmt = fmt or detect_format(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        elif fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                wrapped = next((data[key] for key in JSON_WRAPPERS if isinstance(data.get(key), list)), None)
+                data = wrapped if wrapped is not None else [data]
+            yield from data
+
+
+# --- Normalización de registros ---
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, str) and value.strip() == "")
+
+
+def _text(value) -> Optional[str]:
+    return None if _blank(value) else str(value)
+
+
+def _int(value) -> Optional[int]:
+    return None if _blank(value) else int(value)
+
+
+def _float(value) -> Optional[float]:
+    return None if _blank(value) else float(value)
+
+
+def _bool(value) -> Optional[bool]:
+    if _blank(value):
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "t", "yes", "y", "si", "sí")
+
+
+def _timestamp(value) -> Optional[str]:
+    """ISO 8601 (con o sin hora); el formato de fecha HTTP de jsonify también vale."""
+    if _blank(value):
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).replace(tzinfo=None).isoformat(sep=" ")
+    except ValueError:
+        return datetime.strptime(text, "%a, %d %b %Y %H:%M:%S GMT").isoformat(sep=" ")
+
+
+def _list(value) -> Optional[List[str]]:
+    """Lista JSON, o texto separado por `;` (columnas de CSV)."""
+    if _blank(value):
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        value = json.loads(text) if text.startswith("[") else [part.strip() for part in text.split(";")]
+    return [str(item) for item in value if not _blank(item)]
+
+
+def _json(value) -> Optional[str]:
+    if _blank(value):
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _query_ref(record: Dict) -> Tuple[Optional[int], Optional[str]]:
+    return _int(record.get("query_id")), _text(record.get("query") or record.get("query_text"))
+
+
+def query_row(record: Dict) -> Tuple:
+    query = _text(record.get("query") or record.get("query_text") or record.get("text"))
+    if query is None:
+        raise ValueError(f"Query sin texto: {record}")
+    return (query, _text(record.get("brand")), _text(record.get("topic")), _bool(record.get("enabled")),
+            _text(record.get("language")))
+
+
+def mention_row(record: Dict) -> Tuple:
+    query_id, query_text = _query_ref(record)
+    confidence = record.get("confidence_score", record.get("confidence"))
+    return (
+        query_id, query_text, _text(record.get("engine")), _text(record.get("source")),
+        _text(record.get("response")), _float(record.get("sentiment")), _text(record.get("emotion")),
+        _float(confidence), _text(record.get("source_title")), _text(record.get("source_url")),
+        _text(record.get("language")), _timestamp(record.get("created_at")), _text(record.get("summary")),
+        _list(record.get("key_topics")), _text(record.get("status")),
+    )
+
+
+def insight_row(record: Dict) -> Tuple:
+    query_id, query_text = _query_ref(record)
+    payload = _json(record.get("payload"))
+    if payload is None:
+        # Tarjeta de /api/insights: el kind va en tags[0] (o se deduce de la categoría).
+        tags = record.get("tags") or []
+        kind = tags[0] if tags and tags[0] in KINDS else CARD_CATEGORY_KINDS.get(record.get("category"))
+        text = _text(record.get("excerpt") or record.get("title"))
+        if kind is None or text is None:
+            raise ValueError(f"Insight sin payload ni tarjeta reconocible: {record}")
+        payload = json.dumps({kind: [text]}, ensure_ascii=False)
+    return query_id, query_text, payload, _timestamp(record.get("created_at") or record.get("date"))
+
+
+ROW_BUILDERS = {"queries": query_row, "mentions": mention_row, "insights": insight_row}
+
+
+# --- COPY ---
+
+def _copy_value(value) -> str:
+    """Valor en el formato de texto de COPY (NULL = \\N)."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        value = "{" + ",".join('"' + item.replace("\\", "\\\\").replace('"', '\\"') + '"' for item in value) + "}"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_lines(rows: Iterable[Tuple], first_row_number: int = 1) -> Iterator[str]:
+    """Líneas de COPY con el número de fila del fichero al final."""
+    for number, row in enumerate(rows, first_row_number):
+        yield "\t".join(_copy_value(value) for value in row) + f"\t{number}\n"
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _rate(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:,.0f} filas/s" if seconds else "-"
+
+
+def load(conn, entity: str, records: Iterable[Dict], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """
+    Carga `records` en `entity` (queries, mentions o insights) en una
+    transacción. Devuelve {staged, inserted, updated, seconds}.
+    """
+    columns = STAGE_COLUMNS[entity]
+    build = ROW_BUILDERS[entity]
+    started = time.monotonic()
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE bulk_stage ("
+            + ", ".join(f"{name} {sql_type}" for name, sql_type in columns)
+            + ", row_number BIGINT) ON COMMIT DROP"
+        )
+        copy_sql = f"COPY bulk_stage ({', '.join(name for name, _type in columns)}, row_number) FROM STDIN"
+        staged = 0
+        for chunk in _chunks((build(record) for record in records), chunk_rows):
+            cur.copy_expert(copy_sql, io.StringIO("".join(copy_lines(chunk, staged + 1))))
+            staged += len(chunk)
+            print(f"   📥 {staged:,} filas copiadas ({_rate(staged, time.monotonic() - started)})")
+        copied_at = time.monotonic()
+        cur.execute("ANALYZE bulk_stage")
+
+        if entity != "queries":
+            cur.execute(MISSING_QUERIES_SQL)
+            cur.execute("SELECT MIN(created_at) FROM bulk_stage")
+            oldest = cur.fetchone()[0]
+            tables = ("mentions", "mention_bodies") if entity == "mentions" else ("insights", "insight_items")
+            for table in tables:
+                ensure_monthly_partitions(cur, table, start=oldest)
+
+        cur.execute(MERGE_SQL[entity])
+        if entity == "queries":
+            flags = [row[0] for row in cur.fetchall()]
+            inserted, updated = flags.count(True), flags.count(False)
+        else:
+            inserted, updated = cur.rowcount, 0
+        data_version.bump(cur, f"bulk_load:{entity}")
+    conn.commit()
+
+    seconds = time.monotonic() - started
+    print(f"   🧮 {entity}: {inserted:,} insertadas, {updated:,} actualizadas en {seconds - (copied_at - started):.1f}s")
+    return {"staged": staged, "inserted": inserted, "updated": updated, "seconds": seconds}
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Carga masiva con COPY (CSV, JSONL o JSON)")
+    parser.add_argument("entity", choices=tuple(STAGE_COLUMNS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="Por defecto, según la extensión")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Filas por bloque de COPY")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Cargando {args.entity} desde {args.path}")
+    with get_db_connection() as conn:
+        result = load(conn, args.entity, read_records(args.path, args.format), args.chunk_rows)
+    print(f"✅ {result['staged']:,} filas en {result['seconds']:.1f}s "
+          f"({_rate(result['staged'], result['seconds'])}): {result['inserted']:,} insertadas, "
+          f"{result['updated']:,} actualizadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# backend/src/db/connection.py
+"""
+Configuración de conexión compartida por `app.py`, el poller, las
+migraciones y los módulos de `src/db`.
+
+Usa las variables DB_* de `.env.example`. Las POSTGRES_* (las de
+docker-compose, que usaban el poller y algunos scripts) se aceptan como
+alternativa para no romper entornos existentes.
+"""
+import os
+
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env(name: str, default: str) -> str:
+    legacy = {"DB_NAME": "POSTGRES_DB"}.get(name, name.replace("DB_", "POSTGRES_", 1))
+    return os.getenv(name) or os.getenv(legacy) or default
+
+
+DB_CONFIG = {
+    "host": _env("DB_HOST", "localhost"),
+    "port": int(_env("DB_PORT", "5433")),
+    "database": _env("DB_NAME", "ai_visibility"),
+    "user": _env("DB_USER", "postgres"),
+    "password": _env("DB_PASSWORD", "postgres")
+}
+
+
+def get_db_connection():
+    """Obtener conexión a la base de datos"""
+    return psycopg2.connect(**DB_CONFIG)
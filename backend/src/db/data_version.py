@@ -0,0 +1,86 @@
+# backend/src/db/data_version.py
+"""
+Versión de los datos que sirve la API.
+
+`data_version` es un contador de una sola fila. Todo lo que cambia lo que ven
+los endpoints lo incrementa en la misma transacción que sus escrituras: el
+fin de cada ciclo del poller, el re-enriquecimiento, el archivado y la
+restauración, las cargas masivas y las escrituras de la propia API. La caché
+de respuestas de app.py (src/utils/response_cache.py) guarda cada respuesta
+con la versión con la que se calculó y deja de servirla en cuanto cambia.
+
+Uso por línea de comandos:
+    python -m src.db.data_version install
+    python -m src.db.data_version show
+    python -m src.db.data_version bump [--reason manual]
+"""
+import argparse
+from typing import Optional
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0,
+    reason TEXT,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO data_version (id) VALUES (TRUE) ON CONFLICT DO NOTHING;
+"""
+
+BUMP_SQL = "UPDATE data_version SET version = version + 1, reason = %s, updated_at = NOW() RETURNING version"
+
+
+def install(cur) -> None:
+    cur.execute(SCHEMA_SQL)
+
+
+def _installed(cur) -> bool:
+    cur.execute("SELECT to_regclass('data_version') IS NOT NULL")
+    return cur.fetchone()[0]
+
+
+def bump(cur, reason: str) -> Optional[int]:
+    """
+    Incrementa la versión (se hace visible con el commit de la transacción).
+    Devuelve la nueva versión, o None si la migración v16 no está aplicada.
+    """
+    if not _installed(cur):
+        return None
+    cur.execute(BUMP_SQL, (reason,))
+    return cur.fetchone()[0]
+
+
+def current(cur) -> Optional[int]:
+    """Versión actual, o None si la migración v16 no está aplicada."""
+    if not _installed(cur):
+        return None
+    cur.execute("SELECT version FROM data_version")
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Versión de los datos de la API")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+    sub.add_parser("show")
+    p_bump = sub.add_parser("bump")
+    p_bump.add_argument("--reason", default="manual")
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "install":
+                install(cur)
+                print("✅ data_version instalada")
+            elif args.command == "show":
+                print(f"📌 Versión de los datos: {current(cur)}")
+            elif args.command == "bump":
+                print(f"✅ Nueva versión: {bump(cur, args.reason)}")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
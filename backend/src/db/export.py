@@ -0,0 +1,79 @@
+# backend/src/db/export.py
+"""
+Exportación en streaming de menciones e insights (NDJSON o CSV).
+
+`stream_rows()` lee con un cursor con nombre (del lado del servidor) en
+bloques de EXPORT_CHUNK_ROWS filas y cada bloque se escribe en la respuesta
+antes de pedir el siguiente, así que la memoria del proceso no depende del
+tamaño de la exportación (a diferencia de los `fetchall()` de show_all.py o
+view_insights.py).
+
+Las filas salen en orden (created_at, id) ascendente y siempre llevan `id` y
+`created_at`: una exportación cortada se reanuda con
+`cursor=encode_cursor([created_at, id])` de la última fila recibida, que es
+lo que hace scripts/export_data.py.
+"""
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+from src.utils.pagination import encode_cursor
+
+DEFAULT_CHUNK_ROWS = 1000
+
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def chunk_rows() -> int:
+    return int(os.getenv("EXPORT_CHUNK_ROWS", DEFAULT_CHUNK_ROWS))
+
+
+def stream_rows(conn, sql: str, params: Dict, size: int) -> Iterator[List[tuple]]:
+    """Bloques de como mucho `size` filas de `sql`, leídos con un cursor con nombre."""
+    with conn.cursor(name=f"export_{uuid.uuid4().hex[:12]}") as cur:
+        cur.itersize = size
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(size)
+            if not rows:
+                break
+            yield rows
+    conn.rollback()
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def csv_chunk(records: Sequence[Dict], fields: Sequence[str], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_csv_value(record.get(name)) for name in fields] for record in records)
+    return buffer.getvalue()
+
+
+def ndjson_chunk(records: Iterable[Dict], dumps: Callable[[Any], str]) -> str:
+    return "".join(dumps(record) + "\n" for record in records)
+
+
+def resume_cursor(record: Dict) -> str:
+    """Cursor para reanudar después de `record` (una fila ya exportada)."""
+    created_at = record["created_at"]
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return encode_cursor([created_at, record["id"]])
@@ -0,0 +1,145 @@
+# backend/src/db/industry_views.py
+"""
+Vistas materializadas para los endpoints de industry.
+
+`mv_brand_daily` precalcula, por día y marca, el número de menciones y la suma
+de sentimiento a partir de `mention_brands` (marcas extraídas en la ingesta,
+ver src/engines/brands.py). Una mención que cita varias marcas cuenta para
+todas ellas. Los endpoints de share-of-voice, ranking y competitors leen de
+aquí en lugar de agregar las menciones de la ventana en cada petición.
+
+`mv_brand_cumulative` guarda, para cada marca y cada día desde el primero con
+datos (también los días sin menciones), los acumulados de `mv_brand_daily`
+hasta ese día: lo de cualquier periodo es la resta de dos filas por marca, así
+que el ranking con comparación (src/db/ranking.py) lee lo mismo para 7 días
+que para un año.
+
+La vista se refresca con REFRESH ... CONCURRENTLY al final de cada ciclo del
+poller (las lecturas no se bloquean) y cada refresco queda registrado en
+`mv_refresh_log` con su duración.
+
+Uso por línea de comandos:
+    python -m src.db.industry_views install
+    python -m src.db.industry_views refresh
+"""
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# En orden de refresco: mv_brand_cumulative se calcula desde mv_brand_daily.
+MATERIALIZED_VIEWS = ("mv_brand_daily", "mv_brand_cumulative")
+
+# Acumulados por marca y día sobre la rejilla completa marcas × días de {source}.
+BRAND_CUMULATIVE_SQL = """
+SELECT g.day::date AS day, b.brand,
+       (SUM(COALESCE(f.mentions, 0)) OVER w)::bigint AS mentions,
+       SUM(COALESCE(f.sentiment_sum, 0)) OVER w AS sentiment_sum,
+       (SUM(COALESCE(f.sentiment_count, 0)) OVER w)::bigint AS sentiment_count
+FROM (SELECT DISTINCT brand FROM {source}) b
+CROSS JOIN generate_series((SELECT min(day) FROM {source}), (SELECT max(day) FROM {source}), interval '1 day') g(day)
+LEFT JOIN {source} f ON f.brand = b.brand AND f.day = g.day
+WINDOW w AS (PARTITION BY b.brand ORDER BY g.day)
+"""
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS mv_refresh_log (
+    id SERIAL PRIMARY KEY,
+    view_name TEXT NOT NULL,
+    started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    row_count BIGINT
+);
+CREATE INDEX IF NOT EXISTS idx_mv_refresh_log_view_started
+    ON mv_refresh_log (view_name, started_at DESC);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_brand_daily AS
+SELECT
+    DATE(mb.created_at) AS day,
+    mb.brand,
+    COUNT(*) AS mentions,
+    SUM(mb.count) AS occurrences,
+    COALESCE(SUM(m.sentiment), 0) AS sentiment_sum,
+    COUNT(m.sentiment) AS sentiment_count
+FROM mention_brands mb
+JOIN mentions m ON m.id = mb.mention_id AND m.created_at = mb.created_at
+GROUP BY 1, 2;
+
+-- Requisito de REFRESH ... CONCURRENTLY: un índice único sin predicado.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_brand_daily_key
+    ON mv_brand_daily (day, brand);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_brand_cumulative AS
+""" + BRAND_CUMULATIVE_SQL.format(source="mv_brand_daily") + """;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_brand_cumulative_key
+    ON mv_brand_cumulative (day, brand);
+"""
+
+
+def install(cur) -> None:
+    """Crea las vistas, su índice único y la tabla de log (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+
+
+def refresh(cur, views=MATERIALIZED_VIEWS) -> Dict[str, float]:
+    """
+    Refresca cada vista CONCURRENTLY y registra la duración en
+    `mv_refresh_log`. Devuelve {vista: duración en ms}. Las vistas que aún no
+    existen se omiten.
+    """
+    durations = {}
+    for view in views:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (f"public.{view}",))
+        if not cur.fetchone()[0]:
+            continue
+        started = time.perf_counter()
+        cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+        duration_ms = (time.perf_counter() - started) * 1000
+        cur.execute(
+            f"""
+            INSERT INTO mv_refresh_log (view_name, duration_ms, row_count)
+            SELECT %s, %s, COUNT(*) FROM {view}
+            """,
+            (view, duration_ms),
+        )
+        durations[view] = duration_ms
+        logger.info("🔄 %s refrescada en %.1f ms", view, duration_ms)
+    return durations
+
+
+def last_refreshes(cur, limit: int = 10) -> List[Dict]:
+    """Últimos refrescos registrados, para diagnóstico."""
+    cur.execute(
+        "SELECT view_name, started_at, duration_ms, row_count FROM mv_refresh_log "
+        "ORDER BY started_at DESC LIMIT %s",
+        (limit,),
+    )
+    return [
+        {"view": row[0], "started_at": row[1].isoformat(), "duration_ms": round(row[2], 1), "rows": row[3]}
+        for row in cur.fetchall()
+    ]
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Vistas materializadas de industry")
+    parser.add_argument("command", choices=("install", "refresh"))
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "install":
+                install(cur)
+                print("✅ Vistas de industry instaladas")
+            else:
+                for view, ms in refresh(cur).items():
+                    print(f"✅ {view} refrescada en {ms:.1f} ms")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
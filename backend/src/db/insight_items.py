@@ -0,0 +1,186 @@
+# backend/src/db/insight_items.py
+"""
+Elementos de los insights en filas: una por cada oportunidad, riesgo,
+tendencia, tema, cita, CTA... de `insights.payload`.
+
+`insight_items(insight_id, query_id, kind, text, rank, done, created_at)`
+guarda cada elemento de las listas de texto del payload (`kind` es la clave
+del payload y `rank` su posición, empezando en 1). Así /api/insights,
+/api/visibility y los CTAs son SELECTs y agregados indexados por
+(kind, created_at) en lugar de traer los JSONB enteros y recorrerlos en
+Python. `done` es el estado de los CTAs que se marcan desde el frontend
+(PATCH /api/insight-items/<id>).
+
+Se mantiene con triggers a nivel de sentencia sobre `insights` (INSERT, UPDATE
+del payload y DELETE) y está particionada por mes como `insights`.
+
+Uso por línea de comandos:
+    python -m src.db.insight_items install
+    python -m src.db.insight_items backfill [--batch-size 2000]
+    python -m src.db.insight_items stats
+"""
+import argparse
+from typing import List, Optional, Tuple
+
+from src.db.migrate import batched_update
+from src.db.partitions import ensure_monthly_partitions
+
+# Claves del payload que son listas de texto (ver extract_insights).
+KINDS = (
+    "opportunities", "risks", "pain_points", "trends", "quotes", "top_themes",
+    "calls_to_action", "competitors", "audience_targeting", "products_or_features",
+)
+
+# Elementos de las filas de insights de {source}.
+ITEMS_SELECT_SQL = """
+    SELECT i.id, i.query_id, k.kind, btrim(e.text), e.rank, i.created_at
+    FROM {source} i
+    CROSS JOIN unnest({kinds}::text[]) AS k(kind)
+    CROSS JOIN LATERAL jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(i.payload -> k.kind) = 'array' THEN i.payload -> k.kind ELSE '[]'::jsonb END
+    ) WITH ORDINALITY AS e(text, rank)
+    WHERE btrim(e.text) <> ''
+"""
+
+INSERT_SQL = "INSERT INTO insight_items (insight_id, query_id, kind, text, rank, created_at)"
+
+KINDS_ARRAY_SQL = "ARRAY[" + ", ".join(f"'{kind}'" for kind in KINDS) + "]"
+
+
+def items_select(source: str) -> str:
+    return ITEMS_SELECT_SQL.format(source=source, kinds=KINDS_ARRAY_SQL)
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS insight_items (
+    id SERIAL,
+    insight_id INTEGER NOT NULL,
+    query_id INTEGER,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    rank SMALLINT NOT NULL,
+    done BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE INDEX IF NOT EXISTS idx_insight_items_kind_created_at ON insight_items (kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_insight_items_insight_id ON insight_items (insight_id);
+CREATE INDEX IF NOT EXISTS idx_insight_items_query_id_created_at ON insight_items (query_id, created_at);
+"""
+
+TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION insight_items_after_insert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+""" + INSERT_SQL + items_select("new_rows") + """;
+    RETURN NULL;
+END $$;
+
+-- Solo se rehacen los elementos de los insights cuyo payload cambió
+-- (p. ej. re-enriquecimiento). El estado `done` pasa a los elementos nuevos
+-- con el mismo (insight_id, kind, text).
+CREATE OR REPLACE FUNCTION insight_items_after_update() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    WITH changed AS (
+        SELECT n.* FROM new_rows n JOIN old_rows o ON o.id = n.id AND o.created_at = n.created_at
+        WHERE n.payload IS DISTINCT FROM o.payload OR n.query_id IS DISTINCT FROM o.query_id
+    ), deleted AS (
+        DELETE FROM insight_items it USING changed c
+        WHERE it.insight_id = c.id AND it.created_at = c.created_at
+        RETURNING it.insight_id, it.kind, it.text, it.done
+    ), was_done AS (
+        SELECT insight_id, kind, text FROM deleted GROUP BY insight_id, kind, text HAVING bool_or(done)
+    )
+    INSERT INTO insight_items (insight_id, query_id, kind, text, rank, done, created_at)
+    SELECT n.insight_id, n.query_id, n.kind, n.text, n.rank, w.insight_id IS NOT NULL, n.created_at
+    FROM (""" + items_select("changed") + """) AS n(insight_id, query_id, kind, text, rank, created_at)
+    LEFT JOIN was_done w ON w.insight_id = n.insight_id AND w.kind = n.kind AND w.text = n.text;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION insight_items_after_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM insight_items it USING old_rows o
+    WHERE it.insight_id = o.id AND it.created_at = o.created_at;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_insight_items_insert ON insights;
+CREATE TRIGGER trg_insight_items_insert AFTER INSERT ON insights
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION insight_items_after_insert();
+
+DROP TRIGGER IF EXISTS trg_insight_items_update ON insights;
+CREATE TRIGGER trg_insight_items_update AFTER UPDATE ON insights
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION insight_items_after_update();
+
+DROP TRIGGER IF EXISTS trg_insight_items_delete ON insights;
+CREATE TRIGGER trg_insight_items_delete AFTER DELETE ON insights
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION insight_items_after_delete();
+"""
+
+BACKFILL_SQL = INSERT_SQL + items_select("insights") + """
+      AND i.id >= %(lo)s AND i.id < %(hi)s
+      AND NOT EXISTS (SELECT 1 FROM insight_items it WHERE it.insight_id = i.id AND it.created_at = i.created_at)
+"""
+
+
+def install(cur) -> None:
+    """Crea la tabla (con particiones desde el insight más antiguo) y los triggers."""
+    cur.execute(SCHEMA_SQL)
+    cur.execute("SELECT MIN(created_at) FROM insights")
+    oldest = cur.fetchone()[0]
+    ensure_monthly_partitions(cur, "insight_items", start=oldest)
+    cur.execute(TRIGGERS_SQL)
+
+
+def backfill(conn, batch_size: Optional[int] = None) -> int:
+    """
+    Rellena los elementos de los insights existentes por lotes de ids. Los
+    triggers ya están activos, así que los insights que ya tienen elementos
+    se saltan. Devuelve las filas insertadas.
+    """
+    return batched_update(conn, BACKFILL_SQL, "insights", batch_size=batch_size, label="insight_items")
+
+
+def stats(cur) -> List[Tuple[str, int, int]]:
+    """(kind, elementos, insights) de toda la tabla."""
+    cur.execute("""
+        SELECT kind, COUNT(*), COUNT(DISTINCT insight_id)
+        FROM insight_items GROUP BY kind ORDER BY COUNT(*) DESC
+    """)
+    return cur.fetchall()
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Elementos normalizados de los insights")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+    p_backfill = sub.add_parser("backfill")
+    p_backfill.add_argument("--batch-size", type=int)
+    sub.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        if args.command == "install":
+            with conn.cursor() as cur:
+                install(cur)
+            conn.commit()
+            print("✅ insight_items y triggers instalados")
+        elif args.command == "backfill":
+            rows = backfill(conn, args.batch_size)
+            print(f"✅ {rows} elementos insertados")
+        elif args.command == "stats":
+            with conn.cursor() as cur:
+                for kind, items, insights in stats(cur):
+                    print(f"{kind:<24} {items:>10} elementos {insights:>8} insights")
+
+
+if __name__ == "__main__":
+    main()
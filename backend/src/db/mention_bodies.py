@@ -0,0 +1,61 @@
+# backend/src/db/mention_bodies.py
+"""
+Texto completo de las menciones, separado de `mentions`.
+
+`mention_bodies` guarda la respuesta del motor (varios KB por fila) y su parte
+del índice de texto completo. `mentions` queda estrecha (ids, motor,
+sentimiento, fechas, resumen...), así que los agregados y los listados leen
+muchas menos páginas; el texto solo se carga en los endpoints de detalle.
+
+Ambas tablas comparten (id, created_at) y están particionadas por mes.
+"""
+from typing import Optional, Tuple
+
+BODY_JOIN_SQL = "JOIN mention_bodies b ON b.mention_id = m.id AND b.created_at = m.created_at"
+
+# Cualquier borrado de menciones (también el ON DELETE CASCADE desde queries)
+# se lleva su cuerpo. La FK apunta a la clave primaria de `mentions`, que
+# incluye la clave de partición como exige PostgreSQL.
+FOREIGN_KEY_NAME = "mention_bodies_mention_fkey"
+FOREIGN_KEY_SQL = "FOREIGN KEY (mention_id, created_at) REFERENCES mentions (id, created_at) ON DELETE CASCADE"
+
+
+def has_bodies(cur) -> bool:
+    """True si ya se aplicó la migración v12 (el texto vive en mention_bodies)."""
+    cur.execute("SELECT to_regclass('public.mention_bodies') IS NOT NULL")
+    return bool(cur.fetchone()[0])
+
+
+def add_foreign_key(cur) -> int:
+    """
+    Borra los cuerpos huérfanos y añade la FK a `mentions` (idempotente).
+    Devuelve los huérfanos borrados.
+    """
+    cur.execute("SELECT 1 FROM pg_constraint WHERE conname = %s", (FOREIGN_KEY_NAME,))
+    if cur.fetchone():
+        return 0
+    cur.execute("""
+        DELETE FROM mention_bodies b
+        WHERE NOT EXISTS (SELECT 1 FROM mentions m WHERE m.id = b.mention_id AND m.created_at = b.created_at)
+    """)
+    orphans = cur.rowcount
+    cur.execute(f"ALTER TABLE mention_bodies ADD CONSTRAINT {FOREIGN_KEY_NAME} {FOREIGN_KEY_SQL}")
+    return orphans
+
+
+def response_source(cur) -> Tuple[str, str]:
+    """
+    (FROM, columna) para leer el texto de una mención tanto antes como después
+    de la migración v12; lo usan los backfills que pueden ejecutarse en
+    cualquiera de los dos esquemas.
+    """
+    if has_bodies(cur):
+        return f"mentions m {BODY_JOIN_SQL}", "b.response"
+    return "mentions m", "m.response"
+
+
+def fetch_response(cur, mention_id: int) -> Optional[str]:
+    """Texto completo de una mención (None si no existe)."""
+    cur.execute("SELECT response FROM mention_bodies WHERE mention_id = %s", (mention_id,))
+    row = cur.fetchone()
+    return row[0] if row else None
@@ -0,0 +1,252 @@
+# backend/src/db/migrate.py
+"""
+Ejecutor de migraciones versionadas.
+
+Cada migración es un `migrate_vN_<nombre>.py` en la raíz de `backend/` que
+expone `upgrade(conn)`. Las versiones aplicadas se registran en
+`schema_migrations`, así que `up` solo ejecuta las pendientes y en orden; se
+puede relanzar tras un fallo sin repetir lo ya hecho. Cada migración recibe
+una conexión nueva (algunas necesitan autocommit para CONCURRENTLY) y un
+advisory lock impide que dos ejecuciones se solapen.
+
+`batched_update()` es el helper para backfills online: recorre la tabla por
+rangos de clave, un lote por transacción con `lock_timeout` corto, pausa entre
+lotes para no saturar al poller y muestra progreso. El tamaño de lote y la
+pausa salen de MIGRATION_BATCH_SIZE / MIGRATION_BATCH_PAUSE o de los flags
+`--batch-size` / `--pause`.
+
+Uso por línea de comandos:
+    python -m src.db.migrate status
+    python -m src.db.migrate up [--to 12] [--batch-size 5000] [--pause 0.2]
+    python -m src.db.migrate baseline 12     # BD existente: marcar sin ejecutar
+"""
+import argparse
+import importlib.util
+import os
+import re
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+import psycopg2
+import psycopg2.errors
+
+from src.db.connection import DB_CONFIG
+
+MIGRATIONS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MIGRATION_FILE_RE = re.compile(r"^migrate_v(\d+)_(\w+)\.py$")
+ADVISORY_LOCK_ID = 0x6D696772  # "migr"
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_BATCH_PAUSE = 0.0
+BATCH_LOCK_TIMEOUT = "2s"
+BATCH_LOCK_RETRIES = 5
+
+Migration = namedtuple("Migration", "version name path")
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+)
+"""
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Migraciones de `directory` ordenadas por versión."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+    versions = [m.version for m in migrations]
+    duplicated = sorted({v for v in versions if versions.count(v) > 1})
+    if duplicated:
+        raise ValueError(f"Versiones de migración duplicadas: {duplicated}")
+    return migrations
+
+
+def load(migration: Migration):
+    """Importa el fichero de la migración y devuelve su función `upgrade`."""
+    spec = importlib.util.spec_from_file_location(f"migrate_v{migration.version}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "upgrade"):
+        raise AttributeError(f"{os.path.basename(migration.path)} no define upgrade(conn)")
+    return module.upgrade
+
+
+def applied_versions(cur) -> Dict[int, str]:
+    cur.execute(SCHEMA_MIGRATIONS_SQL)
+    cur.execute("SELECT version, applied_at FROM schema_migrations ORDER BY version")
+    return {version: applied_at for version, applied_at in cur.fetchall()}
+
+
+def pending(migrations: List[Migration], applied: Dict[int, str], to: Optional[int] = None) -> List[Migration]:
+    return [m for m in migrations if m.version not in applied and (to is None or m.version <= to)]
+
+
+def _record(cur, migration: Migration, duration_ms: Optional[int]) -> None:
+    cur.execute(
+        "INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s) "
+        "ON CONFLICT (version) DO NOTHING",
+        (migration.version, migration.name, duration_ms),
+    )
+
+
+def _lock_connection():
+    """Conexión en autocommit que mantiene el advisory lock durante la ejecución."""
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+        if not cur.fetchone()[0]:
+            conn.close()
+            raise RuntimeError("Otra ejecución de migraciones está en curso")
+    return conn
+
+
+def upgrade(to: Optional[int] = None, directory: str = MIGRATIONS_DIR) -> List[int]:
+    """Aplica las migraciones pendientes hasta `to` (incluida). Devuelve las versiones aplicadas."""
+    migrations = discover(directory)
+    done = []
+    lock_conn = _lock_connection()
+    try:
+        with lock_conn.cursor() as cur:
+            todo = pending(migrations, applied_versions(cur), to)
+            if not todo:
+                print("✓ No hay migraciones pendientes")
+            for migration in todo:
+                print(f"🚀 v{migration.version} {migration.name}")
+                started = time.monotonic()
+                conn = psycopg2.connect(**DB_CONFIG)
+                try:
+                    load(migration)(conn)
+                    if not conn.closed and not conn.autocommit:
+                        conn.commit()
+                except Exception:
+                    if not conn.closed and not conn.autocommit:
+                        conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+                duration_ms = int((time.monotonic() - started) * 1000)
+                _record(cur, migration, duration_ms)
+                done.append(migration.version)
+                print(f"✅ v{migration.version} aplicada en {duration_ms / 1000:.1f}s")
+    finally:
+        lock_conn.close()
+    return done
+
+
+def baseline(version: int, directory: str = MIGRATIONS_DIR) -> List[int]:
+    """Marca como aplicadas, sin ejecutarlas, las migraciones hasta `version`."""
+    marked = []
+    lock_conn = _lock_connection()
+    try:
+        with lock_conn.cursor() as cur:
+            for migration in pending(discover(directory), applied_versions(cur), version):
+                _record(cur, migration, None)
+                marked.append(migration.version)
+    finally:
+        lock_conn.close()
+    return marked
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def batched_update(conn, sql: str, table: str, key: str = "id", batch_size: Optional[int] = None,
+                   pause: Optional[float] = None, label: Optional[str] = None) -> int:
+    """
+    Ejecuta `sql` (con los parámetros `%(lo)s` y `%(hi)s`) por rangos
+    `[lo, hi)` de `key` entre su mínimo y máximo en `table`, con un commit por
+    lote. Si un lote no consigue sus bloqueos en BATCH_LOCK_TIMEOUT se
+    reintenta con espera creciente en vez de quedarse bloqueando al poller.
+    Devuelve el total de filas afectadas.
+    """
+    batch_size = batch_size or int(os.getenv("MIGRATION_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+    pause = float(os.getenv("MIGRATION_BATCH_PAUSE", DEFAULT_BATCH_PAUSE)) if pause is None else pause
+    label = label or table
+
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+        first, last = cur.fetchone()
+    conn.commit()
+    if first is None:
+        print(f"   ✓ {label}: tabla vacía")
+        return 0
+
+    total_rows, span, started = 0, last - first + 1, time.monotonic()
+    for lo in range(first, last + 1, batch_size):
+        hi = lo + batch_size
+        for attempt in range(BATCH_LOCK_RETRIES + 1):
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f"SET LOCAL lock_timeout = '{BATCH_LOCK_TIMEOUT}'")
+                    cur.execute(sql, {"lo": lo, "hi": hi})
+                    total_rows += max(cur.rowcount, 0)
+                conn.commit()
+                break
+            except psycopg2.errors.LockNotAvailable:
+                conn.rollback()
+                if attempt == BATCH_LOCK_RETRIES:
+                    raise
+                time.sleep(2 ** attempt)
+
+        done = min(hi, last + 1) - first
+        elapsed = time.monotonic() - started
+        rate = total_rows / elapsed if elapsed else 0.0
+        eta = elapsed / done * (span - done) if done else 0.0
+        print(f"   📝 {label}: {done / span:6.1%}  {key} < {hi}  {total_rows} filas  "
+              f"{rate:,.0f} filas/s  ETA {_format_duration(eta)}")
+        if pause and hi <= last:
+            time.sleep(pause)
+    return total_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migraciones versionadas del esquema")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status")
+
+    p_up = sub.add_parser("up")
+    p_up.add_argument("--to", type=int, help="Última versión a aplicar")
+    p_up.add_argument("--batch-size", type=int, help="Filas por lote en los backfills")
+    p_up.add_argument("--pause", type=float, help="Segundos de pausa entre lotes")
+
+    p_baseline = sub.add_parser("baseline")
+    p_baseline.add_argument("version", type=int)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        with psycopg2.connect(**DB_CONFIG) as conn:
+            with conn.cursor() as cur:
+                applied = applied_versions(cur)
+        for migration in discover():
+            state = f"aplicada {applied[migration.version]:%Y-%m-%d %H:%M}" if migration.version in applied else "pendiente"
+            print(f"v{migration.version:<4} {migration.name:<32} {state}")
+    elif args.command == "up":
+        # Los backfills leen la configuración de lotes del entorno.
+        if args.batch_size:
+            os.environ["MIGRATION_BATCH_SIZE"] = str(args.batch_size)
+        if args.pause is not None:
+            os.environ["MIGRATION_BATCH_PAUSE"] = str(args.pause)
+        done = upgrade(args.to)
+        if done:
+            print(f"✅ {len(done)} migraciones aplicadas: {', '.join(f'v{v}' for v in done)}")
+    elif args.command == "baseline":
+        marked = baseline(args.version)
+        print(f"✅ {len(marked)} migraciones marcadas como aplicadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# backend/src/db/partitions.py
+"""
+Gestión de particiones mensuales por `created_at` para `mentions`, `insights`,
+`mention_bodies` e `insight_items`.
+
+Tras `migrate_v6_partition_tables.py` (la v12 para `mention_bodies` y la v14
+para `insight_items`) las cuatro tablas están particionadas por rango mensual. Este módulo:
+
+    • ensure_monthly_partitions() → crea por adelantado las particiones de los
+      próximos meses (el poller lo llama al inicio de cada ciclo).
+    • detach_partition()          → saca un mes antiguo de la tabla en O(1)
+      (solo metadatos); la tabla resultante puede archivarse o borrarse.
+    • create_index_online()       → crea un índice sin bloquear escrituras,
+      partición a partición con CONCURRENTLY.
+    • install_citations_cleanup() → sustituye la FK de `citations` a
+      `mentions`, que no puede apuntar solo a `id`, por un trigger de borrado.
+
+Uso por línea de comandos:
+    python -m src.db.partitions list mentions
+    python -m src.db.partitions ensure mentions --ahead 3
+    python -m src.db.partitions detach mentions 2025-01 [--drop]
+"""
+import argparse
+import logging
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("mentions", "insights", "mention_bodies", "insight_items")
+DEFAULT_MONTHS_AHEAD = 3
+
+# `citations` solo guarda mention_id, y una FK a la tabla particionada tendría
+# que incluir created_at. El ON DELETE CASCADE que tenía se mantiene con un
+# trigger de sentencia: cualquier borrado de menciones (también en cascada
+# desde queries) borra sus citas en un único DELETE por sentencia.
+CITATIONS_CLEANUP_SQL = """
+CREATE OR REPLACE FUNCTION citations_after_mentions_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM citations c USING old_rows o WHERE c.mention_id = o.id;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_citations_cleanup ON mentions;
+CREATE TRIGGER trg_citations_cleanup AFTER DELETE ON mentions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION citations_after_mentions_delete();
+"""
+
+
+def month_start(value) -> date:
+    """Primer día del mes de `value` (date o datetime)."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Suma `months` meses a una fecha que ya es inicio de mes."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Nombre canónico de la partición: mentions_y2025m09."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(cur, table: str) -> bool:
+    """True si `table` es una tabla particionada (relkind = 'p')."""
+    cur.execute(
+        "SELECT relkind FROM pg_class WHERE relname = %s AND relnamespace = 'public'::regnamespace",
+        (table,),
+    )
+    row = cur.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def _relation_exists(cur, name: str) -> bool:
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (f"public.{name}",))
+    return bool(cur.fetchone()[0])
+
+
+def _insertable_columns(cur, table: str) -> str:
+    """Columnas de `table` sin las generadas (no admiten valores explícitos)."""
+    cur.execute(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+        """,
+        (table,),
+    )
+    return ", ".join(row[0] for row in cur.fetchall())
+
+
+def create_month_partition(cur, table: str, month: date) -> bool:
+    """
+    Crea la partición de `month` si no existe. Si la partición DEFAULT tiene
+    filas de ese mes, se mueven a la nueva partición antes de adjuntarla.
+    Devuelve True si se creó.
+    """
+    name = partition_name(table, month)
+    if _relation_exists(cur, name):
+        return False
+
+    lower, upper = month, add_months(month, 1)
+    default = f"{table}_default"
+
+    has_default_rows = False
+    if _relation_exists(cur, default):
+        cur.execute(
+            f"SELECT 1 FROM {default} WHERE created_at >= %s AND created_at < %s LIMIT 1",
+            (lower, upper),
+        )
+        has_default_rows = cur.fetchone() is not None
+
+    if not has_default_rows:
+        cur.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+            (lower, upper),
+        )
+    else:
+        # No se puede crear una partición que solape filas de la DEFAULT:
+        # se crea suelta, se le mueven las filas y luego se adjunta.
+        cur.execute(
+            f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+        )
+        columns = _insertable_columns(cur, table)
+        cur.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {default}
+                WHERE created_at >= %s AND created_at < %s
+                RETURNING *
+            )
+            INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            """,
+            (lower, upper),
+        )
+        cur.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            (lower, upper),
+        )
+    logger.info("🧩 Partición %s creada [%s, %s)", name, lower, upper)
+    return True
+
+
+def ensure_monthly_partitions(cur, table: str, months_ahead: int = DEFAULT_MONTHS_AHEAD,
+                              start: Optional[date] = None) -> List[str]:
+    """
+    Garantiza que existen las particiones desde `start` (por defecto el mes
+    actual) hasta `months_ahead` meses por delante, más la partición DEFAULT.
+    No hace nada si la tabla todavía no está particionada.
+    """
+    if not is_partitioned(cur, table):
+        return []
+
+    created = []
+    first = month_start(start or datetime.now())
+    last = add_months(month_start(datetime.now()), months_ahead)
+    month = first
+    while month <= last:
+        if create_month_partition(cur, table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+
+    default = f"{table}_default"
+    if not _relation_exists(cur, default):
+        cur.execute(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT")
+        created.append(default)
+    return created
+
+
+def list_partitions(cur, table: str) -> List[Tuple[str, str, int]]:
+    """Devuelve (nombre, rango, filas estimadas) de cada partición de `table`."""
+    cur.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        ORDER BY c.relname
+        """,
+        (f"public.{table}",),
+    )
+    return cur.fetchall()
+
+
+def detach_partition(cur, table: str, month: date, drop: bool = False) -> str:
+    """
+    Separa la partición de `month`. Es una operación de metadatos (O(1)): no
+    mueve ni borra filas. Con `drop=True` la tabla separada se elimina.
+    """
+    name = partition_name(table, month_start(month))
+    if not _relation_exists(cur, name):
+        raise ValueError(f"La partición {name} no existe")
+    cur.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+    if drop:
+        cur.execute(f"DROP TABLE {name}")
+    logger.info("📤 Partición %s separada%s", name, " y eliminada" if drop else "")
+    return name
+
+
+def install_citations_cleanup(cur) -> int:
+    """
+    Borra las citas huérfanas e instala el trigger que borra las citas de las
+    menciones eliminadas (idempotente). Devuelve las citas huérfanas borradas.
+    """
+    cur.execute("""
+        DELETE FROM citations c
+        WHERE NOT EXISTS (SELECT 1 FROM mentions m WHERE m.id = c.mention_id)
+    """)
+    orphans = cur.rowcount
+    cur.execute(CITATIONS_CLEANUP_SQL)
+    return orphans
+
+
+def create_index_online(conn, table: str, name: str, definition: str) -> None:
+    """
+    Crea `CREATE INDEX {name} ON {table} {definition}` sin bloquear
+    escrituras. En una tabla particionada no existe CONCURRENTLY, así que se
+    crea el índice padre con ON ONLY (inválido), cada partición se indexa con
+    CONCURRENTLY y se adjunta; al adjuntar la última el padre pasa a válido.
+    `conn` debe estar en autocommit.
+    """
+    with conn.cursor() as cur:
+        if not is_partitioned(cur, table):
+            cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+            return
+
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition}")
+        for partition, _bounds, _rows in list_partitions(cur, table):
+            child = f"{name}_{partition[len(table) + 1:]}"
+            cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} ON {partition} {definition}")
+            cur.execute(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = %s::regclass AND inhparent = %s::regclass",
+                (f"public.{child}", f"public.{name}"),
+            )
+            if cur.fetchone() is None:
+                cur.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+        logger.info("🗂️  Índice %s creado en %s particiones de %s", name, len(list_partitions(cur, table)), table)
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Gestión de particiones mensuales")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list")
+    p_list.add_argument("table", choices=PARTITIONED_TABLES)
+
+    p_ensure = sub.add_parser("ensure")
+    p_ensure.add_argument("table", choices=PARTITIONED_TABLES)
+    p_ensure.add_argument("--ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+
+    p_detach = sub.add_parser("detach")
+    p_detach.add_argument("table", choices=PARTITIONED_TABLES)
+    p_detach.add_argument("month", help="Mes a separar, formato YYYY-MM")
+    p_detach.add_argument("--drop", action="store_true", help="Eliminar la tabla separada")
+
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "list":
+                for name, bounds, rows in list_partitions(cur, args.table):
+                    print(f"{name:<28} {rows:>10}  {bounds}")
+            elif args.command == "ensure":
+                created = ensure_monthly_partitions(cur, args.table, args.ahead)
+                print(f"✅ {len(created)} particiones creadas: {', '.join(created) or '-'}")
+            elif args.command == "detach":
+                month = datetime.strptime(args.month, "%Y-%m").date()
+                name = detach_partition(cur, args.table, month, drop=args.drop)
+                print(f"✅ Partición {name} separada")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# backend/src/db/ranking.py
+"""
+Ranking de marcas con comparación entre periodos, sobre mv_brand_cumulative.
+
+`fetch_ranking()` calcula en una sola consulta las menciones y el
+sentimiento medio de cada marca en el periodo actual y en el de comparación,
+la variación de menciones, la posición en cada periodo con rank() (los
+empates comparten posición) y el cambio de posición. Lo de cada periodo es
+la resta de dos filas de acumulados por marca (el día final y el anterior al
+inicial), así que el coste no depende de la longitud de los periodos: se
+leen como mucho 4 filas por marca. El corte top-N se hace sobre la posición
+actual, así que las marcas empatadas en el puesto N entran todas. El filtro
+`brand=` se aplica después de calcular las posiciones: una marca filtrada
+conserva su puesto en el mercado completo.
+
+Periodos de comparación (`comparison_period`):
+  • previous: los mismos días justo antes del periodo actual (por defecto)
+  • wow: el periodo actual una semana antes
+  • mom: el periodo actual un mes antes (el día se ajusta a fin de mes)
+  • custom: compare_from / compare_to explícitos
+
+Uso por línea de comandos:
+    python -m src.db.ranking show [--days 30] [--compare mom] [--limit 10]
+"""
+import argparse
+import calendar
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+COMPARISONS = ("previous", "wow", "mom", "custom")
+DEFAULT_LIMIT = 10
+
+# Los días posteriores al último con datos usan el último acumulado; los
+# anteriores al primero no tienen fila y cuentan como 0. Cada fila lleva el
+# signo con el que entra en cada periodo (+1 el día final, -1 el anterior al inicial).
+FETCH_SQL = """
+    WITH points AS (
+        SELECT LEAST(%(current_end)s::date, last_day) AS current_end,
+               LEAST(%(current_start)s::date - 1, last_day) AS current_before,
+               LEAST(%(previous_end)s::date, last_day) AS previous_end,
+               LEAST(%(previous_start)s::date - 1, last_day) AS previous_before
+        FROM (SELECT max(day) AS last_day FROM {table}) bounds
+    ),
+    signed AS (
+        SELECT c.brand, c.mentions, c.sentiment_sum, c.sentiment_count,
+               (c.day = p.current_end)::int - (c.day = p.current_before)::int AS current_sign,
+               (c.day = p.previous_end)::int - (c.day = p.previous_before)::int AS previous_sign
+        FROM points p
+        JOIN {table} c ON c.day IN (p.current_end, p.current_before, p.previous_end, p.previous_before)
+    ),
+    facts AS (
+        SELECT brand,
+               SUM(mentions * current_sign) AS current_mentions,
+               SUM(sentiment_sum * current_sign) / NULLIF(SUM(sentiment_count * current_sign), 0) AS current_sentiment,
+               SUM(mentions * previous_sign) AS previous_mentions,
+               SUM(sentiment_sum * previous_sign) / NULLIF(SUM(sentiment_count * previous_sign), 0) AS previous_sentiment
+        FROM signed
+        GROUP BY brand
+    ),
+    ranked AS (
+        SELECT *,
+               rank() OVER (ORDER BY current_mentions DESC) AS current_rank,
+               rank() OVER (ORDER BY previous_mentions DESC) AS previous_rank,
+               COUNT(*) FILTER (WHERE current_mentions > 0) OVER () AS brands_found
+        FROM facts
+    ),
+    shown AS (
+        SELECT *, rank() OVER (ORDER BY current_mentions DESC) AS shown_rank
+        FROM ranked
+        WHERE current_mentions > 0{brand_sql}
+    )
+    SELECT brand, current_mentions, current_sentiment, previous_mentions, previous_sentiment,
+           current_rank, CASE WHEN previous_mentions > 0 THEN previous_rank END, brands_found
+    FROM shown
+    WHERE shown_rank <= %(limit)s
+    ORDER BY current_rank, current_sentiment DESC NULLS LAST, brand
+"""
+
+
+def shift_months(day: date, months: int) -> date:
+    """`day` desplazado `months` meses; el día se ajusta al último del mes si no existe."""
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def comparison_period(current_start: date, current_end: date, compare: str = "previous",
+                      compare_from: Optional[date] = None, compare_to: Optional[date] = None) -> Tuple[date, date]:
+    """(inicio, fin) inclusivos del periodo con el que se compara [current_start, current_end]."""
+    if compare == "previous":
+        return current_start - (current_end - current_start) - timedelta(days=1), current_start - timedelta(days=1)
+    if compare == "wow":
+        return current_start - timedelta(days=7), current_end - timedelta(days=7)
+    if compare == "mom":
+        return shift_months(current_start, -1), shift_months(current_end, -1)
+    if compare == "custom":
+        if not compare_from or not compare_to:
+            raise ValueError("compare=custom requiere compare_from y compare_to")
+        if compare_from > compare_to:
+            raise ValueError("compare_from debe ser anterior a compare_to")
+        return compare_from, compare_to
+    raise ValueError(f"compare debe ser uno de {', '.join(COMPARISONS)}")
+
+
+def period_params(current_start: date, current_end: date, compare: str = "previous",
+                  compare_from: Optional[date] = None, compare_to: Optional[date] = None,
+                  limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+    """Parámetros de FETCH_SQL (los periodos y el top-N)."""
+    previous_start, previous_end = comparison_period(current_start, current_end, compare, compare_from, compare_to)
+    return {
+        "current_start": current_start, "current_end": current_end,
+        "previous_start": previous_start, "previous_end": previous_end,
+        "compare": compare, "limit": limit,
+    }
+
+
+def _delta(current: int, previous: int) -> float:
+    return round((current - previous) / previous * 100, 1) if previous else 100.0
+
+
+def fetch_ranking(cur, params: Dict[str, Any], brand_sql: str = "",
+                  table: str = "mv_brand_cumulative") -> Tuple[List[Dict[str, Any]], int]:
+    """
+    (filas del top-N, marcas con menciones en el periodo actual). `params` sale
+    de period_params() y `brand_sql` es una condición extra (" AND ...") sobre
+    la columna `brand`: filtra las marcas ya clasificadas, y el top-N cuenta
+    entre las que pasan el filtro. `previous_rank` es None si la marca no tuvo
+    menciones en el periodo de comparación; `rank_change` > 0 es subir puestos.
+    """
+    cur.execute(FETCH_SQL.format(table=table, brand_sql=brand_sql), params)
+    rows, brands_found = [], 0
+    for brand, mentions, sentiment, previous_mentions, previous_sentiment, rank, previous_rank, found in cur.fetchall():
+        mentions, previous_mentions = int(mentions), int(previous_mentions)
+        rows.append({
+            "brand": brand, "rank": int(rank), "mentions": mentions, "sentiment": float(sentiment or 0.0),
+            "previous_rank": int(previous_rank) if previous_rank else None,
+            "previous_mentions": previous_mentions,
+            "previous_sentiment": float(previous_sentiment) if previous_sentiment is not None else None,
+            "delta": _delta(mentions, previous_mentions),
+            "rank_change": int(previous_rank) - int(rank) if previous_rank else None,
+        })
+        brands_found = int(found)
+    return rows, brands_found
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Ranking de marcas con comparación entre periodos")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show")
+    p_show.add_argument("--days", type=int, default=30)
+    p_show.add_argument("--compare", choices=COMPARISONS[:-1], default="previous")
+    p_show.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            end = date.today()
+            params = period_params(end - timedelta(days=args.days - 1), end, args.compare, limit=args.limit)
+            rows, found = fetch_ranking(cur, params)
+            print(f"🏆 {found} marcas ({params['current_start']} → {params['current_end']} "
+                  f"vs {params['previous_start']} → {params['previous_end']})")
+            for row in rows:
+                change = "nueva" if row["rank_change"] is None else f"{row['rank_change']:+d}"
+                print(f"   {row['rank']:>2}. {row['brand']}: {row['mentions']} menciones "
+                      f"({row['delta']:+.1f}%, puesto {change})")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
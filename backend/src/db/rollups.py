@@ -0,0 +1,378 @@
+# backend/src/db/rollups.py
+"""
+Rollups de menciones por (granularidad, bucket, query_id, engine).
+
+`mention_rollups` guarda, para cada bucket de hora/día/semana, el número de
+menciones activas (`status = 'active'`: las archivadas no cuentan), la suma y
+el número de sentimientos, los positivos (> 0.2) y negativos (< -0.2) y un
+histograma de emociones. Se mantiene incrementalmente con triggers a nivel de
+sentencia sobre `mentions` (INSERT, UPDATE y DELETE: se suma lo nuevo y se
+resta lo viejo, como visibility_rollups), una sola agregación por sentencia
+sea de 1 fila o de un millón, y se puede reconstruir para backfills.
+
+Las consultas de ventanas [start, end] son exactas: los buckets enteros salen
+de los rollups y los trozos de bucket de los bordes, de `mentions`.
+
+Uso por línea de comandos:
+    python -m src.db.rollups install
+    python -m src.db.rollups rebuild [--since 2025-08-01] [--until 2025-09-01]
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+GRANULARITIES = ("hour", "day", "week")
+
+TOTAL_COLUMNS = ("mention_count", "sentiment_sum", "sentiment_count", "positive_count", "negative_count")
+
+# Columnas de `mentions` de las que dependen los rollups.
+SOURCE_COLUMNS = ("query_id", "engine", "emotion", "sentiment", "status", "created_at")
+
+
+def _signed(alias: str, sign: int) -> str:
+    return ", ".join(f"{alias}.{column}" for column in SOURCE_COLUMNS) + f", {sign} AS sign"
+
+
+# En un UPDATE solo entran las filas que cambian alguna de SOURCE_COLUMNS
+# (p. ej. no las que solo cambian el resumen). `id` es único entre particiones.
+_CHANGED_SQL = "FROM new_rows n JOIN old_rows o ON o.id = n.id WHERE ({}) IS DISTINCT FROM ({})".format(
+    ", ".join(f"n.{column}" for column in SOURCE_COLUMNS), ", ".join(f"o.{column}" for column in SOURCE_COLUMNS),
+)
+
+# Filas firmadas (SOURCE_COLUMNS, sign) de cada tipo de cambio.
+SIGNED_SOURCES = {
+    "insert": f"SELECT {_signed('n', 1)} FROM new_rows n",
+    "delete": f"SELECT {_signed('o', -1)} FROM old_rows o",
+    "update": f"""SELECT {_signed('n', 1)} {_CHANGED_SQL}
+                 UNION ALL
+                 SELECT {_signed('o', -1)} {_CHANGED_SQL}""",
+}
+
+# Agregación común a los triggers y al rebuild: {source} es una subconsulta
+# con SOURCE_COLUMNS y `sign` (+1 fila nueva, -1 fila que deja de contar).
+AGGREGATE_SQL = """
+    SELECT granularity, bucket, query_id, engine,
+           SUM(n)::int, SUM(s_sum), SUM(s_count)::int, SUM(pos)::int, SUM(neg)::int,
+           COALESCE(jsonb_object_agg(emotion, n) FILTER (WHERE n <> 0), '{{}}'::jsonb)
+    FROM (
+        SELECT g.granularity,
+               date_trunc(g.granularity, m.created_at) AS bucket,
+               m.query_id, m.engine, COALESCE(m.emotion, 'neutral') AS emotion,
+               SUM(m.sign) AS n,
+               COALESCE(SUM(m.sign * m.sentiment), 0) AS s_sum,
+               COALESCE(SUM(m.sign) FILTER (WHERE m.sentiment IS NOT NULL), 0) AS s_count,
+               COALESCE(SUM(m.sign) FILTER (WHERE m.sentiment > 0.2), 0) AS pos,
+               COALESCE(SUM(m.sign) FILTER (WHERE m.sentiment < -0.2), 0) AS neg
+        FROM ({source}) m
+        CROSS JOIN (VALUES ('hour'), ('day'), ('week')) AS g(granularity)
+        WHERE m.query_id IS NOT NULL AND m.created_at IS NOT NULL AND m.status = 'active' {where}
+        GROUP BY 1, 2, 3, 4, 5
+    ) per_emotion
+    GROUP BY granularity, bucket, query_id, engine
+"""
+
+INSERT_SQL = """
+    INSERT INTO mention_rollups (
+        granularity, bucket, query_id, engine, mention_count, sentiment_sum,
+        sentiment_count, positive_count, negative_count, emotion_counts
+    )
+"""
+
+UPSERT_SQL = INSERT_SQL + "{aggregate}" + """
+    ON CONFLICT (granularity, bucket, query_id, engine) DO UPDATE SET
+        mention_count   = mention_rollups.mention_count + EXCLUDED.mention_count,
+        sentiment_sum   = mention_rollups.sentiment_sum + EXCLUDED.sentiment_sum,
+        sentiment_count = mention_rollups.sentiment_count + EXCLUDED.sentiment_count,
+        positive_count  = mention_rollups.positive_count + EXCLUDED.positive_count,
+        negative_count  = mention_rollups.negative_count + EXCLUDED.negative_count,
+        emotion_counts  = jsonb_sum_counts(mention_rollups.emotion_counts, EXCLUDED.emotion_counts)
+"""
+
+# Ajuste de sesión con el que una transacción escribe en `mentions` sin pasar
+# por los rollups (ver skip_in_transaction).
+SKIP_SETTING = "ai_visibility.skip_mention_rollups"
+
+TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS mention_rollups (
+    granularity TEXT NOT NULL CHECK (granularity IN ('hour', 'day', 'week')),
+    bucket TIMESTAMP NOT NULL,
+    query_id INTEGER NOT NULL,
+    engine TEXT NOT NULL,
+    mention_count INTEGER NOT NULL DEFAULT 0,
+    sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sentiment_count INTEGER NOT NULL DEFAULT 0,
+    positive_count INTEGER NOT NULL DEFAULT 0,
+    negative_count INTEGER NOT NULL DEFAULT 0,
+    emotion_counts JSONB NOT NULL DEFAULT '{}'::jsonb,
+    PRIMARY KEY (granularity, bucket, query_id, engine)
+);
+
+-- Suma dos histogramas {"alegría": 3, ...} clave a clave; las claves que
+-- quedan a 0 (restas) desaparecen.
+CREATE OR REPLACE FUNCTION jsonb_sum_counts(a jsonb, b jsonb) RETURNS jsonb
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+    FROM (
+        SELECT key, SUM(value::int) AS total
+        FROM (
+            SELECT * FROM jsonb_each_text(COALESCE(a, '{}'::jsonb))
+            UNION ALL
+            SELECT * FROM jsonb_each_text(COALESCE(b, '{}'::jsonb))
+        ) e
+        GROUP BY key
+        HAVING SUM(value::int) <> 0
+    ) s
+$$;
+
+-- Trigger de una sola sentencia de la versión anterior (solo INSERT).
+DROP TRIGGER IF EXISTS trg_mention_rollups ON mentions;
+"""
+
+
+def upsert_sql(source: str, where: str = "") -> str:
+    return UPSERT_SQL.format(aggregate=AGGREGATE_SQL.format(source=source, where=where))
+
+
+SCHEMA_SQL = TABLE_SQL + "".join(f"""
+CREATE OR REPLACE FUNCTION mention_rollups_after_{event}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    IF current_setting('{SKIP_SETTING}', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+""" + upsert_sql(source) + f""";
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_mention_rollups_{event} ON mentions;
+CREATE TRIGGER trg_mention_rollups_{event} AFTER {event.upper()} ON mentions
+    REFERENCING {"OLD TABLE AS old_rows NEW TABLE AS new_rows" if event == "update"
+                 else "NEW TABLE AS new_rows" if event == "insert" else "OLD TABLE AS old_rows"}
+    FOR EACH STATEMENT EXECUTE FUNCTION mention_rollups_after_{event}();
+""" for event, source in SIGNED_SOURCES.items())
+
+
+def install(cur) -> None:
+    """Crea la tabla, las funciones y los triggers (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+
+
+def skip_in_transaction(cur) -> None:
+    """
+    Desactiva el trigger de mention_rollups hasta el final de la transacción en
+    curso y solo para esta sesión (set_config local), sin el bloqueo ACCESS
+    EXCLUSIVE de ALTER TABLE ... DISABLE TRIGGER.
+    """
+    cur.execute("SELECT set_config(%s, 'on', true)", (SKIP_SETTING,))
+
+
+def rebuild(cur, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+    """
+    Recalcula desde `mentions` los buckets que caen enteros en [since, until).
+    Los que cruzan un extremo (p. ej. la semana en la que empieza `since`) no
+    se tocan: parte de sus menciones puede estar ya archivada en frío y
+    recalcularlos las perdería. Devuelve las filas escritas.
+    """
+    # Bloquea escrituras en mentions mientras se recalcula para no contar filas dos veces.
+    cur.execute("LOCK TABLE mentions IN SHARE MODE")
+
+    buckets, mentions_where = "TRUE", ""
+    if since:
+        buckets += " AND {bucket} >= %(since)s"
+        mentions_where += " AND m.created_at >= %(since)s"
+    if until:
+        buckets += " AND {bucket} + ('1 ' || {granularity})::interval <= %(until)s"
+        mentions_where += " AND m.created_at < %(until)s"
+    params = {"since": since, "until": until}
+
+    cur.execute(
+        "DELETE FROM mention_rollups WHERE " + buckets.format(bucket="bucket", granularity="granularity"), params,
+    )
+    where = mentions_where + " AND " + buckets.format(
+        bucket="date_trunc(g.granularity, m.created_at)", granularity="g.granularity",
+    )
+    cur.execute(INSERT_SQL + AGGREGATE_SQL.format(source=f"SELECT {_signed('m', 1)} FROM mentions m", where=where),
+                params)
+    return cur.rowcount
+
+
+def choose_granularity(start: datetime, end: datetime) -> str:
+    """Hora para ventanas de hasta 7 días, día para el resto."""
+    return "hour" if end - start <= timedelta(days=7) else "day"
+
+
+STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """date_trunc(granularity, moment) de Postgres (las semanas empiezan en lunes)."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity != "hour":
+        moment = moment.replace(hour=0)
+    if granularity == "week":
+        moment -= timedelta(days=moment.weekday())
+    return moment
+
+
+def window_bounds(start: datetime, end: datetime, granularity: str) -> Dict[str, datetime]:
+    """
+    Partes de la ventana [start, end]: los buckets enteros [first, stop) salen
+    de mention_rollups y los bordes [start, first) y [stop, end] de `mentions`.
+    Si la ventana cae dentro de un solo bucket todo es borde.
+    """
+    first = bucket_start(start, granularity)
+    if first < start:
+        first += STEPS[granularity]
+    stop = bucket_start(end, granularity)
+    if first > stop:
+        first = stop = start
+    return {"start": start, "end": end, "first": first, "stop": stop}
+
+
+# Filas de una o varias ventanas: buckets enteros de mention_rollups
+# (exact = FALSE) y menciones sueltas de los bordes (exact = TRUE) con los
+# mismos criterios que AGGREGATE_SQL. Los bordes van por el índice de
+# created_at, así que se leen como mucho dos buckets de menciones por ventana.
+FACTS_SQL = """
+    SELECT bucket AS at, FALSE AS exact, mention_count, sentiment_sum, sentiment_count,
+           positive_count, negative_count
+    FROM mention_rollups
+    WHERE granularity = %(granularity)s AND bucket >= %(first)s AND bucket < %(stop)s{filters}
+    UNION ALL
+    SELECT created_at, TRUE, 1, COALESCE(sentiment, 0), (sentiment IS NOT NULL)::int,
+           ((sentiment > 0.2) IS TRUE)::int, ((sentiment < -0.2) IS TRUE)::int
+    FROM mentions
+    WHERE status = 'active' AND query_id IS NOT NULL AND ({edges}){filters}
+"""
+
+
+def _edges_sql(suffix: str = "") -> str:
+    return (f"(created_at >= %(start{suffix})s AND created_at < %(first{suffix})s)"
+            f" OR (created_at >= %(stop{suffix})s AND created_at <= %(end{suffix})s)")
+
+
+def _in_window_sql(suffix: str) -> str:
+    """Condición sobre las filas de FACTS_SQL de la ventana con parámetros `*{suffix}`."""
+    return (f"CASE WHEN exact THEN ({_edges_sql(suffix).replace('created_at', 'at')})"
+            f" ELSE at >= %(first{suffix})s AND at < %(stop{suffix})s END")
+
+
+def _filters(params: Dict[str, Any], query_id: Optional[int], engine: Optional[str]) -> str:
+    sql = ""
+    if query_id is not None:
+        sql += " AND query_id = %(query_id)s"
+        params["query_id"] = query_id
+    if engine is not None:
+        sql += " AND engine = %(engine)s"
+        params["engine"] = engine
+    return sql
+
+
+def fetch_totals(cur, start: datetime, end: datetime, granularity: Optional[str] = None,
+                 query_id: Optional[int] = None, engine: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Totales exactos de la ventana [start, end] leyendo O(buckets) filas de
+    rollups más las menciones de los dos buckets de los bordes.
+    """
+    granularity = granularity or choose_granularity(start, end)
+    params: Dict[str, Any] = {"granularity": granularity, **window_bounds(start, end, granularity)}
+    filters = _filters(params, query_id, engine)
+    cur.execute(f"""
+        SELECT COALESCE(SUM(mention_count), 0),
+               COALESCE(SUM(sentiment_sum), 0),
+               COALESCE(SUM(sentiment_count), 0),
+               COALESCE(SUM(positive_count), 0),
+               COALESCE(SUM(negative_count), 0)
+        FROM ({FACTS_SQL.format(filters=filters, edges=_edges_sql())}) facts
+    """, params)
+    return _totals(cur.fetchone())
+
+
+def _totals(row) -> Dict[str, Any]:
+    mentions, s_sum, s_count, positive, negative = row
+    return {
+        "mentions": int(mentions),
+        "avg_sentiment": float(s_sum) / s_count if s_count else 0.0,
+        "positive": int(positive),
+        "negative": int(negative),
+    }
+
+
+def fetch_window_totals(cur, windows: Dict[str, Tuple[datetime, datetime]],
+                        granularity: str = "hour") -> Dict[str, Dict[str, Any]]:
+    """
+    Totales exactos de varias ventanas {nombre: (start, end)} con una sola
+    consulta: se leen una vez los rollups de la unión y los bordes de todas
+    las ventanas, y cada ventana es un SUM(...) FILTER.
+    """
+    params: Dict[str, Any] = {"granularity": granularity}
+    columns, edges, firsts, stops = [], [], [], []
+    for i, (start, end) in enumerate(windows.values()):
+        bounds = window_bounds(start, end, granularity)
+        params.update({f"{key}_{i}": value for key, value in bounds.items()})
+        firsts.append(bounds["first"])
+        stops.append(bounds["stop"])
+        edges.append(_edges_sql(f"_{i}"))
+        columns += [f"COALESCE(SUM({column}) FILTER (WHERE {_in_window_sql(f'_{i}')}), 0)"
+                    for column in TOTAL_COLUMNS]
+    params["first"], params["stop"] = min(firsts), max(stops)
+    cur.execute(f"""
+        SELECT {", ".join(columns)}
+        FROM ({FACTS_SQL.format(filters="", edges=" OR ".join(edges))}) facts
+    """, params)
+    row = cur.fetchone()
+    width = len(TOTAL_COLUMNS)
+    return {name: _totals(row[i * width:(i + 1) * width]) for i, name in enumerate(windows)}
+
+
+def fetch_series(cur, start: datetime, end: datetime, granularity: Optional[str] = None,
+                 query_id: Optional[int] = None, engine: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Serie temporal por bucket (una fila por bucket) de la ventana [start, end];
+    el primer y el último bucket solo cuentan la parte dentro de la ventana.
+    """
+    granularity = granularity or choose_granularity(start, end)
+    params: Dict[str, Any] = {"granularity": granularity, **window_bounds(start, end, granularity)}
+    filters = _filters(params, query_id, engine)
+    cur.execute(f"""
+        SELECT date_trunc(%(granularity)s, at) AS bucket, SUM(mention_count), SUM(sentiment_sum),
+               SUM(sentiment_count), SUM(positive_count), SUM(negative_count)
+        FROM ({FACTS_SQL.format(filters=filters, edges=_edges_sql())}) facts
+        GROUP BY 1 ORDER BY 1
+    """, params)
+    return [
+        {
+            "bucket": row[0],
+            "mentions": int(row[1]),
+            "avg_sentiment": float(row[2]) / row[3] if row[3] else 0.0,
+            "positive": int(row[4]),
+            "negative": int(row[5]),
+        }
+        for row in cur.fetchall()
+    ]
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Rollups de menciones")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+    p_rebuild = sub.add_parser("rebuild")
+    p_rebuild.add_argument("--since", type=lambda v: datetime.strptime(v, "%Y-%m-%d"))
+    p_rebuild.add_argument("--until", type=lambda v: datetime.strptime(v, "%Y-%m-%d"))
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "install":
+                install(cur)
+                print("✅ mention_rollups instalado")
+            else:
+                rows = rebuild(cur, args.since, args.until)
+                print(f"✅ {rows} filas de rollup recalculadas")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# backend/src/db/search.py
+"""
+Búsqueda de texto completo sobre `mentions`.
+
+`mentions.search_vector` es una columna generada (STORED) con el título de la
+fuente (peso A) y el resumen (B); `mention_bodies.search_vector` cubre la
+respuesta (C). El diccionario de cada fila se guarda en `search_config`, que
+un trigger rellena en el INSERT a partir de `queries.language` (es → spanish,
+en → english, resto → simple). Cada tabla tiene su índice GIN: los candidatos
+salen de la unión de ambos y el ranking se calcula sobre los dos vectores.
+
+Como cada fila puede usar un diccionario distinto, la consulta del usuario se
+convierte con todos ellos y se combinan con OR (`||`): así el tsquery sigue
+siendo una constante y el índice GIN se puede usar.
+
+Uso por línea de comandos:
+    python -m src.db.search "galletas sin gluten" [--limit 10]
+"""
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+SEARCH_CONFIGS = ("english", "spanish", "simple")
+LANGUAGE_CONFIGS = {"en": "english", "es": "spanish"}
+
+MENTION_VECTOR_SQL = """
+    setweight(to_tsvector(search_config, COALESCE(source_title, '')), 'A') ||
+    setweight(to_tsvector(search_config, COALESCE(summary, '')), 'B')
+"""
+BODY_VECTOR_SQL = "setweight(to_tsvector(search_config, COALESCE(response, '')), 'C')"
+# Vector completo cuando todo el texto está en una sola fila (migración v10, benchmark).
+SEARCH_VECTOR_SQL = MENTION_VECTOR_SQL + " || " + BODY_VECTOR_SQL
+
+FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION search_config_for(lang TEXT) RETURNS regconfig
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE lower(lang)
+        WHEN 'es' THEN 'spanish'::regconfig
+        WHEN 'en' THEN 'english'::regconfig
+        ELSE 'simple'::regconfig
+    END
+$$;
+
+CREATE OR REPLACE FUNCTION mentions_set_search_config() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    SELECT search_config_for(q.language) INTO NEW.search_config
+    FROM queries q WHERE q.id = NEW.query_id;
+    NEW.search_config := COALESCE(NEW.search_config, 'simple'::regconfig);
+    RETURN NEW;
+END $$;
+"""
+
+TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS trg_mentions_search_config ON mentions;
+CREATE TRIGGER trg_mentions_search_config BEFORE INSERT ON mentions
+    FOR EACH ROW EXECUTE FUNCTION mentions_set_search_config();
+"""
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+SEARCH_SQL = """
+    WITH q AS (SELECT {tsquery} AS tsq),
+    candidates AS (
+        SELECT m.id, m.created_at FROM mentions m, q
+        WHERE m.search_vector @@ q.tsq {where_m}
+        UNION
+        SELECT b.mention_id, b.created_at FROM mention_bodies b, q
+        WHERE b.search_vector @@ q.tsq {where_b}
+    ),
+    hits AS (
+        SELECT m.id, m.created_at, m.query_id, m.engine, m.sentiment, m.summary,
+               m.source_title, m.search_config,
+               ts_rank_cd(m.search_vector || b.search_vector, q.tsq)::float8 AS rank
+        FROM candidates c
+        JOIN mentions m ON m.id = c.id AND m.created_at = c.created_at
+        JOIN mention_bodies b ON b.mention_id = c.id AND b.created_at = c.created_at
+        CROSS JOIN q
+        WHERE m.status = %(status)s
+    )
+    SELECT h.id, h.created_at, h.engine, h.sentiment, h.summary, h.source_title,
+           qr.query, h.rank,
+           ts_headline(h.search_config, b.response, q.tsq, %(headline)s) AS highlight
+    FROM (
+        SELECT * FROM hits
+        {keyset}
+        ORDER BY rank DESC, created_at DESC, id DESC
+        LIMIT %(limit)s
+    ) h
+    JOIN mention_bodies b ON b.mention_id = h.id AND b.created_at = h.created_at
+    CROSS JOIN q
+    LEFT JOIN queries qr ON qr.id = h.query_id
+    ORDER BY h.rank DESC, h.created_at DESC, h.id DESC
+"""
+
+
+def build_tsquery_sql(language: Optional[str] = None) -> str:
+    """Expresión tsquery para `%(q)s`: un diccionario o la unión de todos."""
+    if language in LANGUAGE_CONFIGS:
+        return f"websearch_to_tsquery('{LANGUAGE_CONFIGS[language]}', %(q)s)"
+    return " || ".join(f"websearch_to_tsquery('{config}', %(q)s)" for config in SEARCH_CONFIGS)
+
+
+def search_mentions(cur, text: str, limit: int = 20, after: Optional[Tuple[float, str, int]] = None,
+                    start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    language: Optional[str] = None, status: str = "active"
+                    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, str, int]]]:
+    """
+    Devuelve (resultados, siguiente posición). La paginación es por clave
+    (rank, created_at, id): `after` es la última posición de la página anterior.
+    `ts_headline` solo se calcula para las filas de la página.
+    """
+    params: Dict[str, Any] = {"q": text, "limit": limit, "status": status, "headline": HEADLINE_OPTIONS}
+    where = ""
+    if start is not None:
+        where += " AND {t}.created_at >= %(start)s"
+        params["start"] = start
+    if end is not None:
+        where += " AND {t}.created_at <= %(end)s"
+        params["end"] = end
+
+    keyset = ""
+    if after is not None:
+        keyset = "WHERE (rank, created_at, id) < (%(after_rank)s, %(after_created_at)s::timestamp, %(after_id)s)"
+        params["after_rank"], params["after_created_at"], params["after_id"] = after
+
+    sql = SEARCH_SQL.format(tsquery=build_tsquery_sql(language), where_m=where.format(t="m"),
+                            where_b=where.format(t="b"), keyset=keyset)
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    results = [
+        {
+            "id": row[0], "created_at": row[1].isoformat() if row[1] else None, "engine": row[2],
+            "sentiment": float(row[3] or 0.0), "summary": row[4], "source_title": row[5],
+            "query": row[6], "rank": round(row[7], 4), "highlight": row[8],
+        }
+        for row in rows
+    ]
+    next_after = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_after = (last[7], last[1].isoformat(), last[0])
+    return results, next_after
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Búsqueda de texto completo en menciones")
+    parser.add_argument("text")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--language", choices=sorted(LANGUAGE_CONFIGS))
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            results, _ = search_mentions(cur, args.text, args.limit, language=args.language)
+    for result in results:
+        print(f"#{result['id']:<8} {result['rank']:<8} {result['engine']:<14} {result['highlight'][:120]!r}")
+
+
+if __name__ == "__main__":
+    main()
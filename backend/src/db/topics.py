@@ -0,0 +1,261 @@
+# backend/src/db/topics.py
+"""
+Rollups de temas para la nube de palabras de /api/topics.
+
+`topic_rollups` guarda, por hora, día y semana, la frecuencia de cada
+palabra (`topic_frequency` del payload, kind 'word') y cuántos insights citan
+cada tema (`top_themes`, kind 'theme'). Las claves se canonicalizan con
+topic_key() (minúsculas, espacios colapsados y sin tildes: "Café", "cafe " y
+"café" son el mismo tema); `topic_labels` guarda la grafía con la que se
+muestra cada clave (la primera vista, o la más frecuente tras un rebuild).
+Se mantiene con triggers a nivel de sentencia sobre `insights` (INSERT,
+UPDATE y DELETE), como visibility_rollups, y se puede reconstruir.
+
+`fetch_topics()` agrega toda la ventana (no solo los últimos insights) y
+corta el top-K de cada kind en SQL. Hasta 7 días lee buckets de hora; a
+partir de ahí cubre la ventana con semanas completas y días sueltos en los
+bordes (ver bucket_ranges), así que 90 días son ~18 buckets por tema en
+lugar de 90. Los bordes se redondean a la hora o al día.
+
+Uso por línea de comandos:
+    python -m src.db.topics install
+    python -m src.db.topics rebuild
+    python -m src.db.topics show [--days 90]
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from src.db.rollups import choose_granularity
+
+DEFAULT_WORDS = 15
+DEFAULT_THEMES = 6
+
+# Filas firmadas (payload, created_at, sign) de cada tipo de cambio.
+SIGNED_SOURCES = {
+    "insert": "SELECT payload, created_at, 1 AS sign FROM new_rows",
+    "delete": "SELECT payload, created_at, -1 AS sign FROM old_rows",
+    "update": """SELECT payload, created_at, 1 AS sign FROM new_rows
+                 UNION ALL
+                 SELECT payload, created_at, -1 AS sign FROM old_rows""",
+}
+
+# Agregación común a los triggers y al rebuild: palabras y temas por hora y
+# los días a partir de las horas.
+AGGREGATE_SQL = """
+    WITH changed AS ({source}),
+    elements AS (
+        SELECT c.created_at, c.sign, 'word' AS kind, btrim(t.key) AS label, (t.value)::numeric AS n
+        FROM changed c
+        CROSS JOIN LATERAL jsonb_each(
+            CASE WHEN jsonb_typeof(c.payload -> 'topic_frequency') = 'object' THEN c.payload -> 'topic_frequency' ELSE '{{}}'::jsonb END
+        ) t
+        WHERE jsonb_typeof(t.value) = 'number'
+        UNION ALL
+        SELECT c.created_at, c.sign, 'theme', btrim(e.theme), 1
+        FROM changed c
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(c.payload -> 'top_themes') = 'array' THEN c.payload -> 'top_themes' ELSE '[]'::jsonb END
+        ) e(theme)
+    ),
+    hourly AS (
+        SELECT date_trunc('hour', created_at) AS bucket, kind, topic_key(label) AS topic, round(SUM(sign * n)) AS count
+        FROM elements
+        WHERE label <> ''
+        GROUP BY 1, 2, 3
+    )
+    SELECT 'hour', bucket, kind, topic, count::int FROM hourly
+    UNION ALL
+    SELECT g.granularity, date_trunc(g.granularity, bucket), kind, topic, SUM(count)::int
+    FROM hourly CROSS JOIN (VALUES ('day'), ('week')) AS g(granularity)
+    GROUP BY 1, 2, 3, 4
+"""
+
+UPSERT_SQL = """
+    INSERT INTO {table} (granularity, bucket, kind, topic, count)
+    {aggregate}
+    ON CONFLICT (granularity, bucket, kind, topic) DO UPDATE SET
+        count = {table}.count + EXCLUDED.count
+"""
+
+# Grafía con la que se muestra cada clave: la más frecuente de las filas de {source}.
+LABELS_SQL = """
+    INSERT INTO {table} (kind, topic, label)
+    SELECT kind, topic_key(label), mode() WITHIN GROUP (ORDER BY label)
+    FROM (
+        SELECT 'word' AS kind, btrim(t.key) AS label
+        FROM ({source}) c
+        CROSS JOIN LATERAL jsonb_object_keys(
+            CASE WHEN jsonb_typeof(c.payload -> 'topic_frequency') = 'object' THEN c.payload -> 'topic_frequency' ELSE '{{}}'::jsonb END
+        ) t(key)
+        UNION ALL
+        SELECT 'theme', btrim(e.theme)
+        FROM ({source}) c
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(c.payload -> 'top_themes') = 'array' THEN c.payload -> 'top_themes' ELSE '[]'::jsonb END
+        ) e(theme)
+    ) labels
+    WHERE label <> ''
+    GROUP BY 1, 2
+    ON CONFLICT (kind, topic) DO NOTHING
+"""
+
+TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    granularity TEXT NOT NULL CHECK (granularity IN ('hour', 'day', 'week')),
+    bucket TIMESTAMP NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('word', 'theme')),
+    topic TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket, kind, topic)
+);
+
+CREATE TABLE IF NOT EXISTS {table_labels} (
+    kind TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (kind, topic)
+);
+"""
+
+# Clave canónica de un tema (unaccent no está disponible en todas las instalaciones).
+TOPIC_KEY_FUNCTION_SQL = r"""
+CREATE OR REPLACE FUNCTION topic_key(topic text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT translate(lower(regexp_replace(btrim(topic), '\s+', ' ', 'g')),
+                     'áàäâéèëêíìïîóòöôúùüû', 'aaaaeeeeiiiioooouuuu')
+$$;
+"""
+
+
+def upsert_sql(source: str, table: str = "topic_rollups") -> str:
+    return UPSERT_SQL.format(table=table, aggregate=AGGREGATE_SQL.format(source=source))
+
+
+def labels_sql(source: str, table: str = "topic_labels") -> str:
+    return LABELS_SQL.format(table=table, source=source)
+
+
+SCHEMA_SQL = TABLE_SQL.format(table="topic_rollups", table_labels="topic_labels") + TOPIC_KEY_FUNCTION_SQL + "".join(f"""
+CREATE OR REPLACE FUNCTION topic_rollups_after_{event}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+""" + upsert_sql(source) + ";" + (labels_sql("SELECT payload FROM new_rows") + ";" if event != "delete" else "") + f"""
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_topic_rollups_{event} ON insights;
+CREATE TRIGGER trg_topic_rollups_{event} AFTER {event.upper()} ON insights
+    REFERENCING {"OLD TABLE AS old_rows NEW TABLE AS new_rows" if event == "update"
+                 else "NEW TABLE AS new_rows" if event == "insert" else "OLD TABLE AS old_rows"}
+    FOR EACH STATEMENT EXECUTE FUNCTION topic_rollups_after_{event}();
+""" for event, source in SIGNED_SOURCES.items())
+
+# Top-K de palabras y de temas de los buckets de la ventana ({buckets}); solo
+# se buscan las etiquetas de las filas que entran en el top.
+FETCH_SQL = """
+    SELECT ranked.kind, COALESCE(l.label, ranked.topic), ranked.count, ranked.found
+    FROM (
+        SELECT kind, topic, SUM(count) AS count,
+               row_number() OVER (PARTITION BY kind ORDER BY SUM(count) DESC, topic) AS position,
+               COUNT(*) OVER (PARTITION BY kind) AS found
+        FROM {table}
+        WHERE {buckets}
+        GROUP BY kind, topic
+        HAVING SUM(count) > 0
+    ) ranked
+    LEFT JOIN {table_labels} l ON l.kind = ranked.kind AND l.topic = ranked.topic
+    WHERE ranked.position <= CASE ranked.kind WHEN 'word' THEN %(words)s ELSE %(themes)s END
+    ORDER BY ranked.kind DESC, ranked.position
+"""
+
+
+def bucket_ranges(start: datetime, end: datetime) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Buckets (granularidad, desde, hasta) que cubren [start, end]: horas hasta 7
+    días; si no, días sueltos hasta el primer lunes, semanas completas y días
+    desde el lunes de la semana de `end`. `hasta` es exclusivo salvo en el último.
+    """
+    if choose_granularity(start, end) == "hour":
+        return [("hour", start.replace(minute=0, second=0, microsecond=0), end)]
+    first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    first_week = first_day + timedelta(days=(7 - first_day.weekday()) % 7)
+    last_week = end.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=end.weekday())
+    if first_week >= last_week:
+        return [("day", first_day, end)]
+    return [("day", first_day, first_week), ("week", first_week, last_week), ("day", last_week, end)]
+
+
+def install(cur) -> None:
+    """Crea la tabla, las funciones y los triggers (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+
+
+def rebuild(cur) -> int:
+    """Recalcula topic_rollups y topic_labels desde `insights`. Devuelve las filas de rollup escritas."""
+    # Bloquea escrituras en insights mientras se recalcula para no contar filas dos veces.
+    cur.execute("LOCK TABLE insights IN SHARE MODE")
+    cur.execute("DELETE FROM topic_rollups")
+    cur.execute("DELETE FROM topic_labels")
+    cur.execute(upsert_sql("SELECT payload, created_at, 1 AS sign FROM insights"))
+    rows = cur.rowcount
+    cur.execute(labels_sql("SELECT payload FROM insights"))
+    return rows
+
+
+def fetch_topics(cur, start: datetime, end: datetime, words: int = DEFAULT_WORDS, themes: int = DEFAULT_THEMES,
+                 table: str = "topic_rollups", table_labels: str = "topic_labels") -> Dict[str, Any]:
+    """
+    {"words": [{"text", "value"}], "themes": [{"name", "count"}], "words_found",
+    "themes_found"} de la ventana [start, end], de más a menos frecuente.
+    """
+    params: Dict[str, Any] = {"words": words, "themes": themes}
+    conditions = []
+    ranges = bucket_ranges(start, end)
+    for i, (granularity, since, until) in enumerate(ranges):
+        params.update({f"granularity_{i}": granularity, f"since_{i}": since, f"until_{i}": until})
+        upper = "<=" if i == len(ranges) - 1 else "<"
+        conditions.append(f"(granularity = %(granularity_{i})s AND bucket >= %(since_{i})s AND bucket {upper} %(until_{i})s)")
+    cur.execute(FETCH_SQL.format(table=table, table_labels=table_labels, buckets=" OR ".join(conditions)), params)
+
+    result: Dict[str, Any] = {"words": [], "themes": [], "words_found": 0, "themes_found": 0}
+    for kind, label, count, found in cur.fetchall():
+        if kind == "word":
+            result["words"].append({"text": label, "value": int(count)})
+            result["words_found"] = int(found)
+        else:
+            result["themes"].append({"name": label, "count": int(count)})
+            result["themes_found"] = int(found)
+    return result
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Rollups de temas y palabras")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+    sub.add_parser("rebuild")
+    p_show = sub.add_parser("show")
+    p_show.add_argument("--days", type=int, default=90)
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "install":
+                install(cur)
+                print("✅ topic_rollups instalado")
+            elif args.command == "rebuild":
+                rows = rebuild(cur)
+                print(f"✅ {rows} filas de topic_rollups recalculadas")
+            elif args.command == "show":
+                end = datetime.now()
+                data = fetch_topics(cur, end - timedelta(days=args.days), end)
+                print(f"🏷️  {data['words_found']} palabras y {data['themes_found']} temas en {args.days}d")
+                print("   " + ", ".join(f"{word['text']} ({word['value']})" for word in data["words"]))
+                print("   " + ", ".join(f"{theme['name']} ({theme['count']})" for theme in data["themes"]))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
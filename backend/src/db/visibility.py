@@ -0,0 +1,201 @@
+# backend/src/db/visibility.py
+"""
+Rollups del visibility score por (granularidad, bucket, query_id).
+
+`visibility_rollups` guarda, por hora y por día, cuántas oportunidades,
+riesgos y tendencias (los elementos no vacíos de esas listas del payload,
+los mismos que insight_items) y cuántos insights tiene cada query. Se
+mantiene con triggers a nivel de sentencia sobre `insights` (INSERT, UPDATE y
+DELETE: se suma lo nuevo y se resta lo viejo), como mention_rollups, y se
+puede reconstruir.
+
+`fetch_visibility()` saca en una sola consulta con GROUPING SETS el total,
+la serie diaria y el desglose por query de una ventana, leyendo
+O(buckets × queries) filas en lugar de O(insights). Los bordes de la ventana
+se redondean al bucket (hora hasta 7 días, día a partir de ahí), con la
+granularidad de rollups.choose_granularity. Los insights sin query no cuentan.
+
+Uso por línea de comandos:
+    python -m src.db.visibility install
+    python -m src.db.visibility rebuild
+    python -m src.db.visibility show [--days 30]
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from src.db.rollups import choose_granularity
+
+GRANULARITIES = ("hour", "day")
+
+# Filas firmadas (query_id, payload, created_at, sign) de cada tipo de cambio.
+SIGNED_SOURCES = {
+    "insert": "SELECT query_id, payload, created_at, 1 AS sign FROM new_rows",
+    "delete": "SELECT query_id, payload, created_at, -1 AS sign FROM old_rows",
+    "update": """SELECT query_id, payload, created_at, 1 AS sign FROM new_rows
+                 UNION ALL
+                 SELECT query_id, payload, created_at, -1 AS sign FROM old_rows""",
+}
+
+# Agregación común a los triggers y al rebuild: los conteos se calculan una
+# vez por hora y los días salen de sumar las horas.
+AGGREGATE_SQL = """
+    WITH hourly AS (
+        SELECT date_trunc('hour', i.created_at) AS bucket, i.query_id,
+               SUM(i.sign * visibility_item_count(i.payload -> 'opportunities')) AS opportunities,
+               SUM(i.sign * visibility_item_count(i.payload -> 'risks')) AS risks,
+               SUM(i.sign * visibility_item_count(i.payload -> 'trends')) AS trends,
+               SUM(i.sign) AS insights
+        FROM ({source}) i
+        WHERE i.query_id IS NOT NULL
+        GROUP BY 1, 2
+    )
+    SELECT 'hour', bucket, query_id, opportunities::int, risks::int, trends::int, insights::int FROM hourly
+    UNION ALL
+    SELECT 'day', date_trunc('day', bucket), query_id,
+           SUM(opportunities)::int, SUM(risks)::int, SUM(trends)::int, SUM(insights)::int
+    FROM hourly
+    GROUP BY 2, 3
+"""
+
+UPSERT_SQL = """
+    INSERT INTO {table} (granularity, bucket, query_id, opportunities, risks, trends, insights)
+    {aggregate}
+    ON CONFLICT (granularity, bucket, query_id) DO UPDATE SET
+        opportunities = {table}.opportunities + EXCLUDED.opportunities,
+        risks         = {table}.risks + EXCLUDED.risks,
+        trends        = {table}.trends + EXCLUDED.trends,
+        insights      = {table}.insights + EXCLUDED.insights
+"""
+
+TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    granularity TEXT NOT NULL CHECK (granularity IN ('hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    query_id INTEGER NOT NULL,
+    opportunities INTEGER NOT NULL DEFAULT 0,
+    risks INTEGER NOT NULL DEFAULT 0,
+    trends INTEGER NOT NULL DEFAULT 0,
+    insights INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket, query_id)
+);
+"""
+
+
+def upsert_sql(source: str, table: str = "visibility_rollups") -> str:
+    return UPSERT_SQL.format(table=table, aggregate=AGGREGATE_SQL.format(source=source))
+
+
+# Elementos no vacíos de una lista del payload (mismo criterio que insight_items).
+ITEM_COUNT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION visibility_item_count(items jsonb) RETURNS integer
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT COUNT(*)::int
+    FROM jsonb_array_elements_text(CASE WHEN jsonb_typeof(items) = 'array' THEN items ELSE '[]'::jsonb END) e
+    WHERE btrim(e) <> ''
+$$;
+"""
+
+SCHEMA_SQL = TABLE_SQL.format(table="visibility_rollups") + ITEM_COUNT_FUNCTION_SQL + "".join(f"""
+CREATE OR REPLACE FUNCTION visibility_rollups_after_{event}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+""" + upsert_sql(source) + f""";
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_visibility_rollups_{event} ON insights;
+CREATE TRIGGER trg_visibility_rollups_{event} AFTER {event.upper()} ON insights
+    REFERENCING {"OLD TABLE AS old_rows NEW TABLE AS new_rows" if event == "update"
+                 else "NEW TABLE AS new_rows" if event == "insert" else "OLD TABLE AS old_rows"}
+    FOR EACH STATEMENT EXECUTE FUNCTION visibility_rollups_after_{event}();
+""" for event, source in SIGNED_SOURCES.items())
+
+# Total, serie diaria y desglose por query en una pasada. GROUPING(query_id, day):
+# 1 = fila por query, 2 = fila por día, 3 = total. Cada grupo sale ordenado.
+FETCH_SQL = """
+    SELECT GROUPING(query_id, date_trunc('day', bucket)) AS grouping_set,
+           query_id, date_trunc('day', bucket)::date AS day,
+           SUM(opportunities) AS positive,
+           SUM(opportunities + risks + trends) AS total,
+           SUM(insights) AS insights
+    FROM {table}
+    WHERE granularity = %(granularity)s
+      AND bucket >= date_trunc(%(granularity)s, %(start)s::timestamp) AND bucket <= %(end)s
+    GROUP BY GROUPING SETS ((query_id), (date_trunc('day', bucket)), ())
+    ORDER BY grouping_set,
+             SUM(opportunities)::float / NULLIF(SUM(opportunities + risks + trends), 0) DESC NULLS LAST,
+             day, query_id
+"""
+
+QUERY_ROWS, DAY_ROWS, TOTAL_ROW = 1, 2, 3
+
+
+def install(cur) -> None:
+    """Crea la tabla, las funciones y los triggers (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+
+
+def rebuild(cur) -> int:
+    """Recalcula visibility_rollups desde `insights`. Devuelve las filas escritas."""
+    # Bloquea escrituras en insights mientras se recalcula para no contar filas dos veces.
+    cur.execute("LOCK TABLE insights IN SHARE MODE")
+    cur.execute("DELETE FROM visibility_rollups")
+    cur.execute(upsert_sql("SELECT query_id, payload, created_at, 1 AS sign FROM insights"))
+    return cur.rowcount
+
+
+def fetch_visibility(cur, start: datetime, end: datetime, granularity: str = None,
+                     table: str = "visibility_rollups") -> Dict[str, Any]:
+    """
+    {"positive", "total", "insights", "series": [(día, positive, total)],
+    "per_query": [(query_id, positive, total)]} de la ventana [start, end].
+    `per_query` va de mayor a menor score; días y queries sin elementos se omiten.
+    """
+    params = {"granularity": granularity or choose_granularity(start, end), "start": start, "end": end}
+    cur.execute(FETCH_SQL.format(table=table), params)
+
+    result: Dict[str, Any] = {"positive": 0, "total": 0, "insights": 0, "series": [], "per_query": []}
+    for grouping_set, query_id, day, positive, total, insights in cur.fetchall():
+        positive, total = int(positive or 0), int(total or 0)
+        if grouping_set == TOTAL_ROW:
+            result.update(positive=positive, total=total, insights=int(insights or 0))
+        elif total and grouping_set == QUERY_ROWS:
+            result["per_query"].append((query_id, positive, total))
+        elif total and grouping_set == DAY_ROWS:
+            result["series"].append((day, positive, total))
+    return result
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    parser = argparse.ArgumentParser(description="Rollups del visibility score")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("install")
+    sub.add_parser("rebuild")
+    p_show = sub.add_parser("show")
+    p_show.add_argument("--days", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "install":
+                install(cur)
+                print("✅ visibility_rollups instalado")
+            elif args.command == "rebuild":
+                rows = rebuild(cur)
+                print(f"✅ {rows} filas de visibility_rollups recalculadas")
+            elif args.command == "show":
+                end = datetime.now()
+                data = fetch_visibility(cur, end - timedelta(days=args.days), end)
+                score = data["positive"] / max(data["total"], 1) * 100
+                print(f"📊 Visibility {args.days}d: {score:.1f}% ({data['positive']}/{data['total']} "
+                      f"elementos, {data['insights']} insights)")
+                for query_id, positive, total in data["per_query"][:5]:
+                    print(f"   • Query {query_id}: {positive / total * 100:.1f}% ({positive}/{total})")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+# backend/src/engines/brands.py
+"""
+Extracción de marcas en el momento de la ingesta.
+
+Cada respuesta se recorre una sola vez con un autómata Aho-Corasick construido
+a partir del diccionario `brand_dictionary` (marcas, competidores y sus
+alias). La comparación ignora mayúsculas y acentos y exige límites de palabra,
+así que "tate" ya no coincide dentro de "estate". Una misma mención puede
+citar varias marcas; los resultados se guardan en `mention_brands`.
+
+Uso por línea de comandos:
+    python -m src.engines.brands list
+    python -m src.engines.brands add "Lotus Biscoff" biscoff [--tracked "Lotus"] [--no-competitor] [--backfill]
+    python -m src.engines.brands backfill [--batch 5000] [--alias biscoff]
+    python -m src.engines.brands discover biscof [--threshold 0.4]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import unicodedata
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from src.db.mention_bodies import response_source
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS brand_dictionary (
+    id SERIAL PRIMARY KEY,
+    tracked_brand TEXT,              -- queries.brand al que aplica; NULL = todas
+    brand TEXT NOT NULL,             -- nombre canónico
+    alias TEXT NOT NULL,
+    is_competitor BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_brand_dictionary_alias
+    ON brand_dictionary (COALESCE(tracked_brand, ''), lower(alias));
+
+CREATE TABLE IF NOT EXISTS mention_brands (
+    mention_id INTEGER NOT NULL,
+    brand TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,   -- copia de mentions.created_at para filtrar sin join
+    PRIMARY KEY (mention_id, brand),
+    -- Borrar una mención (también en cascada desde queries) borra sus marcas.
+    CONSTRAINT mention_brands_mention_fkey FOREIGN KEY (mention_id, created_at)
+        REFERENCES mentions (id, created_at) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_mention_brands_brand_created_at ON mention_brands (brand, created_at);
+CREATE INDEX IF NOT EXISTS idx_mention_brands_created_at ON mention_brands (created_at);
+"""
+
+# Diccionario inicial: las marcas que antes estaban en los CASE de industry.
+DEFAULT_DICTIONARY = {
+    "Oreo": ["oreo", "oreos"],
+    "Chips Ahoy": ["chips ahoy", "chips ahoy!"],
+    "Pepperidge Farm": ["pepperidge farm", "pepperidge"],
+    "Girl Scout Cookies": ["girl scout cookies", "girl scout"],
+    "Nabisco": ["nabisco"],
+    "Keebler": ["keebler"],
+    "Tate's Bake Shop": ["tate's bake shop", "tate's", "tates"],
+    "Famous Amos": ["famous amos"],
+    "Milano": ["milano cookies", "pepperidge farm milano"],
+    "Archway": ["archway cookies", "archway"],
+    "Lotus Biscoff": ["lotus biscoff", "biscoff"],
+}
+
+
+def fold(text: str) -> str:
+    """Minúsculas, sin acentos y con apóstrofos normalizados."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower().replace("’", "'").replace("‘", "'")
+
+
+class BrandMatcher:
+    """Autómata Aho-Corasick sobre alias normalizados → marca canónica."""
+
+    def __init__(self, aliases: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]   # (longitud, marca)
+        for alias, brand in aliases.items():
+            self._add(fold(alias).strip(), brand)
+        self._build()
+
+    def _add(self, pattern: str, brand: str) -> None:
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), brand))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[nxt] = candidate if candidate != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: Optional[str]) -> Dict[str, int]:
+        """Devuelve {marca: nº de apariciones} en una sola pasada por el texto."""
+        if not text:
+            return {}
+        folded = fold(text)
+        matches = []
+        node = 0
+        for i, char in enumerate(folded):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, brand in self._out[node]:
+                start, end = i - length + 1, i + 1
+                if (start == 0 or not folded[start - 1].isalnum()) and \
+                        (end == len(folded) or not folded[end].isalnum()):
+                    matches.append((start, end, brand))
+
+        # Coincidencias solapadas ("lotus biscoff" y "biscoff"): gana la más larga.
+        counts: Counter = Counter()
+        last_end = -1
+        for start, end, brand in sorted(matches, key=lambda m: (m[0], -(m[1] - m[0]))):
+            if start >= last_end:
+                counts[brand] += 1
+                last_end = end
+        return dict(counts)
+
+
+def load_brand_matchers(cur) -> Dict[int, BrandMatcher]:
+    """
+    Construye un matcher por cada `queries.brand` (alias globales + los
+    propios) y devuelve {query_id: matcher}. Si el diccionario aún no existe
+    (migración v9 pendiente) devuelve {} y no se extraen marcas.
+    """
+    cur.execute("SELECT to_regclass('public.brand_dictionary') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return {}
+
+    cur.execute("SELECT tracked_brand, brand, alias FROM brand_dictionary")
+    global_aliases: Dict[str, str] = {}
+    tracked_aliases: Dict[str, Dict[str, str]] = {}
+    for tracked_brand, brand, alias in cur.fetchall():
+        target = global_aliases if tracked_brand is None else tracked_aliases.setdefault(tracked_brand, {})
+        target[alias] = brand
+
+    cur.execute("SELECT id, brand FROM queries")
+    matchers: Dict[Optional[str], BrandMatcher] = {}
+    by_query: Dict[int, BrandMatcher] = {}
+    for query_id, tracked_brand in cur.fetchall():
+        if tracked_brand not in matchers:
+            matchers[tracked_brand] = BrandMatcher({**global_aliases, **tracked_aliases.get(tracked_brand, {})})
+        by_query[query_id] = matchers[tracked_brand]
+    return by_query
+
+
+def store_mention_brands(cur, rows: Iterable[Tuple[int, str, int, object]]) -> None:
+    """Inserta (mention_id, brand, count, created_at); re-ejecutable."""
+    rows = list(rows)
+    if not rows:
+        return
+    execute_values(
+        cur,
+        """
+        INSERT INTO mention_brands (mention_id, brand, count, created_at) VALUES %s
+        ON CONFLICT (mention_id, brand) DO UPDATE SET count = EXCLUDED.count
+        """,
+        rows,
+    )
+
+
+def backfill(cur, batch_size: int = 5000, alias: Optional[str] = None) -> int:
+    """
+    Recorre las menciones por id y rellena `mention_brands`. Con `alias` solo
+    se vuelven a procesar las menciones que lo contienen: el ILIKE lo resuelve
+    el índice trigram del texto (migración v11/v12), así que añadir un alias
+    no obliga a releer toda la tabla.
+    """
+    matchers = load_brand_matchers(cur)
+    fallback = BrandMatcher({})
+    source, response_column = response_source(cur)
+    where, params = "", []
+    if alias:
+        # El índice no pliega acentos: se prueban el alias tal cual y sin acentos.
+        where = f" AND {response_column} ILIKE ANY(%s)"
+        params = [list({f"%{alias}%", f"%{fold(alias)}%"})]
+    last_id, processed = 0, 0
+    while True:
+        cur.execute(
+            f"SELECT m.id, m.query_id, m.created_at, {response_column} FROM {source} "
+            f"WHERE m.id > %s{where} ORDER BY m.id LIMIT %s",
+            [last_id] + params + [batch_size],
+        )
+        batch = cur.fetchall()
+        if not batch:
+            break
+        rows = []
+        for mention_id, query_id, created_at, response in batch:
+            matcher = matchers.get(query_id, fallback)
+            for brand, count in matcher.find(response).items():
+                rows.append((mention_id, brand, count, created_at))
+        store_mention_brands(cur, rows)
+        last_id = batch[-1][0]
+        processed += len(batch)
+        logger.info("🏷️  %s menciones procesadas (último id %s)", processed, last_id)
+    return processed
+
+
+DISCOVER_KNOWN_SQL = """
+    SELECT brand, alias, similarity(lower(alias), lower(%(name)s)) AS sim
+    FROM brand_dictionary
+    WHERE lower(alias) %% lower(%(name)s)
+    ORDER BY sim DESC, brand
+    LIMIT %(limit)s
+"""
+
+# Candidatos en el texto: el operador <% (word_similarity) usa el índice
+# trigram de mention_bodies.response para quedarse con las menciones que
+# contienen algo parecido; después se trocean en palabras y se ordenan por
+# similitud.
+DISCOVER_CANDIDATES_SQL = """
+    WITH hits AS (
+        SELECT response FROM mention_bodies
+        WHERE %(name)s <%% response AND created_at >= %(since)s
+        ORDER BY created_at DESC
+        LIMIT %(sample)s
+    )
+    SELECT w.lexeme, COUNT(*) AS mentions, similarity(w.lexeme, lower(%(name)s)) AS sim,
+           EXISTS (SELECT 1 FROM brand_dictionary d WHERE lower(d.alias) = w.lexeme) AS known
+    FROM hits, unnest(to_tsvector('simple', hits.response)) AS w
+    WHERE similarity(w.lexeme, lower(%(name)s)) >= %(threshold)s
+    GROUP BY w.lexeme
+    ORDER BY sim DESC, mentions DESC
+    LIMIT %(limit)s
+"""
+
+
+def discover(cur, name: str, limit: int = 10, threshold: float = 0.3,
+             since: Optional[datetime] = None, sample: int = 2000) -> Dict[str, List[Dict]]:
+    """
+    Candidatos con nombre parecido a `name` (erratas, nombres parciales):
+    alias ya conocidos del diccionario y términos encontrados en las
+    menciones desde `since` (por defecto, 90 días), ordenados por similitud.
+    """
+    since = since or datetime.now() - timedelta(days=90)
+    params = {"name": name, "limit": limit, "threshold": threshold, "since": since, "sample": sample}
+    cur.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true), "
+                "set_config('pg_trgm.word_similarity_threshold', %s, true)", (str(threshold), str(threshold)))
+
+    cur.execute(DISCOVER_KNOWN_SQL, params)
+    known = [{"brand": brand, "alias": alias, "similarity": round(float(sim), 3)}
+             for brand, alias, sim in cur.fetchall()]
+
+    cur.execute(DISCOVER_CANDIDATES_SQL, params)
+    candidates = [{"term": term, "mentions": int(mentions), "similarity": round(float(sim), 3), "known": bool(is_known)}
+                  for term, mentions, sim, is_known in cur.fetchall()]
+    return {"known": known, "candidates": candidates}
+
+
+def install(cur) -> None:
+    """Crea las tablas y carga el diccionario por defecto (idempotente)."""
+    cur.execute(SCHEMA_SQL)
+    for brand, aliases in DEFAULT_DICTIONARY.items():
+        for alias in aliases:
+            add_alias(cur, brand, alias)
+
+
+def add_foreign_key(cur) -> int:
+    """
+    Borra las filas huérfanas de `mention_brands` y añade la FK a `mentions`
+    en tablas creadas antes de que SCHEMA_SQL la incluyera (idempotente).
+    Devuelve los huérfanos borrados.
+    """
+    cur.execute("SELECT 1 FROM pg_constraint WHERE conname = 'mention_brands_mention_fkey'")
+    if cur.fetchone():
+        return 0
+    cur.execute("""
+        DELETE FROM mention_brands x
+        WHERE NOT EXISTS (SELECT 1 FROM mentions m WHERE m.id = x.mention_id AND m.created_at = x.created_at)
+    """)
+    orphans = cur.rowcount
+    cur.execute("""
+        ALTER TABLE mention_brands ADD CONSTRAINT mention_brands_mention_fkey FOREIGN KEY (mention_id, created_at)
+            REFERENCES mentions (id, created_at) ON DELETE CASCADE
+    """)
+    return orphans
+
+
+def add_alias(cur, brand: str, alias: str, tracked_brand: Optional[str] = None,
+              is_competitor: bool = True) -> None:
+    cur.execute(
+        """
+        INSERT INTO brand_dictionary (tracked_brand, brand, alias, is_competitor)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (COALESCE(tracked_brand, ''), lower(alias)) DO NOTHING
+        """,
+        (tracked_brand, brand, alias, is_competitor),
+    )
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Diccionario y extracción de marcas")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    p_add = sub.add_parser("add")
+    p_add.add_argument("brand")
+    p_add.add_argument("alias")
+    p_add.add_argument("--tracked", help="queries.brand al que aplica (por defecto, todas)")
+    p_add.add_argument("--competitor", action=argparse.BooleanOptionalAction, default=True,
+                       help="Competidor (por defecto, como la columna) o marca propia con --no-competitor")
+    p_add.add_argument("--backfill", action="store_true", help="Reprocesar las menciones que contienen el alias")
+    p_backfill = sub.add_parser("backfill")
+    p_backfill.add_argument("--batch", type=int, default=5000)
+    p_backfill.add_argument("--alias", help="Solo menciones que contienen este alias (índice trigram)")
+    p_discover = sub.add_parser("discover")
+    p_discover.add_argument("name")
+    p_discover.add_argument("--limit", type=int, default=10)
+    p_discover.add_argument("--threshold", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            if args.command == "list":
+                cur.execute("SELECT COALESCE(tracked_brand, '*'), brand, alias, is_competitor "
+                            "FROM brand_dictionary ORDER BY 1, 2, 3")
+                for tracked, brand, alias, competitor in cur.fetchall():
+                    print(f"{tracked:<20} {brand:<22} {alias:<24} {'competidor' if competitor else 'marca'}")
+            elif args.command == "add":
+                add_alias(cur, args.brand, args.alias, args.tracked, args.competitor)
+                print(f"✅ Alias '{args.alias}' → {args.brand}")
+                if args.backfill:
+                    total = backfill(cur, alias=args.alias)
+                    print(f"✅ {total} menciones reprocesadas")
+            elif args.command == "discover":
+                found = discover(cur, args.name, args.limit, args.threshold)
+                for item in found["known"]:
+                    print(f"📖 {item['alias']:<24} → {item['brand']:<22} {item['similarity']}")
+                for item in found["candidates"]:
+                    print(f"🔎 {item['term']:<24} {item['mentions']:>6} menciones  {item['similarity']}"
+                          f"{'  (conocido)' if item['known'] else ''}")
+            else:
+                total = backfill(cur, args.batch, args.alias)
+                print(f"✅ {total} menciones procesadas")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    main()
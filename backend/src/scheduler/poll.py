@@ -1,6 +1,5 @@
 # backend/src/scheduler/poll.py (Versión final y corregida)
 
-import os
 import time
 import json
 import logging
@@ -13,6 +12,10 @@ from src.engines.openai_engine import fetch_response, extract_insights
 from src.engines.perplexity import fetch_perplexity_response
 from src.engines.serp import get_search_results as fetch_serp_response # <-- ÚNICA IMPORTACIÓN CORRECTA
 from src.engines.sentiment import analyze_sentiment
+from src.engines.brands import BrandMatcher, load_brand_matchers, store_mention_brands
+from src.db.connection import DB_CONFIG
+from src.db.partitions import ensure_monthly_partitions, PARTITIONED_TABLES
+from src.db import data_version, industry_views
 from src.utils.slack import send_slack_alert
 
 logging.basicConfig(
@@ -23,15 +26,14 @@ logging.basicConfig(
 
 SENTIMENT_THRESHOLD = -0.3
 
-DB_CFG = dict(
-    host=os.getenv("POSTGRES_HOST", "localhost"),
-    port=int(os.getenv("POSTGRES_PORT", 5433)),
-    database=os.getenv("POSTGRES_DB", "ai_visibility"),
-    user=os.getenv("POSTGRES_USER", "postgres"),
-    password=os.getenv("POSTGRES_PASSWORD", "postgres"),
-)
+DB_CFG = DB_CONFIG
 
-def summarize_and_extract_topics(text: str) -> Tuple[str, List[str]]:
+def summarize_and_extract_topics(text: str, raise_errors: bool = False) -> Tuple[str, List[str]]:
+    """
+    (resumen, temas) del texto. Si el modelo falla devuelve el principio del
+    texto y ningún tema, o propaga el error con `raise_errors` (el
+    re-enriquecimiento no quiere guardar ese valor por defecto).
+    """
     prompt = f"""
 Analiza el siguiente texto y devuelve un objeto JSON con dos claves:
 1. "summary": Un resumen conciso y atractivo del texto en una sola frase (máximo 25 palabras).
@@ -51,23 +53,36 @@ Responde únicamente con el JSON.
         key_topics = data.get("key_topics", [])
         return summary, key_topics
     except Exception as e:
+        if raise_errors:
+            raise
         logging.error("❌ Error al generar resumen y temas: %s", e)
         return text[:150] + "...", []
 
+def wants_insights(engine: str, text: str) -> bool:
+    """Los insights (gpt-4o, caros) solo se extraen de respuestas con contenido."""
+    return engine in {"gpt-4", "pplx-7b-chat"} or (engine == "serpapi" and len(text) > 300)
+
 def insert_mention(cur, data: Dict[str, Any]):
+    # La respuesta completa va a mention_bodies en la misma sentencia; el
+    # search_config lo calcula el trigger de mentions y se copia al cuerpo.
     cur.execute(
         """
-        INSERT INTO mentions (
-            query_id, engine, source, response, sentiment, emotion, 
-            confidence_score, source_title, source_url, language, created_at,
-            summary, key_topics, generated_insight_id
-        )
-        VALUES (
-            %(query_id)s, %(engine)s, %(source)s, %(response)s, %(sentiment)s, %(emotion)s,
-            %(confidence)s, %(source_title)s, %(source_url)s, 'auto', %(created_at)s,
-            %(summary)s, %(key_topics)s, %(insight_id)s
+        WITH m AS (
+            INSERT INTO mentions (
+                query_id, engine, source, sentiment, emotion,
+                confidence_score, source_title, source_url, language, created_at,
+                summary, key_topics, generated_insight_id
+            )
+            VALUES (
+                %(query_id)s, %(engine)s, %(source)s, %(sentiment)s, %(emotion)s,
+                %(confidence)s, %(source_title)s, %(source_url)s, 'auto', %(created_at)s,
+                %(summary)s, %(key_topics)s, %(insight_id)s
+            )
+            RETURNING id, created_at, search_config
         )
-        RETURNING id
+        INSERT INTO mention_bodies (mention_id, created_at, search_config, response)
+        SELECT id, created_at, search_config, %(response)s FROM m
+        RETURNING mention_id
         """,
         data,
     )
@@ -81,7 +96,8 @@ def insert_insights(cur, query_id: int, insights_payload: dict) -> int:
     return cur.fetchone()[0]
 
 def run_engine(name: str, fetch_fn: Callable[[str], Union[str, list]],
-               query_id: int, query_text: str, cur) -> None:
+               query_id: int, query_text: str, cur,
+               brand_matcher: BrandMatcher = None) -> None:
     logging.info("▶ %s | query «%s»", name, query_text)
 
     try:
@@ -111,7 +127,7 @@ def run_engine(name: str, fetch_fn: Callable[[str], Union[str, list]],
         summary, key_topics = summarize_and_extract_topics(response_text)
         
         insight_id = None
-        if name in {"gpt-4", "pplx-7b-chat"} or (name == "serpapi" and len(response_text) > 300):
+        if wants_insights(name, response_text):
             insights_payload = extract_insights(response_text)
             if insights_payload:
                 insight_id = insert_insights(cur, query_id, insights_payload)
@@ -124,6 +140,11 @@ def run_engine(name: str, fetch_fn: Callable[[str], Union[str, list]],
         }
 
         mention_id = insert_mention(cur, mention_data)
+        if brand_matcher is not None:
+            store_mention_brands(cur, [
+                (mention_id, brand, count, mention_data["created_at"])
+                for brand, count in brand_matcher.find(response_text).items()
+            ])
 
         if sentiment < SENTIMENT_THRESHOLD:
             send_slack_alert(query_text, sentiment, summary)
@@ -138,6 +159,10 @@ def main(loop_once: bool = True, sleep_seconds: int = 6 * 3600):
     while True:
         with psycopg2.connect(**DB_CFG) as conn:
             with conn.cursor() as cur:
+                # Particiones del mes en curso y siguientes (no-op si no hay particionado).
+                for table in PARTITIONED_TABLES:
+                    ensure_monthly_partitions(cur, table)
+                brand_matchers = load_brand_matchers(cur)
                 cur.execute("SELECT id, query FROM queries WHERE enabled = TRUE")
                 for query_id, query_text in cur.fetchall():
                     print(f"\n🔍 Buscando menciones para query: {query_text}")
@@ -146,7 +171,19 @@ def main(loop_once: bool = True, sleep_seconds: int = 6 * 3600):
                         ("pplx-7b-chat", fetch_perplexity_response),
                         ("serpapi", fetch_serp_response),
                     ):
-                        run_engine(name, fn, query_id, query_text, cur)
+                        run_engine(name, fn, query_id, query_text, cur, brand_matchers.get(query_id))
+                conn.commit()
+
+                # Refresco de las vistas de industry con los datos del ciclo.
+                try:
+                    industry_views.refresh(cur)
+                    conn.commit()
+                except psycopg2.Error as exc:
+                    conn.rollback()
+                    logging.error("❌ Error refrescando vistas materializadas: %s", exc)
+
+                # Nueva versión de datos: la caché de respuestas de la API se invalida.
+                data_version.bump(cur, "poll")
                 conn.commit()
 
         logging.info("🛑 Polling cycle finished")
@@ -0,0 +1,458 @@
+# backend/src/scheduler/reenrich.py
+"""
+Re-enriquecimiento del histórico de menciones.
+
+Cuando cambia el prompt o el modelo de sentimiento, resumen o insights, este
+job vuelve a pasar las menciones existentes por los mismos enriquecimientos
+que aplica el poller:
+
+    • sentiment → sentiment, emotion, confidence_score (analyze_sentiment)
+    • summary   → summary, key_topics (summarize_and_extract_topics)
+    • insights  → insights.payload de la mención (extract_insights); si la
+                  mención no tenía insight y el poller lo habría generado, se
+                  crea y se enlaza con generated_insight_id.
+
+Las menciones se leen por orden de id con un cursor de servidor (no se carga
+el histórico en memoria), cada lote se reparte entre `--workers` hilos con un
+límite global de llamadas por minuto y los resultados se escriben en bloque.
+El progreso se guarda en `enrichment_jobs` (último id procesado) en la misma
+transacción que los resultados, así que un job interrumpido se reanuda
+exactamente donde se quedó. Las menciones que fallan se apuntan en
+`enrichment_job_failures` y `--retry-failed` las vuelve a intentar (las que
+salen bien dejan la lista). Con `--dry-run` solo se estima el coste.
+
+Uso por línea de comandos:
+    python -m src.scheduler.reenrich sentiment-v2 --enrich sentiment --since 2025-08-01 --dry-run
+    python -m src.scheduler.reenrich sentiment-v2 --enrich sentiment,summary --workers 8 --rate 300
+    python -m src.scheduler.reenrich sentiment-v2            # reanudar
+    python -m src.scheduler.reenrich sentiment-v2 --retry-failed
+    python -m src.scheduler.reenrich --list
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from src.db import data_version, industry_views, mention_bodies
+from src.engines.openai_engine import extract_insights
+from src.engines.sentiment import analyze_sentiment
+from src.scheduler.poll import summarize_and_extract_topics, wants_insights
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 120  # llamadas por minuto entre todos los workers
+
+# Modelo, tokens de prompt fijos, tokens de salida y caracteres de la
+# respuesta que entran en el prompt (None = completa) de cada enriquecimiento.
+Enrichment = namedtuple("Enrichment", "model prompt_tokens output_tokens max_chars")
+ENRICHMENTS = {
+    "sentiment": Enrichment("gpt-3.5-turbo", 120, 40, 4000),
+    "summary": Enrichment("gpt-4o-mini", 130, 150, 4000),
+    "insights": Enrichment("gpt-4o", 650, 1200, None),
+}
+# USD por millón de tokens (entrada, salida); precios de lista aproximados.
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+CHARS_PER_TOKEN = 4
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS enrichment_jobs (
+    job TEXT PRIMARY KEY,
+    enrichments TEXT[] NOT NULL,
+    filters JSONB NOT NULL DEFAULT '{}',
+    last_id INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    first_created_at TIMESTAMP,
+    last_created_at TIMESTAMP,
+    started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS enrichment_job_failures (
+    job TEXT NOT NULL REFERENCES enrichment_jobs (job) ON DELETE CASCADE,
+    mention_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    failed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (job, mention_id)
+);
+"""
+
+Row = namedtuple("Row", "id created_at query_id engine insight_id response")
+
+
+def install(cur) -> None:
+    cur.execute(SCHEMA_SQL)
+
+
+class RateLimiter:
+    """Reparte `per_minute` llamadas a intervalos regulares entre todos los hilos."""
+
+    def __init__(self, per_minute: Optional[float]):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        time.sleep(slot - now)
+
+
+def _filters_sql(filters: Dict[str, Any]) -> str:
+    where = "m.id > %(last_id)s"
+    if filters.get("since"):
+        where += " AND m.created_at >= %(since)s"
+    if filters.get("until"):
+        where += " AND m.created_at < %(until)s"
+    if filters.get("query_id"):
+        where += " AND m.query_id = %(query_id)s"
+    if filters.get("engine"):
+        where += " AND m.engine = %(engine)s"
+    return where
+
+
+def _pending_sql(source: str, filters: Dict[str, Any], retry_failed: bool = False) -> str:
+    """FROM ... WHERE de las menciones pendientes: las posteriores al checkpoint o, con `retry_failed`, las fallidas."""
+    if retry_failed:
+        return (f"{source} JOIN enrichment_job_failures f ON f.mention_id = m.id AND f.created_at = m.created_at "
+                f"WHERE f.job = %(job)s")
+    return f"{source} WHERE {_filters_sql(filters)}"
+
+
+def estimate_cost(cur, enrichments: List[str], filters: Dict[str, Any], last_id: int = 0,
+                  job: Optional[str] = None, retry_failed: bool = False) -> Dict[str, Any]:
+    """Menciones pendientes, tokens estimados y coste en USD por enriquecimiento."""
+    source, column = mention_bodies.response_source(cur)
+    cur.execute(
+        f"""
+        SELECT COUNT(*),
+               COALESCE(SUM(LEAST(length({column}), 4000)), 0),
+               COALESCE(SUM(length({column})), 0)
+        FROM {_pending_sql(source, filters, retry_failed)}
+        """,
+        {**filters, "last_id": last_id, "job": job},
+    )
+    rows, capped_chars, total_chars = cur.fetchone()
+    estimate: Dict[str, Any] = {"mentions": int(rows), "enrichments": {}, "usd": 0.0}
+    for name in enrichments:
+        spec = ENRICHMENTS[name]
+        chars = capped_chars if spec.max_chars else total_chars
+        input_tokens = int(chars) // CHARS_PER_TOKEN + spec.prompt_tokens * rows
+        output_tokens = spec.output_tokens * rows
+        price_in, price_out = MODEL_PRICES[spec.model]
+        usd = (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+        estimate["enrichments"][name] = {
+            "model": spec.model, "input_tokens": input_tokens,
+            "output_tokens": output_tokens, "usd": round(usd, 2),
+        }
+        estimate["usd"] += usd
+    estimate["usd"] = round(estimate["usd"], 2)
+    return estimate
+
+
+def enrich_row(row: Row, enrichments: List[str], limiter: RateLimiter) -> Optional[Dict[str, Any]]:
+    """
+    Ejecuta los enriquecimientos de una mención. Devuelve None si alguno
+    falla: no queremos sobrescribir el histórico con los valores por defecto
+    que devuelven los helpers en caso de error. Un resumen sin temas es un
+    resultado válido.
+    """
+    result: Dict[str, Any] = {}
+    try:
+        if "sentiment" in enrichments:
+            limiter.wait()
+            sentiment, emotion, confidence = analyze_sentiment(row.response)
+            if not confidence:
+                return None
+            result["sentiment"] = (sentiment, emotion, confidence)
+        if "summary" in enrichments:
+            limiter.wait()
+            summary, key_topics = summarize_and_extract_topics(row.response, raise_errors=True)
+            result["summary"] = (summary, key_topics)
+        if "insights" in enrichments and (row.insight_id or wants_insights(row.engine, row.response)):
+            limiter.wait()
+            payload = extract_insights(row.response)
+            if not payload:
+                return None
+            result["insights"] = payload
+    except Exception as exc:
+        logger.warning("⚠️ Mención %s: %s", row.id, exc)
+        return None
+    return result
+
+
+def write_results(cur, rows: List[Row], results: List[Optional[Dict[str, Any]]]) -> None:
+    """Escribe los resultados de un lote con una sentencia por tipo de enriquecimiento."""
+    done = [(row, result) for row, result in zip(rows, results) if result]
+
+    sentiment = [(r.id, r.created_at, *res["sentiment"]) for r, res in done if "sentiment" in res]
+    if sentiment:
+        execute_values(cur, """
+            UPDATE mentions m SET sentiment = v.sentiment, emotion = v.emotion, confidence_score = v.confidence
+            FROM (VALUES %s) AS v(id, created_at, sentiment, emotion, confidence)
+            WHERE m.id = v.id AND m.created_at = v.created_at
+        """, sentiment, template="(%s, %s::timestamp, %s::float8, %s, %s::float8)")
+
+    summary = [(r.id, r.created_at, *res["summary"]) for r, res in done if "summary" in res]
+    if summary:
+        execute_values(cur, """
+            UPDATE mentions m SET summary = v.summary, key_topics = v.key_topics
+            FROM (VALUES %s) AS v(id, created_at, summary, key_topics)
+            WHERE m.id = v.id AND m.created_at = v.created_at
+        """, summary, template="(%s, %s::timestamp, %s, %s::text[])")
+
+    existing = [(r.insight_id, json.dumps(res["insights"])) for r, res in done if "insights" in res and r.insight_id]
+    if existing:
+        execute_values(cur, """
+            UPDATE insights i SET payload = v.payload
+            FROM (VALUES %s) AS v(id, payload)
+            WHERE i.id = v.id
+        """, existing, template="(%s, %s::jsonb)")
+
+    new = [(r, res["insights"]) for r, res in done if "insights" in res and not r.insight_id]
+    if new:
+        # INSERT ... VALUES devuelve los ids en el orden de las filas.
+        ids = execute_values(
+            cur, "INSERT INTO insights (query_id, payload) VALUES %s RETURNING id",
+            [(r.query_id, json.dumps(payload)) for r, payload in new], template="(%s, %s::jsonb)", fetch=True,
+        )
+        execute_values(cur, """
+            UPDATE mentions m SET generated_insight_id = v.insight_id
+            FROM (VALUES %s) AS v(id, created_at, insight_id)
+            WHERE m.id = v.id AND m.created_at = v.created_at
+        """, [(r.id, r.created_at, insight_id) for (r, _), (insight_id,) in zip(new, ids)],
+            template="(%s, %s::timestamp, %s)")
+
+
+def record_failures(cur, job: str, rows: List[Row], results: List[Optional[Dict[str, Any]]]) -> None:
+    """Apunta las menciones del lote que fallaron y quita de la lista las que salieron bien."""
+    failed = [(job, r.id, r.created_at) for r, res in zip(rows, results) if res is None]
+    if failed:
+        execute_values(cur, """
+            INSERT INTO enrichment_job_failures (job, mention_id, created_at) VALUES %s
+            ON CONFLICT (job, mention_id) DO UPDATE SET
+                attempts = enrichment_job_failures.attempts + 1, failed_at = NOW()
+        """, failed)
+    succeeded = [r.id for r, res in zip(rows, results) if res is not None]
+    if succeeded:
+        cur.execute("DELETE FROM enrichment_job_failures WHERE job = %s AND mention_id = ANY(%s)", (job, succeeded))
+
+
+def load_job(cur, job: str) -> Optional[Dict[str, Any]]:
+    cur.execute(
+        "SELECT enrichments, filters, last_id, processed, failed, finished_at FROM enrichment_jobs WHERE job = %s",
+        (job,),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("enrichments", "filters", "last_id", "processed", "failed", "finished_at"), row))
+
+
+def start_job(cur, job: str, enrichments: List[str], filters: Dict[str, Any]) -> None:
+    cur.execute(
+        """
+        INSERT INTO enrichment_jobs (job, enrichments, filters) VALUES (%s, %s, %s)
+        ON CONFLICT (job) DO UPDATE SET
+            enrichments = EXCLUDED.enrichments, filters = EXCLUDED.filters, last_id = 0,
+            processed = 0, failed = 0, first_created_at = NULL, last_created_at = NULL,
+            started_at = NOW(), updated_at = NOW(), finished_at = NULL
+        """,
+        (job, enrichments, json.dumps(filters)),
+    )
+    cur.execute("DELETE FROM enrichment_job_failures WHERE job = %s", (job,))
+
+
+def checkpoint(cur, job: str, last_id: Optional[int], processed: int, failed: int,
+               created_range: Tuple[datetime, datetime]) -> None:
+    """Suma los contadores del lote; `last_id` None (reintentos) deja el checkpoint donde estaba."""
+    cur.execute(
+        """
+        UPDATE enrichment_jobs SET
+            last_id = COALESCE(%s, last_id), processed = processed + %s, failed = failed + %s,
+            first_created_at = LEAST(first_created_at, %s), last_created_at = GREATEST(last_created_at, %s),
+            updated_at = NOW()
+        WHERE job = %s
+        """,
+        (last_id, processed, failed, created_range[0], created_range[1], job),
+    )
+
+
+def run(read_conn, write_conn, job: str, batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = DEFAULT_WORKERS, rate: Optional[float] = DEFAULT_RATE,
+        retry_failed: bool = False) -> Dict[str, int]:
+    """
+    Procesa el job desde su último checkpoint o, con `retry_failed`, vuelve a
+    intentar sus menciones fallidas sin mover el checkpoint. `read_conn`
+    mantiene abierto el cursor de servidor; `write_conn` confirma cada lote
+    junto con su checkpoint y su lista de fallidas.
+    """
+    with write_conn.cursor() as cur:
+        state = load_job(cur, job)
+    if state is None:
+        raise ValueError(f"El job {job} no existe")
+    enrichments, filters = state["enrichments"], state["filters"]
+
+    with read_conn.cursor() as cur:
+        source, column = mention_bodies.response_source(cur)
+    stream = read_conn.cursor(name="reenrich_stream")
+    stream.itersize = batch_size
+    stream.execute(
+        f"""
+        SELECT m.id, m.created_at, m.query_id, m.engine, m.generated_insight_id, {column}
+        FROM {_pending_sql(source, filters, retry_failed)}
+        ORDER BY m.id
+        """,
+        {**filters, "last_id": state["last_id"], "job": job},
+    )
+
+    limiter = RateLimiter(rate)
+    totals = {"processed": 0, "failed": 0}
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            rows = [Row(*r) for r in stream.fetchmany(batch_size)]
+            if not rows:
+                break
+            results = list(pool.map(lambda r: enrich_row(r, enrichments, limiter), rows))
+            failed = [r.id for r, res in zip(rows, results) if res is None]
+            succeeded = len(rows) - len(failed)
+            with write_conn.cursor() as cur:
+                write_results(cur, rows, results)
+                record_failures(cur, job, rows, results)
+                # Al reintentar, las que salen bien dejan de contar como fallidas.
+                checkpoint(cur, job, None if retry_failed else rows[-1].id, succeeded,
+                           -succeeded if retry_failed else len(failed),
+                           (min(r.created_at for r in rows), max(r.created_at for r in rows)))
+            write_conn.commit()
+
+            totals["processed"] += succeeded
+            totals["failed"] += len(failed)
+            if failed:
+                logger.warning("⚠️ %s menciones sin re-enriquecer: %s", len(failed), failed)
+            elapsed = time.monotonic() - started
+            print(f"   📝 {job}: id ≤ {rows[-1].id}  {totals['processed']} ok  {totals['failed']} fallidas  "
+                  f"{(totals['processed'] + totals['failed']) / elapsed:,.1f} menciones/s")
+    stream.close()
+    read_conn.rollback()
+
+    with write_conn.cursor() as cur:
+        if not retry_failed:
+            cur.execute("UPDATE enrichment_jobs SET finished_at = NOW() WHERE job = %s", (job,))
+        # Los triggers de mention_rollups ya restaron el sentimiento viejo y
+        # sumaron el nuevo en cada lote; mv_brand_daily se refresca abajo.
+        data_version.bump(cur, "reenrich")
+    write_conn.commit()
+    if "sentiment" in enrichments:
+        with write_conn.cursor() as cur:
+            industry_views.refresh(cur)
+        write_conn.commit()
+    return totals
+
+
+def main(argv=None):
+    from src.db.connection import get_db_connection
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Re-enriquecimiento del histórico de menciones")
+    parser.add_argument("job", nargs="?", help="Nombre del job (se reanuda si ya existe)")
+    parser.add_argument("--enrich", help=f"Lista separada por comas: {','.join(ENRICHMENTS)}")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--query-id", type=int)
+    parser.add_argument("--engine")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Llamadas por minuto (0 = sin límite)")
+    parser.add_argument("--restart", action="store_true", help="Empezar de cero aunque el job exista")
+    parser.add_argument("--retry-failed", action="store_true", help="Reintentar las menciones fallidas del job")
+    parser.add_argument("--dry-run", action="store_true", help="Solo estimar menciones y coste")
+    parser.add_argument("--list", action="store_true", help="Listar jobs")
+    args = parser.parse_args(argv)
+
+    read_conn, write_conn = get_db_connection(), get_db_connection()
+    try:
+        with write_conn.cursor() as cur:
+            install(cur)
+            write_conn.commit()
+
+            if args.list:
+                cur.execute("SELECT job, enrichments, last_id, processed, failed, updated_at, finished_at "
+                            "FROM enrichment_jobs ORDER BY started_at DESC")
+                for job, enrich, last_id, processed, failed, updated_at, finished_at in cur.fetchall():
+                    state = "terminado" if finished_at else f"en curso ({updated_at:%Y-%m-%d %H:%M})"
+                    print(f"{job:<24} {','.join(enrich):<28} id ≤ {last_id:<10} {processed:>8} ok {failed:>6} fallidas  {state}")
+                return
+            if not args.job:
+                parser.error("falta el nombre del job")
+
+            state = load_job(cur, args.job)
+            if args.retry_failed:
+                if state is None or args.restart:
+                    parser.error("--retry-failed necesita un job existente y no admite --restart")
+                enrichments, filters, last_id = state["enrichments"], state["filters"], state["last_id"]
+                print(f"🔁 Reintentando las menciones fallidas de {args.job}")
+            elif state is None or args.restart:
+                if not args.enrich:
+                    parser.error("un job nuevo necesita --enrich")
+                enrichments = [e.strip() for e in args.enrich.split(",")]
+                unknown = set(enrichments) - set(ENRICHMENTS)
+                if unknown:
+                    parser.error(f"enriquecimientos desconocidos: {', '.join(sorted(unknown))}")
+                filters = {
+                    "since": args.since.isoformat() if args.since else None,
+                    "until": args.until.isoformat() if args.until else None,
+                    "query_id": args.query_id, "engine": args.engine,
+                }
+                last_id = 0
+            else:
+                if state["finished_at"]:
+                    print(f"✓ El job {args.job} ya terminó (usa --restart para repetirlo)")
+                    return
+                enrichments, filters, last_id = state["enrichments"], state["filters"], state["last_id"]
+                print(f"↩️  Reanudando {args.job} desde id {last_id} ({state['processed']} ya procesadas)")
+
+            estimate = estimate_cost(cur, enrichments, filters, last_id, args.job, args.retry_failed)
+            print(f"📊 {estimate['mentions']} menciones pendientes")
+            for name, item in estimate["enrichments"].items():
+                print(f"   {name:<10} {item['model']:<14} {item['input_tokens']:>12,} tokens entrada "
+                      f"{item['output_tokens']:>12,} salida  ≈ ${item['usd']:,.2f}")
+            print(f"💵 Coste estimado: ${estimate['usd']:,.2f}")
+            if args.rate:
+                calls = estimate["mentions"] * len(enrichments)
+                print(f"⏱️  Duración estimada a {args.rate:g} llamadas/min: {calls / args.rate:,.0f} min")
+            if args.dry_run:
+                return
+
+            if state is None or args.restart:
+                start_job(cur, args.job, enrichments, filters)
+                write_conn.commit()
+
+        totals = run(read_conn, write_conn, args.job, args.batch_size, args.workers, args.rate, args.retry_failed)
+        print(f"✅ {args.job}: {totals['processed']} menciones re-enriquecidas, {totals['failed']} fallidas")
+    finally:
+        read_conn.close()
+        write_conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# backend/src/utils/fast_json.py
+"""
+Serialización JSON de la API (`jsonify`, `app.json`).
+
+Dos proveedores con la misma salida:
+    • `OrjsonProvider`: orjson serializa dicts, listas y datetimes en C y
+      escribe bytes directamente en la respuesta, sin pasar por str.
+    • `StdlibProvider`: el encoder de la stdlib, como hasta ahora.
+
+Ambos escriben datetimes/dates en ISO 8601 (no en formato HTTP como el
+proveedor por defecto de Flask), Decimal como número, UTF-8 sin escapar y
+las claves ordenadas, así que cambiar de uno a otro no cambia el JSON.
+Se elige con JSON_ENCODER=orjson|stdlib; si orjson no está instalado se usa
+la stdlib.
+"""
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+    ensure_ascii = False  # UTF-8 directo, como orjson
+
+
+class OrjsonProvider(JSONProvider):
+    mimetype = "application/json"
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.OPTIONS), mimetype=self.mimetype
+        )
+
+
+PROVIDERS = {"orjson": OrjsonProvider, "stdlib": StdlibProvider}
+
+
+def make_provider(app, name: str = None) -> JSONProvider:
+    """Proveedor según JSON_ENCODER (por defecto orjson si está instalado)."""
+    name = (name or os.getenv("JSON_ENCODER") or ("orjson" if orjson else "stdlib")).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"JSON_ENCODER desconocido: {name} (opciones: {', '.join(PROVIDERS)})")
+    if name == "orjson" and orjson is None:
+        logger.warning("⚠️  orjson no está instalado: se usa el encoder de la stdlib")
+        name = "stdlib"
+    return PROVIDERS[name](app)
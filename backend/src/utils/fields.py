@@ -0,0 +1,85 @@
+# backend/src/utils/fields.py
+"""
+Respuestas parciales (sparse fieldsets) para los endpoints de listado.
+
+Cada endpoint declara una `Projection`: las columnas SQL que puede leer (por
+alias) y los campos JSON que devuelve, cada uno con las columnas que necesita
+y cómo se construye. Con `fields=id,created_at,summary` solo se seleccionan
+esas columnas (y los JOIN que las aportan), y con `excerpt_len=N` los campos
+de texto largo se recortan a N caracteres (en lugar de su recorte por defecto)
+ya en el SELECT (`left()`), de modo que ni la base de datos ni la
+serialización mueven texto que no se muestra.
+
+Sin `fields` se devuelven los campos por defecto de cada endpoint, como antes.
+"""
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+MAX_EXCERPT_LEN = 10000
+
+
+def shorten(text: Optional[str], length: int) -> Optional[str]:
+    if text is None:
+        return None
+    return text[:length] + "..." if len(text) > length else text
+
+
+class Field(NamedTuple):
+    columns: Tuple[str, ...]
+    build: Callable[..., Any] = lambda value: value
+    text: bool = False  # se recorta con excerpt_len
+    length: Optional[int] = None  # recorte por defecto si no hay excerpt_len
+
+
+class Projection:
+    def __init__(self, columns: Dict[str, str], fields: Dict[str, Field],
+                 default: Optional[Sequence[str]] = None, text_columns: Iterable[str] = ()):
+        self.columns = columns
+        self.fields = fields
+        self.default = list(default or fields)
+        self.text_columns = set(text_columns)
+
+    def parse(self, args, extra: Iterable[str] = ()) -> Tuple[List[str], Optional[int]]:
+        """(campos, excerpt_len) de los parámetros `fields` y `excerpt_len`; ValueError si no son válidos."""
+        raw = args.get('fields', '').strip()
+        selected = [name.strip() for name in raw.split(',') if name.strip()] if raw else list(self.default)
+        selected += [name for name in extra if name not in selected]
+        unknown = [name for name in selected if name not in self.fields]
+        if unknown:
+            raise ValueError(f"campos desconocidos: {', '.join(unknown)} (disponibles: {', '.join(self.fields)})")
+
+        excerpt_len = args.get('excerpt_len')
+        if excerpt_len in (None, ''):
+            return selected, None
+        excerpt_len = int(excerpt_len)
+        if not 1 <= excerpt_len <= MAX_EXCERPT_LEN:
+            raise ValueError(f"excerpt_len debe estar entre 1 y {MAX_EXCERPT_LEN}")
+        return selected, excerpt_len
+
+    def needed_columns(self, selected: Iterable[str], always: Iterable[str] = ()) -> List[str]:
+        needed = list(always)
+        for name in selected:
+            needed += [column for column in self.fields[name].columns if column not in needed]
+        return needed
+
+    def select_sql(self, columns: Sequence[str], excerpt_len: Optional[int] = None) -> str:
+        """Lista del SELECT para `columns` (alias); el texto largo se corta a excerpt_len + 1."""
+        exprs = []
+        for column in columns:
+            expr = self.columns[column]
+            if excerpt_len and column in self.text_columns:
+                expr = f"left({expr}, {int(excerpt_len) + 1})"
+            exprs.append(expr)
+        return ", ".join(exprs)
+
+    def shape(self, row: Sequence[Any], columns: Sequence[str], selected: Iterable[str],
+              excerpt_len: Optional[int] = None) -> Dict[str, Any]:
+        values = dict(zip(columns, row))
+        result = {}
+        for name in selected:
+            field = self.fields[name]
+            value = field.build(*(values[column] for column in field.columns))
+            length = excerpt_len or field.length
+            if field.text and length and isinstance(value, str):
+                value = shorten(value, length)
+            result[name] = value
+        return result
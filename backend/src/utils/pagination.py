@@ -0,0 +1,61 @@
+# backend/src/utils/pagination.py
+"""
+Cursores opacos para paginación por clave (keyset).
+
+El cursor es la última posición de la página (p. ej. (rank, created_at, id))
+serializada en JSON y codificada en base64 url-safe, para que el cliente lo
+devuelva tal cual sin depender de su formato.
+
+El total de resultados es opcional: `estimate_count()` lo toma del plan
+(EXPLAIN, sin recorrer filas) para que contar no cueste más que la página.
+"""
+import base64
+import json
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+
+def encode_cursor(position: Optional[Sequence[Any]]) -> Optional[str]:
+    if position is None:
+        return None
+    raw = json.dumps(list(position), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list]:
+    """Devuelve la posición o None; lanza ValueError si el cursor no es válido."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("cursor inválido") from exc
+    if not isinstance(position, list):
+        raise ValueError("cursor inválido")
+    return position
+
+
+def decode_keyset(cursor: Optional[str], *types: Callable[[Any], Any]) -> Optional[Tuple]:
+    """
+    Como decode_cursor(), pero la posición debe tener un valor por cada
+    conversor de `types` (p. ej. datetime.fromisoformat, int) y se devuelve ya
+    convertida. Cualquier fallo es ValueError, para responder 400 y no 500.
+    """
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    if len(position) != len(types):
+        raise ValueError("cursor inválido")
+    try:
+        return tuple(convert(value) for convert, value in zip(types, position))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("cursor inválido") from exc
+
+
+def estimate_count(cur, sql: str, params: Optional[Dict] = None) -> int:
+    """Filas que el planificador estima para `sql` (EXPLAIN, no se ejecuta)."""
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
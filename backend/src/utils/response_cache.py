@@ -0,0 +1,207 @@
+# backend/src/utils/response_cache.py
+"""
+Caché de respuestas de la API invalidada por versión de datos.
+
+Los datos del dashboard solo cambian cuando un escritor incrementa
+`data_version` (ver src/db/data_version.py), así que una respuesta GET
+calculada con la versión V sirve mientras la versión siga siendo V. La clave
+es la ruta más los parámetros normalizados (ordenados) y cada entrada guarda
+el cuerpo ya serializado:
+
+    • Nivel 1: LRU en memoria del proceso (CACHE_MAX_ENTRIES, 0 = desactivada).
+    • Nivel 2 (opcional): Redis compartido entre workers (CACHE_REDIS_URL),
+      con la versión en la clave, así que las entradas viejas caducan solas.
+
+La versión se consulta como mucho cada CACHE_VERSION_CHECK_INTERVAL segundos
+por proceso, de modo que una recarga del dashboard con la caché caliente no
+toca Postgres. Solo avanza: la recarga lee de la réplica, que puede ir por
+detrás de la versión que la propia API fijó tras escribir en la primaria. CACHE_TTL acota además la vida de cada entrada, porque las
+ventanas relativas (`range=24h`) avanzan aunque no lleguen datos nuevos.
+
+`stats()` da aciertos, fallos, ratio, respuestas 304 y el tiempo de cálculo
+ahorrado (la suma de lo que tardaron en calcularse las respuestas servidas
+desde la caché).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL = 300.0
+DEFAULT_VERSION_CHECK_INTERVAL = 2.0
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    mimetype: str
+    compute_ms: float
+    stored_at: float
+
+
+class RedisBackend:
+    """Segundo nivel compartido; `redis` solo hace falta si se configura CACHE_REDIS_URL."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "api-cache"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_REDIS_URL requiere el paquete 'redis' (pip install redis)") from exc
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: str, version: int) -> str:
+        return f"{self.prefix}:{version}:{key}"
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        raw = self.client.get(self._key(key, version))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(data["body"].encode(), data["mimetype"], data["compute_ms"], data["stored_at"])
+
+    def set(self, key: str, version: int, entry: CachedResponse) -> None:
+        raw = json.dumps({
+            "body": entry.body.decode(), "mimetype": entry.mimetype,
+            "compute_ms": entry.compute_ms, "stored_at": entry.stored_at,
+        })
+        self.client.set(self._key(key, version), raw, ex=max(int(self.ttl), 1))
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 version_check_interval: float = DEFAULT_VERSION_CHECK_INTERVAL, shared: Optional[RedisBackend] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (version, CachedResponse)
+        self._version: Optional[int] = None
+        self._highest: Optional[int] = None  # mayor versión vista; _version es None si no se pudo leer
+        self._checked_at: Optional[float] = None
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "not_modified": 0, "bypass": 0, "saved_ms": 0.0}
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        ttl = float(os.getenv("CACHE_TTL", DEFAULT_TTL))
+        redis_url = os.getenv("CACHE_REDIS_URL")
+        return cls(
+            int(os.getenv("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            ttl,
+            float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", DEFAULT_VERSION_CHECK_INTERVAL)),
+            RedisBackend(redis_url, ttl) if redis_url else None,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(path: str, args) -> str:
+        """Ruta + parámetros ordenados: ?b=1&a=2 y ?a=2&b=1 comparten entrada."""
+        items = sorted((name, value) for name in args for value in args.getlist(name))
+        return f"{path}?{urlencode(items)}" if items else path
+
+    def version(self, load_version: Callable[[], Optional[int]]) -> Optional[int]:
+        """Versión de los datos, releída con `load_version` como mucho cada version_check_interval."""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.version_check_interval:
+            try:
+                version = load_version()
+            except Exception as exc:
+                logger.warning("⚠️  No se pudo leer data_version: %s", exc)
+                version = None
+            self.set_version(version, checked_at=now)
+        return self._version
+
+    def set_version(self, version: Optional[int], checked_at: Optional[float] = None) -> None:
+        """
+        Fija la versión conocida (p. ej. tras un bump de la propia API) y vacía
+        lo anterior. Una versión menor que la mayor ya vista (réplica con
+        retraso) se ignora: volver a ella daría 304 a ETags anteriores a la
+        escritura. None (data_version ilegible) desactiva la caché hasta la
+        siguiente lectura.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic() if checked_at is None else checked_at
+            if version is not None and self._highest is not None and version < self._highest:
+                return
+            if version != self._version:
+                self._entries.clear()
+            self._version = version
+            if version is not None:
+                self._highest = version
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == version and now - cached[1].stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["saved_ms"] += cached[1].compute_ms
+                return cached[1]
+        entry = None
+        if self.shared:
+            try:
+                entry = self.shared.get(key, version)
+            except Exception as exc:
+                logger.warning("⚠️  Caché compartida no disponible: %s", exc)
+        with self._lock:
+            if entry is not None and now - entry.stored_at < self.ttl:
+                self._store(key, version, entry)
+                self._stats["hits"] += 1
+                self._stats["shared_hits"] += 1
+                self._stats["saved_ms"] += entry.compute_ms
+                return entry
+            self._stats["misses"] += 1
+        return None
+
+    def _store(self, key: str, version: int, entry: CachedResponse) -> None:
+        self._entries[key] = (version, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, key: str, version: int, body: bytes, mimetype: str, compute_ms: float) -> None:
+        entry = CachedResponse(body, mimetype, compute_ms, time.time())
+        with self._lock:
+            if version != self._version:
+                return  # la versión cambió mientras se calculaba
+            self._store(key, version, entry)
+        if self.shared:
+            try:
+                self.shared.set(key, version, entry)
+            except Exception as exc:
+                logger.warning("⚠️  Caché compartida no disponible: %s", exc)
+
+    def bypass(self) -> None:
+        with self._lock:
+            self._stats["bypass"] += 1
+
+    def not_modified(self) -> None:
+        """Petición condicional resuelta con 304 (sin cuerpo ni consulta)."""
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "enabled": self.enabled, "shared": self.shared is not None, "version": self._version,
+            "entries": entries, "max_entries": self.max_entries,
+            "hits": stats["hits"], "shared_hits": stats["shared_hits"], "misses": stats["misses"],
+            "not_modified": stats["not_modified"], "bypass": stats["bypass"],
+            "hit_ratio": round(stats["hits"] / lookups, 3) if lookups else None,
+            "saved_ms": round(stats["saved_ms"], 1),
+        }
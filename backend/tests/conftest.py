@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import psycopg2
+import pytest
+
+
+class _Uncommitted:
+    """Conexión cuyo commit() no hace nada: todo lo que escribe el test se deshace al final."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def commit(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture
+def pg():
+    """
+    Conexión a la base de datos de desarrollo (la de `src.db.connection`) dentro
+    de una transacción que se deshace al terminar. Sin base de datos, el test se salta.
+    """
+    from src.db.connection import DB_CONFIG
+
+    try:
+        conn = psycopg2.connect(connect_timeout=2, **DB_CONFIG)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Sin PostgreSQL: {e}")
+    try:
+        yield _Uncommitted(conn)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def require_tables(cur, *tables):
+    """Salta el test si la base de datos todavía no tiene las migraciones que crean `tables`."""
+    for table in tables:
+        cur.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+        if cur.fetchone()[0] is None:
+            pytest.skip(f"Falta la tabla {table}: ejecuta las migraciones")
+
+
+# Mes sin datos reales (empieza en lunes) en el que escriben las pruebas de triggers.
+TEST_MONTH = datetime(2001, 1, 1)
+
+
+def empty_month(cur, *tables) -> datetime:
+    """Crea las particiones de TEST_MONTH en `tables` (particionadas por mes) y lo devuelve."""
+    from src.db.partitions import create_month_partition, is_partitioned
+
+    for table in tables:
+        if is_partitioned(cur, table):
+            create_month_partition(cur, table, TEST_MONTH.date())
+    return TEST_MONTH
@@ -0,0 +1,84 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.db import archive
+
+COLUMNS = [("id", "int4"), ("engine", "text"), ("sentiment", "float8"), ("created_at", "timestamp"),
+           ("key_topics", "_text"), ("status", "text"), ("search_config", "regconfig")]
+
+
+def test_arrow_schema_maps_postgres_types():
+    schema = archive.arrow_schema(COLUMNS)
+
+    assert schema.field("id").type == pa.int32()
+    assert schema.field("created_at").type == pa.timestamp("us")
+    assert schema.field("key_topics").type == pa.list_(pa.string())
+    # Tipos sin equivalente (regconfig) se exportan como texto.
+    assert schema.field("search_config").type == pa.string()
+    assert schema.names[-3:] == ["response", "brands", "citations"]
+    assert "m.search_config::text" in archive._select_sql(COLUMNS, whole_month=False)
+    assert "m.status = 'archived'" not in archive._select_sql(COLUMNS, whole_month=True)
+
+
+def test_write_month_streams_rows_to_parquet_and_registers_them(tmp_path):
+    created = datetime(2025, 1, 10, 12, 0)
+    rows = [
+        (1, "gpt-4", 0.5, created, ["precio"], "archived", "spanish", "texto", '{"Oreo": 2}',
+         '[{"title": "Oreo", "url": "https://oreo.com", "created_at": "2025-01-10T12:00:00"}]'),
+        (7, "claude", None, created, [], "archived", "simple", None, None, None),
+    ]
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = COLUMNS
+    cur.fetchmany.side_effect = [rows, []]
+    cur.fetchone.return_value = (99,)
+
+    entry = archive.write_month(conn, date(2025, 1, 1), datetime(2025, 6, 1), str(tmp_path))
+
+    table = pq.read_table(entry["path"])
+    assert entry["path"].startswith(str(tmp_path / "mentions" / "month=2025-01"))
+    assert table.num_rows == 2 and entry["row_count"] == 2
+    assert table.column("key_topics").to_pylist() == [["precio"], []]
+    assert table.column("brands").to_pylist() == ['{"Oreo": 2}', None]
+    assert table.column("citations").null_count == 1
+    assert (entry["min_id"], entry["max_id"], entry["id"]) == (1, 7, 99)
+    assert entry["whole_month"] is True
+    assert "INSERT INTO archive_manifest" in cur.execute.call_args_list[-1].args[0]
+
+
+def test_delete_archived_rows_batches_ids_and_marks_entry_deleted(tmp_path):
+    path = str(tmp_path / "part.parquet")
+    created = datetime(2025, 3, 5)
+    pq.write_table(pa.table({"id": pa.array(range(1, 6), pa.int32()), "created_at": [created] * 5}), path)
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.side_effect = [(2,), (2,), (1,)]
+    entry = {"id": 3, "path": path, "month": date(2025, 3, 1), "row_count": 5,
+             "retention_cutoff": datetime(2025, 1, 1), "whole_month": False}
+
+    assert archive.delete_archived_rows(conn, entry, batch_size=2) == 5
+
+    batches = [c.args[1] for c in cur.execute.call_args_list if c.args[0] == archive.DELETE_BATCH_SQL]
+    assert [b["ids"] for b in batches] == [[1, 2], [3, 4], [5]]
+    assert batches[0]["created"] == [created, created]
+    assert cur.execute.call_args_list[-1].args[1] == (5, 3)
+
+
+def test_delete_batch_and_partition_drop_also_remove_citations():
+    assert "DELETE FROM citations c USING doomed d" in archive.DELETE_BATCH_SQL
+
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.side_effect = [(True,), (True,), (5,)]
+    entry = {"month": date(2025, 3, 1), "row_count": 5}
+
+    with patch("src.db.archive.detach_partition") as detach:
+        assert archive._drop_month_partitions(conn, entry) == 5
+
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    assert "DELETE FROM citations c USING mentions_y2025m03 m WHERE c.mention_id = m.id" in statements
+    # Los cuerpos se separan antes: su FK referencia la partición de mentions.
+    assert [c.args[1] for c in detach.call_args_list] == ["mention_bodies", "mentions"]
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+import asgi
+
+
+class FakeAsyncCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    async def execute(self, sql, params=None):
+        await asyncio.sleep(0)
+        self.executed.append((sql, params))
+
+    async def fetchall(self):
+        await asyncio.sleep(0)
+        return self.rows
+
+
+def test_run_sync_awaits_each_query_of_a_sync_payload_function():
+    def payload(cur, limit):
+        cur.execute("SELECT n FROM t LIMIT %(limit)s", {"limit": limit})
+        return [n for (n,) in cur.fetchall()]
+
+    cursor = FakeAsyncCursor([(1,), (2,)])
+
+    async def run():
+        # Dos a la vez en el mismo bucle, como los widgets de /api/dashboard.
+        return await asyncio.gather(*(asgi.run_sync(payload, asgi.SyncCursor(cursor), 2) for _ in range(2)))
+
+    assert asyncio.run(run()) == [[1, 2], [1, 2]]
+    assert cursor.executed == [("SELECT n FROM t LIMIT %(limit)s", {"limit": 2})] * 2
+
+
+def test_run_sync_propagates_errors_and_await_only_requires_a_bridge():
+    class FailingCursor(FakeAsyncCursor):
+        async def execute(self, sql, params=None):
+            raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(asgi.run_sync(lambda cur: cur.execute("SELECT 1"), asgi.SyncCursor(FailingCursor([]))))
+    with pytest.raises(RuntimeError):
+        asgi.await_only(None)
+
+
+def test_wsgi_environ_keeps_query_and_headers():
+    environ = asgi.wsgi_environ({
+        "type": "http", "method": "GET", "path": "/api/topics", "query_string": b"range=7d&limit=5",
+        "headers": [(b"if-none-match", b'"4-abc"'), (b"accept-encoding", b"gzip"), (b"x-forwarded-for", b"a"),
+                    (b"x-forwarded-for", b"b")],
+        "server": ("127.0.0.1", 5050), "client": ("10.0.0.1", 1234),
+    })
+
+    assert (environ["PATH_INFO"], environ["QUERY_STRING"]) == ("/api/topics", "range=7d&limit=5")
+    assert environ["HTTP_IF_NONE_MATCH"] == '"4-abc"' and environ["HTTP_X_FORWARDED_FOR"] == "a,b"
+    assert set(asgi.ASYNC_VIEWS) >= {"/api/dashboard", "/api/topics", "/api/industry/ranking"}
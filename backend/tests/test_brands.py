@@ -0,0 +1,121 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from src.engines.brands import BrandMatcher, fold
+
+
+def make_matcher():
+    return BrandMatcher({
+        "lotus biscoff": "Lotus Biscoff",
+        "biscoff": "Lotus Biscoff",
+        "tate's": "Tate's Bake Shop",
+        "oreo": "Oreo",
+        "oreos": "Oreo",
+        "nestlé": "Nestlé",
+    })
+
+
+def test_fold_strips_accents_and_case():
+    assert fold("Nestlé TATE’S") == "nestle tate's"
+
+
+def test_word_boundaries():
+    matcher = make_matcher()
+    assert matcher.find("real estate agents love oreo") == {"Oreo": 1}
+    assert matcher.find("oreoesque") == {}
+
+
+def test_multiple_brands_and_counts():
+    matcher = make_matcher()
+    text = "Oreos vs Tate’s vs Nestle: oreo wins, OREO again."
+    assert matcher.find(text) == {"Oreo": 3, "Tate's Bake Shop": 1, "Nestlé": 1}
+
+
+def test_overlapping_aliases_count_once():
+    assert make_matcher().find("Lotus Biscoff is great") == {"Lotus Biscoff": 1}
+
+
+def test_empty_text():
+    assert make_matcher().find(None) == {}
+
+
+def test_discover_shapes_known_and_candidates():
+    from unittest.mock import MagicMock
+    from src.engines.brands import discover
+
+    cur = MagicMock()
+    cur.fetchall.side_effect = [
+        [("Lotus Biscoff", "biscoff", 0.71)],
+        [("biscof", 12, 0.83, False), ("biscoff", 40, 0.71, True)],
+    ]
+
+    found = discover(cur, "biscof", threshold=0.4)
+
+    assert found["known"] == [{"brand": "Lotus Biscoff", "alias": "biscoff", "similarity": 0.71}]
+    assert found["candidates"][0] == {"term": "biscof", "mentions": 12, "similarity": 0.83, "known": False}
+    assert cur.execute.call_args_list[0][0][1] == ("0.4", "0.4")
+
+
+def test_discover_endpoint_clamps_limit_between_1_and_50(monkeypatch):
+    import app as api
+
+    discover = MagicMock(return_value={"candidates": []})
+    monkeypatch.setattr(api.brands, "discover", discover)
+    monkeypatch.setattr(api, "get_db_connection", MagicMock())
+    client = api.app.test_client()
+
+    for requested, applied in (("-5", 1), ("0", 1), ("20", 20), ("500", 50)):
+        assert client.get(f"/api/brands/discover?name=oreo&limit={requested}").status_code == 200
+        assert discover.call_args.kwargs["limit"] == applied
+
+
+def test_discover_endpoint_clamps_threshold_between_0_and_1(monkeypatch):
+    import app as api
+
+    discover = MagicMock(return_value={"candidates": []})
+    monkeypatch.setattr(api.brands, "discover", discover)
+    monkeypatch.setattr(api, "get_db_connection", MagicMock())
+    client = api.app.test_client()
+
+    for requested, applied in (("-1", 0.0), ("0.45", 0.45), ("7", 1.0), ("inf", 1.0)):
+        assert client.get(f"/api/brands/discover?name=oreo&threshold={requested}").status_code == 200
+        assert discover.call_args.kwargs["threshold"] == applied
+    for requested in ("nan", "alto"):
+        assert client.get(f"/api/brands/discover?name=oreo&threshold={requested}").status_code == 400
+
+
+def test_add_command_defaults_to_competitor_like_the_column(monkeypatch):
+    from src.engines import brands
+
+    add_alias = MagicMock()
+    monkeypatch.setattr(brands, "add_alias", add_alias)
+    monkeypatch.setattr("src.db.connection.get_db_connection", MagicMock())
+
+    brands.main(["add", "Oreo", "oreos"])
+    brands.main(["add", "Lotus", "lotus", "--no-competitor"])
+
+    assert [c.args[4] for c in add_alias.call_args_list] == [True, False]
+
+
+def test_deleting_a_query_cascades_to_mention_brands(pg):
+    from src.engines import brands
+    from src.scheduler.poll import insert_mention
+    from tests.conftest import require_tables
+
+    with pg.cursor() as cur:
+        require_tables(cur, "mention_bodies", "mention_brands")
+        brands.add_foreign_key(cur)
+        cur.execute("INSERT INTO queries (query) VALUES ('mention-brands test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        mention_id = insert_mention(cur, {
+            "query_id": query_id, "engine": "gpt-4", "source": None, "sentiment": 0.1, "emotion": None,
+            "confidence": None, "source_title": None, "source_url": None, "created_at": datetime.now(),
+            "summary": None, "key_topics": None, "insight_id": None, "response": "Oreo y Biscoff",
+        })
+        cur.execute("SELECT created_at FROM mentions WHERE id = %s", (mention_id,))
+        brands.store_mention_brands(cur, [(mention_id, "Oreo", 1, cur.fetchone()[0])])
+
+        cur.execute("DELETE FROM queries WHERE id = %s", (query_id,))
+
+        cur.execute("SELECT COUNT(*) FROM mention_brands WHERE mention_id = %s", (mention_id,))
+        assert cur.fetchone()[0] == 0
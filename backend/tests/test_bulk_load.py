@@ -0,0 +1,86 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from src.db import bulk_load
+
+
+def test_read_records_accepts_csv_jsonl_and_api_json(tmp_path):
+    (tmp_path / "q.csv").write_text('query,brand\n"¿Mejores galletas?",Oreo\n', encoding="utf-8")
+    (tmp_path / "m.jsonl").write_text('{"engine": "gpt-4"}\n\n{"engine": "claude"}\n')
+    (tmp_path / "api.json").write_text(json.dumps({"mentions": [{"id": 1}, {"id": 2}]}))
+    (tmp_path / "card.json").write_text(json.dumps({"title": "x"}))
+
+    assert list(bulk_load.read_records(str(tmp_path / "q.csv"))) == [{"query": "¿Mejores galletas?", "brand": "Oreo"}]
+    assert [r["engine"] for r in bulk_load.read_records(str(tmp_path / "m.jsonl"))] == ["gpt-4", "claude"]
+    assert len(list(bulk_load.read_records(str(tmp_path / "api.json")))) == 2
+    assert list(bulk_load.read_records(str(tmp_path / "card.json"))) == [{"title": "x"}]
+
+
+def test_rows_are_normalized_and_escaped_for_copy():
+    row = bulk_load.mention_row({
+        "query": "galletas", "engine": "gpt-4", "response": 'a\tb\nc\\d', "sentiment": "0.5",
+        "created_at": "2025-09-01T10:00:00Z", "key_topics": 'Oreo; "Lotus"', "confidence": "",
+    })
+    line = next(bulk_load.copy_lines([row], 7))
+
+    fields = line.rstrip("\n").split("\t")
+    assert fields[1] == "galletas" and fields[4] == "a\\tb\\nc\\\\d"
+    assert fields[5] == "0.5" and fields[7] == r"\N"
+    assert fields[11] == "2025-09-01 10:00:00"
+    assert fields[13] == '{"Oreo","\\\\"Lotus\\\\""}'
+    assert fields[-1] == "7"
+
+
+def test_insight_cards_become_payloads():
+    card = {"category": "Opportunity", "date": "2025-09-02", "excerpt": "Alta empleabilidad",
+            "query": "¿Qué alternativas...?", "tags": ["opportunities", "The Core"]}
+
+    query_id, query_text, payload, created_at = bulk_load.insight_row(card)
+
+    assert (query_id, query_text) == (None, "¿Qué alternativas...?")
+    assert json.loads(payload) == {"opportunities": ["Alta empleabilidad"]}
+    assert created_at == "2025-09-02 00:00:00"
+
+
+@patch("src.db.bulk_load.ensure_monthly_partitions")
+def test_load_copies_in_chunks_and_merges_once(ensure):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (None,)
+    cur.rowcount = 5
+    records = [{"query_id": 1, "engine": "gpt-4", "response": f"r{i}"} for i in range(5)]
+
+    result = bulk_load.load(conn, "mentions", records, chunk_rows=2)
+
+    assert cur.copy_expert.call_count == 3
+    assert cur.copy_expert.call_args.args[1].getvalue().endswith("\t5\n")
+    executed = [c.args[0] for c in cur.execute.call_args_list]
+    assert executed.count(bulk_load.MERGE_SQL["mentions"]) == 1
+    assert {c.args[1] for c in ensure.call_args_list} == {"mentions", "mention_bodies"}
+    assert result["staged"] == 5 and result["inserted"] == 5
+    conn.commit.assert_called_once()
+
+
+def test_reload_without_enabled_or_language_keeps_existing_values(pg, tmp_path):
+    with pg.cursor() as cur:
+        cur.execute("""
+            INSERT INTO queries (query, brand, enabled, language)
+            VALUES ('bulk-load test: ¿mejor galleta?', 'Oreo', FALSE, 'es')
+        """)
+    (tmp_path / "queries.csv").write_text(
+        "query,topic\nbulk-load test: ¿mejor galleta?,Galletas\nbulk-load test: nueva,Galletas\n", encoding="utf-8"
+    )
+
+    result = bulk_load.load(pg, "queries", bulk_load.read_records(str(tmp_path / "queries.csv")))
+
+    with pg.cursor() as cur:
+        cur.execute("""
+            SELECT query, brand, topic, enabled, language FROM queries
+            WHERE query LIKE 'bulk-load test:%%' ORDER BY query
+        """)
+        rows = cur.fetchall()
+    assert (result["inserted"], result["updated"]) == (1, 1)
+    assert rows == [
+        ("bulk-load test: nueva", None, "Galletas", True, "en"),
+        ("bulk-load test: ¿mejor galleta?", "Oreo", "Galletas", False, "es"),
+    ]
@@ -0,0 +1,46 @@
+import gzip
+from datetime import datetime
+from decimal import Decimal
+
+from flask import Flask, jsonify
+from werkzeug.http import parse_accept_header
+
+from src.utils import compression
+from src.utils.fast_json import OrjsonProvider, StdlibProvider, make_provider
+
+
+def _accept(value):
+    return parse_accept_header(value)
+
+
+def test_providers_write_the_same_json():
+    app = Flask(__name__)
+    payload = {"b": [{"t": datetime(2026, 10, 1, 12, 0), "d": Decimal("1.25"), "s": "galleta ñ"}], "a": None}
+    with app.app_context():
+        stdlib = StdlibProvider(app).response(payload).get_data().strip()
+        fast = OrjsonProvider(app).response(payload).get_data()
+    assert stdlib == fast == '{"a":null,"b":[{"d":1.25,"s":"galleta ñ","t":"2026-10-01T12:00:00"}]}'.encode()
+    assert isinstance(make_provider(app, "stdlib"), StdlibProvider)
+
+
+def test_compresses_large_json_and_tags_the_etag():
+    app = Flask(__name__)
+    with app.test_request_context():
+        response = jsonify({"text": "galleta " * 500})
+        response.set_etag("7-abc")
+        compression.compress_response(response, _accept("gzip, deflate"), threshold=1024)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.get_etag() == ("7-abc-gzip", False)
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert b"galleta" in gzip.decompress(response.get_data())
+
+
+def test_leaves_small_or_unaccepted_responses_alone():
+    app = Flask(__name__)
+    with app.test_request_context():
+        small = compression.compress_response(jsonify({"ok": True}), _accept("gzip"), threshold=1024)
+        identity = compression.compress_response(jsonify({"text": "x" * 5000}), _accept("identity"), threshold=1024)
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in identity.headers
+    assert compression.choose_encoding(_accept("gzip;q=0")) is None
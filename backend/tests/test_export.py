@@ -0,0 +1,40 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from src.db import export
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_stream_rows_reads_a_named_cursor_in_chunks():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    chunks = list(export.stream_rows(conn, "SELECT 1", {}, size=2))
+
+    assert chunks == [[(1,), (2,)], [(3,)]]
+    assert conn.cursor.call_args.kwargs["name"].startswith("export_")
+    cur.fetchmany.assert_called_with(2)
+
+
+def test_csv_chunk_serializes_lists_and_nulls():
+    records = [{"id": 7, "created_at": "2026-10-01T12:00:00", "key_topics": ["oreo", "galleta"], "summary": None}]
+    text = export.csv_chunk(records, ["id", "created_at", "key_topics", "summary"], header=True)
+    assert text == 'id,created_at,key_topics,summary\r\n7,2026-10-01T12:00:00,"[""oreo"", ""galleta""]",\r\n'
+
+
+def test_resume_cursor_points_after_the_last_row():
+    cursor = export.resume_cursor({"id": 9, "created_at": datetime(2026, 10, 1, 12, 0)})
+    assert decode_cursor(cursor) == ["2026-10-01T12:00:00", 9]
+
+
+def test_export_rejects_malformed_cursor_with_400(monkeypatch):
+    import app as api
+
+    monkeypatch.setattr(api, "get_db_connection", MagicMock(side_effect=AssertionError("sin base de datos")))
+    cursor = encode_cursor(["no-es-una-fecha", "x"])
+
+    response = api.app.test_client().get(f"/api/export/mentions?cursor={cursor}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "cursor inválido"}
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+
+from src.utils.fields import Field, Projection
+
+PROJECTION = Projection(
+    columns={'id': "m.id", 'created_at': "m.created_at", 'summary': "m.summary", 'query': "q.query"},
+    fields={
+        'id': Field(('id',)),
+        'created_at': Field(('created_at',), lambda value: value.isoformat()),
+        'summary': Field(('summary',), text=True, length=10),
+        'query': Field(('query',)),
+    },
+    default=('id', 'summary'),
+    text_columns=('summary',),
+)
+
+
+def test_parse_defaults_and_validates():
+    assert PROJECTION.parse({}) == (['id', 'summary'], None)
+    assert PROJECTION.parse({'fields': 'created_at, id', 'excerpt_len': '5'}) == (['created_at', 'id'], 5)
+    with pytest.raises(ValueError):
+        PROJECTION.parse({'fields': 'id,response'})
+    with pytest.raises(ValueError):
+        PROJECTION.parse({'excerpt_len': '0'})
+
+
+def test_select_only_needed_columns_and_truncate_in_sql():
+    columns = PROJECTION.needed_columns(['summary'], always=('id',))
+    assert columns == ['id', 'summary']
+    assert PROJECTION.select_sql(columns, excerpt_len=20) == "m.id, left(m.summary, 21)"
+    assert "q.query" not in PROJECTION.select_sql(columns)
+
+
+def test_shape_builds_selected_fields_with_excerpt():
+    row = (7, datetime(2026, 10, 1), "un resumen bastante largo")
+    columns = ['id', 'created_at', 'summary']
+
+    assert PROJECTION.shape(row, columns, ['summary']) == {'summary': "un resumen..."}
+    assert PROJECTION.shape(row, columns, ['created_at', 'summary'], excerpt_len=2) == {
+        'created_at': "2026-10-01T00:00:00", 'summary': "un...",
+    }
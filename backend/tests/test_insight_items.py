@@ -0,0 +1,70 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from src.db import insight_items
+from tests.conftest import empty_month, require_tables
+
+
+def test_items_select_flattens_every_text_list_kind():
+    sql = insight_items.items_select("new_rows")
+
+    assert "FROM new_rows i" in sql
+    assert "WITH ORDINALITY" in sql
+    for kind in ("opportunities", "risks", "trends", "top_themes", "calls_to_action", "quotes"):
+        assert f"'{kind}'" in sql
+    # brands son objetos y topic_frequency un mapa: no son elementos de texto.
+    assert "'brands'" not in sql and "'topic_frequency'" not in sql
+
+
+def test_triggers_keep_items_equal_to_the_payloads(pg):
+    with pg.cursor() as cur:
+        require_tables(cur, "insight_items")
+        month = empty_month(cur, "insights", "insight_items")
+        cur.execute("INSERT INTO queries (query) VALUES ('insight items test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO insights (query_id, payload, created_at) VALUES
+                (%(q)s, '{"calls_to_action": ["Llamar", "Escribir"], "risks": ["r"]}', %(t)s),
+                (%(q)s, '{"opportunities": ["o", " "], "topic_frequency": {"x": 1}}', %(t)s),
+                (%(q)s, '{"trends": ["t"]}', %(t)s)
+            RETURNING id
+        """, {"q": query_id, "t": month + timedelta(hours=9)})
+        ids = [row[0] for row in cur.fetchall()]
+        cur.execute("UPDATE insight_items SET done = TRUE WHERE insight_id = %s AND text = 'Escribir'", (ids[0],))
+        # Re-enriquecimiento: "Escribir" sigue (en otra posición), "Llamar" desaparece.
+        cur.execute("""
+            UPDATE insights SET payload = '{"calls_to_action": ["Escribir", "Visitar"], "risks": ["r"]}'
+            WHERE id = %s
+        """, (ids[0],))
+        cur.execute("UPDATE insights SET created_at = created_at WHERE id = %s", (ids[2],))
+        cur.execute("DELETE FROM insights WHERE id = %s", (ids[1],))
+
+        cur.execute(f"""
+            SELECT insight_id, query_id, kind, text, rank, created_at FROM insight_items
+            WHERE query_id = %(q)s
+            EXCEPT ALL ({insight_items.items_select("insights")} AND i.query_id = %(q)s)
+        """, {"q": query_id})
+        extra = cur.fetchall()
+        cur.execute(f"""
+            ({insight_items.items_select("insights")} AND i.query_id = %(q)s)
+            EXCEPT ALL SELECT insight_id, query_id, kind, text, rank, created_at FROM insight_items
+            WHERE query_id = %(q)s
+        """, {"q": query_id})
+        missing = cur.fetchall()
+        cur.execute("SELECT kind, text, rank FROM insight_items WHERE query_id = %s AND done", (query_id,))
+        done = cur.fetchall()
+
+    assert extra == [] and missing == []
+    # El estado `done` sigue al texto, no a la posición.
+    assert done == [("calls_to_action", "Escribir", 1)]
+
+
+@patch("src.db.insight_items.batched_update", return_value=42)
+def test_backfill_runs_in_id_batches(batched_update):
+    conn = MagicMock()
+
+    assert insight_items.backfill(conn, batch_size=500) == 42
+
+    sql = batched_update.call_args.args[1]
+    assert "%(lo)s" in sql and "%(hi)s" in sql and "NOT EXISTS" in sql
+    assert batched_update.call_args.args[2] == "insights"
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from src.db import mention_bodies
+from src.scheduler.poll import insert_mention
+from tests.conftest import require_tables
+
+
+def test_deleting_a_query_cascades_to_mention_bodies(pg):
+    with pg.cursor() as cur:
+        require_tables(cur, "mention_bodies")
+        mention_bodies.add_foreign_key(cur)
+        cur.execute("INSERT INTO queries (query) VALUES ('mention-bodies test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        mention_id = insert_mention(cur, {
+            "query_id": query_id, "engine": "gpt-4", "source": None, "sentiment": 0.1, "emotion": None,
+            "confidence": None, "source_title": None, "source_url": None, "created_at": datetime.now(),
+            "summary": None, "key_topics": None, "insight_id": None, "response": "Oreo y Biscoff",
+        })
+        assert mention_bodies.fetch_response(cur, mention_id) == "Oreo y Biscoff"
+
+        cur.execute("DELETE FROM queries WHERE id = %s", (query_id,))
+
+        assert mention_bodies.fetch_response(cur, mention_id) is None
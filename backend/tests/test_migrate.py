@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+
+import psycopg2.errors
+import pytest
+
+from src.db import migrate
+
+
+def _touch(directory, *names):
+    for name in names:
+        (directory / name).write_text("def upgrade(conn):\n    pass\n")
+
+
+def test_discover_orders_by_numeric_version(tmp_path):
+    _touch(tmp_path, "migrate_v10_search.py", "migrate_v2_extend.py", "migrate_v9_brands.py", "app.py")
+
+    migrations = migrate.discover(str(tmp_path))
+
+    assert [(m.version, m.name) for m in migrations] == [(2, "extend"), (9, "brands"), (10, "search")]
+    assert migrate.pending(migrations, {2: None}, to=9) == [migrations[1]]
+
+
+def test_discover_rejects_duplicated_versions(tmp_path):
+    _touch(tmp_path, "migrate_v3_a.py", "migrate_v3_b.py")
+
+    with pytest.raises(ValueError):
+        migrate.discover(str(tmp_path))
+
+
+def test_repo_migrations_define_upgrade():
+    migrations = migrate.discover()
+
+    assert migrations[0].version == 1
+    assert all(callable(migrate.load(m)) for m in migrations)
+
+
+@patch("src.db.migrate.time.sleep")
+def test_batched_update_commits_each_batch_and_retries_locks(sleep):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (1, 25)
+    cur.rowcount = 10
+    statements = []
+
+    def execute(sql, params=None):
+        statements.append(params)
+        if params == {"lo": 11, "hi": 21} and statements.count(params) == 1:
+            raise psycopg2.errors.LockNotAvailable()
+
+    cur.execute.side_effect = execute
+
+    total = migrate.batched_update(conn, "UPDATE t SET x = 1 WHERE id >= %(lo)s AND id < %(hi)s", "t",
+                                   batch_size=10, pause=0)
+
+    batches = [p for p in statements if p]
+    assert batches == [{"lo": 1, "hi": 11}, {"lo": 11, "hi": 21}, {"lo": 11, "hi": 21}, {"lo": 21, "hi": 31}]
+    assert total == 30
+    assert conn.rollback.call_count == 1
+    assert conn.commit.call_count == 4  # MIN/MAX + 3 lotes
+    sleep.assert_called_once_with(1)
+
+
+def test_time_window_report_formats_missing_execution_time(tmp_path, monkeypatch):
+    import migrate_v5_add_time_window_indexes as migrate_v5
+
+    monkeypatch.chdir(tmp_path)
+    before = {"/api/mentions": (None, "plan sin tiempo")}
+    after = {"/api/mentions": (1.234, "plan")}
+
+    with open(migrate_v5.write_report(before, after), encoding="utf-8") as f:
+        report = f.read()
+
+    assert "/api/mentions" in report and "           -           1.23" in report
+    assert migrate_v5.format_ms(None) == "-"
@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+from src.db import partitions
+
+
+def test_add_months_crosses_year():
+    assert partitions.add_months(date(2025, 11, 1), 1) == date(2025, 12, 1)
+    assert partitions.add_months(date(2025, 12, 1), 1) == date(2026, 1, 1)
+    assert partitions.add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name():
+    assert partitions.partition_name("mentions", date(2025, 9, 1)) == "mentions_y2025m09"
+    assert partitions.month_start(datetime(2025, 9, 17, 10, 30)) == date(2025, 9, 1)
+
+
+def test_ensure_is_noop_on_regular_table():
+    cur = MagicMock()
+    cur.fetchone.return_value = ("r",)
+
+    assert partitions.ensure_monthly_partitions(cur, "mentions") == []
+    assert cur.execute.call_count == 1
+
+
+def test_citations_follow_their_mentions_on_cascading_delete(pg):
+    with pg.cursor() as cur:
+        partitions.install_citations_cleanup(cur)
+        cur.execute("INSERT INTO queries (query) VALUES ('citations test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        cur.execute(
+            "INSERT INTO mentions (query_id, engine, created_at) VALUES (%s, 'gpt-4', NOW()), (%s, 'claude', NOW()) "
+            "RETURNING id",
+            (query_id, query_id),
+        )
+        mention_ids = [row[0] for row in cur.fetchall()]
+        for mention_id in mention_ids:
+            cur.execute("INSERT INTO citations (mention_id, title, url) VALUES (%s, 'Oreo', 'https://oreo.com')",
+                        (mention_id,))
+
+        cur.execute("DELETE FROM queries WHERE id = %s", (query_id,))
+
+        cur.execute("SELECT COUNT(*) FROM citations WHERE mention_id = ANY(%s)", (mention_ids,))
+        assert cur.fetchone()[0] == 0
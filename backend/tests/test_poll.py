@@ -9,8 +9,9 @@ from src.scheduler import poll
 @patch("src.scheduler.poll.analyze_sentiment")
 @patch("src.scheduler.poll.extract_insights")
 @patch("src.scheduler.poll.send_slack_alert")
+@patch("src.scheduler.poll.load_brand_matchers", return_value={})
 def test_poll_main_loop(
-    mock_slack, mock_extract, mock_analyze, mock_serp, mock_pplx, mock_gpt, mock_connect
+    mock_brands, mock_slack, mock_extract, mock_analyze, mock_serp, mock_pplx, mock_gpt, mock_connect
 ):
     # Simular respuesta de los motores
     mock_gpt.return_value = "Texto generado por GPT"
@@ -0,0 +1,73 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.db import ranking
+
+
+def test_comparison_periods():
+    start, end = date(2025, 3, 1), date(2025, 3, 31)
+
+    assert ranking.comparison_period(start, end) == (date(2025, 1, 29), date(2025, 2, 28))
+    assert ranking.comparison_period(start, end, "wow") == (date(2025, 2, 22), date(2025, 3, 24))
+    # El 31 de febrero no existe: se ajusta al último día del mes.
+    assert ranking.comparison_period(start, end, "mom") == (date(2025, 2, 1), date(2025, 2, 28))
+    assert ranking.comparison_period(start, end, "custom", date(2024, 3, 1), date(2024, 3, 31)) == (
+        date(2024, 3, 1), date(2024, 3, 31))
+    assert ranking.shift_months(date(2025, 1, 15), -1) == date(2024, 12, 15)
+
+
+@pytest.mark.parametrize("compare, compare_from, compare_to", [
+    ("yoy", None, None),
+    ("custom", date(2025, 1, 1), None),
+    ("custom", date(2025, 2, 1), date(2025, 1, 1)),
+])
+def test_comparison_period_rejects_invalid_input(compare, compare_from, compare_to):
+    with pytest.raises(ValueError):
+        ranking.comparison_period(date(2025, 3, 1), date(2025, 3, 31), compare, compare_from, compare_to)
+
+
+def test_fetch_ranking_keeps_ties_and_new_brands():
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        ("Oreo", 30, 0.5, 20, 0.25, 1, 2, 4),
+        ("Nabisco", 30, 0.1, 40, None, 1, 1, 4),
+        ("Keebler", 10, None, 0, None, 3, None, 4),
+    ]
+    params = ranking.period_params(date(2025, 3, 1), date(2025, 3, 31), "mom", limit=2)
+
+    rows, found = ranking.fetch_ranking(cur, params, " AND brand = %(brand)s")
+
+    assert found == 4 and [row["rank"] for row in rows] == [1, 1, 3]
+    assert rows[0]["delta"] == 50.0 and rows[0]["rank_change"] == 1
+    assert rows[1]["delta"] == -25.0 and rows[1]["rank_change"] == 0
+    assert rows[2]["previous_rank"] is None and rows[2]["rank_change"] is None and rows[2]["delta"] == 100.0
+    sql, sent = cur.execute.call_args[0]
+    assert cur.execute.call_count == 1 and "WHERE current_mentions > 0 AND brand = %(brand)s" in sql
+    assert sent["previous_start"] == date(2025, 2, 1) and sent["limit"] == 2
+
+
+def test_brand_filter_keeps_the_market_position(pg):
+    with pg.cursor() as cur:
+        cur.execute("""
+            CREATE TEMP TABLE ranking_cumulative (day DATE, brand TEXT, mentions BIGINT,
+                                                  sentiment_sum DOUBLE PRECISION, sentiment_count BIGINT)
+        """)
+        # Acumulados al 31/01 (fin del periodo anterior) y al 28/02 (fin del actual).
+        cur.execute("""
+            INSERT INTO ranking_cumulative VALUES
+                ('2025-01-31', 'Oreo', 10, 5, 10), ('2025-02-28', 'Oreo', 40, 20, 40),
+                ('2025-01-31', 'Nabisco', 30, 3, 30), ('2025-02-28', 'Nabisco', 50, 5, 50),
+                ('2025-01-31', 'Keebler', 20, 0, 20), ('2025-02-28', 'Keebler', 25, 0, 25)
+        """)
+        params = ranking.period_params(date(2025, 2, 1), date(2025, 2, 28), "custom",
+                                       date(2025, 1, 1), date(2025, 1, 31), limit=1)
+        params["brand"] = "Keebler"
+
+        rows, found = ranking.fetch_ranking(cur, params, " AND brand = %(brand)s", table="ranking_cumulative")
+
+    assert found == 3 and len(rows) == 1
+    keebler = rows[0]
+    assert (keebler["brand"], keebler["rank"], keebler["previous_rank"]) == ("Keebler", 3, 2)
+    assert (keebler["mentions"], keebler["previous_mentions"], keebler["rank_change"]) == (5, 20, -1)
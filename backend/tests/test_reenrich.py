@@ -0,0 +1,119 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from src.scheduler import reenrich
+
+ROWS = [
+    reenrich.Row(1, datetime(2025, 9, 1), 7, "gpt-4", None, "texto uno"),
+    reenrich.Row(2, datetime(2025, 9, 2), 7, "serpapi", 40, "texto dos"),
+]
+
+
+@patch("src.scheduler.reenrich.analyze_sentiment")
+def test_enrich_row_rejects_fallback_values(analyze):
+    limiter = reenrich.RateLimiter(None)
+
+    analyze.return_value = (0.4, "alegría", 0.9)
+    assert reenrich.enrich_row(ROWS[0], ["sentiment"], limiter) == {"sentiment": (0.4, "alegría", 0.9)}
+
+    # analyze_sentiment devuelve confidence 0.0 cuando el modelo falla.
+    analyze.return_value = (0.0, "neutral", 0.0)
+    assert reenrich.enrich_row(ROWS[0], ["sentiment"], limiter) is None
+
+    analyze.side_effect = RuntimeError("rate limit")
+    assert reenrich.enrich_row(ROWS[0], ["sentiment"], limiter) is None
+
+
+@patch("src.scheduler.reenrich.execute_values")
+def test_write_results_updates_in_bulk_and_links_new_insights(execute_values):
+    execute_values.return_value = [(99,)]
+    results = [
+        {"sentiment": (0.1, "neutral", 0.8), "insights": {"brands": []}},
+        {"sentiment": (-0.5, "enojo", 0.7), "insights": {"brands": ["x"]}},
+    ]
+
+    reenrich.write_results(MagicMock(), ROWS, results)
+
+    statements = [call.args[1] for call in execute_values.call_args_list]
+    assert len(statements) == 4
+    assert "UPDATE mentions m SET sentiment" in statements[0]
+    assert execute_values.call_args_list[0].args[2] == [
+        (1, datetime(2025, 9, 1), 0.1, "neutral", 0.8), (2, datetime(2025, 9, 2), -0.5, "enojo", 0.7),
+    ]
+    assert "UPDATE insights" in statements[1]
+    assert execute_values.call_args_list[1].args[2] == [(40, '{"brands": ["x"]}')]
+    assert "INSERT INTO insights" in statements[2]
+    assert execute_values.call_args_list[3].args[2] == [(1, datetime(2025, 9, 1), 99)]
+
+
+def test_estimate_cost_uses_model_prices():
+    cur = MagicMock()
+    cur.fetchone.side_effect = [(True,), (1000, 2_000_000, 4_000_000)]
+
+    estimate = reenrich.estimate_cost(cur, ["sentiment", "insights"], {"engine": "gpt-4"})
+
+    assert estimate["mentions"] == 1000
+    sentiment = estimate["enrichments"]["sentiment"]
+    assert sentiment["input_tokens"] == 2_000_000 // 4 + 120 * 1000
+    assert estimate["enrichments"]["insights"]["input_tokens"] == 4_000_000 // 4 + 650 * 1000
+    assert sentiment["usd"] == 0.37  # 620k × $0.50 + 40k × $1.50 por millón
+    assert estimate["usd"] == 16.5
+    assert "m.engine = %(engine)s" in cur.execute.call_args.args[0]
+
+
+@patch("src.scheduler.reenrich.summarize_and_extract_topics")
+def test_summary_without_topics_is_kept_but_model_errors_are_not(summarize):
+    limiter = reenrich.RateLimiter(None)
+
+    summarize.return_value = ("Respuesta sin marcas ni temas", [])
+    assert reenrich.enrich_row(ROWS[0], ["summary"], limiter) == {"summary": ("Respuesta sin marcas ni temas", [])}
+    assert summarize.call_args.kwargs == {"raise_errors": True}
+
+    summarize.side_effect = ValueError("JSON inválido")
+    assert reenrich.enrich_row(ROWS[0], ["summary"], limiter) is None
+
+
+def test_failures_are_recorded_and_cleared_on_success(pg):
+    with pg.cursor() as cur:
+        reenrich.install(cur)
+        reenrich.start_job(cur, "test-failures", ["summary"], {})
+
+        reenrich.record_failures(cur, "test-failures", ROWS, [None, None])
+        reenrich.record_failures(cur, "test-failures", ROWS, [{"summary": ("s", [])}, None])
+
+        cur.execute("SELECT mention_id, attempts FROM enrichment_job_failures WHERE job = 'test-failures'")
+        assert cur.fetchall() == [(2, 2)]
+        # Reiniciar el job vacía su lista.
+        reenrich.start_job(cur, "test-failures", ["summary"], {})
+        cur.execute("SELECT COUNT(*) FROM enrichment_job_failures WHERE job = 'test-failures'")
+        assert cur.fetchone()[0] == 0
+
+
+@patch("src.scheduler.reenrich.industry_views")
+@patch("src.scheduler.reenrich.data_version")
+@patch("src.scheduler.reenrich.checkpoint")
+@patch("src.scheduler.reenrich.record_failures")
+@patch("src.scheduler.reenrich.write_results")
+@patch("src.scheduler.reenrich.enrich_row")
+@patch("src.scheduler.reenrich.mention_bodies.response_source", return_value=("mentions m", "m.response"))
+@patch("src.scheduler.reenrich.load_job")
+def test_retry_failed_reads_the_failure_list_and_keeps_the_checkpoint(
+        load_job, _source, enrich_row, _write, record_failures, checkpoint, _version, _views):
+    load_job.return_value = {"enrichments": ["summary"], "filters": {}, "last_id": 500,
+                             "processed": 480, "failed": 2, "finished_at": datetime(2025, 9, 3)}
+    enrich_row.side_effect = lambda row, enrichments, limiter: None if row.id == 2 else {"summary": ("s", [])}
+    read_conn, write_conn = MagicMock(), MagicMock()
+    stream = read_conn.cursor.return_value
+    stream.fetchmany.side_effect = [ROWS, []]
+
+    totals = reenrich.run(read_conn, write_conn, "sentiment-v2", retry_failed=True)
+
+    sql, params = stream.execute.call_args.args
+    assert "JOIN enrichment_job_failures f" in sql and "m.id > %(last_id)s" not in sql
+    assert params["job"] == "sentiment-v2"
+    assert record_failures.call_count == 1
+    # El checkpoint no se mueve y la recuperada deja de contar como fallida.
+    assert checkpoint.call_args.args[2:5] == (None, 1, -1)
+    assert totals == {"processed": 1, "failed": 1}
+    cur = write_conn.cursor.return_value.__enter__.return_value
+    assert not any("finished_at" in c.args[0] for c in cur.execute.call_args_list)
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+from werkzeug.datastructures import MultiDict
+
+from src.db import data_version
+from src.utils.response_cache import ResponseCache
+
+
+def test_key_normalizes_parameter_order():
+    a = ResponseCache.key("/api/mentions", MultiDict([("range", "7d"), ("limit", "50")]))
+    b = ResponseCache.key("/api/mentions", MultiDict([("limit", "50"), ("range", "7d")]))
+    assert a == b == "/api/mentions?limit=50&range=7d"
+    assert ResponseCache.key("/api/dashboard-kpis", MultiDict()) == "/api/dashboard-kpis"
+
+
+def test_entries_are_served_only_for_their_version():
+    cache = ResponseCache(max_entries=2, version_check_interval=60)
+    assert cache.version(lambda: 1) == 1
+    assert cache.get("k", 1) is None
+    cache.put("k", 1, b"{}", "application/json", compute_ms=12.0)
+
+    assert cache.get("k", 1).body == b"{}"
+    cache.set_version(2)  # p. ej. tras un bump de la propia API
+    assert cache.get("k", 2) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["saved_ms"]) == (1, 2, 12.0)
+
+
+def test_version_is_checked_at_most_once_per_interval_and_lru_evicts():
+    cache = ResponseCache(max_entries=2, version_check_interval=60)
+    load = MagicMock(return_value=5)
+    cache.version(load)
+    cache.version(load)
+    assert load.call_count == 1
+
+    for key in ("a", "b", "c"):
+        cache.put(key, 5, b"1", "application/json", compute_ms=1.0)
+    assert cache.get("a", 5) is None and cache.get("c", 5) is not None
+
+
+def test_lagging_replica_cannot_move_the_version_back():
+    cache = ResponseCache(max_entries=2, version_check_interval=0)
+    assert cache.version(lambda: 7) == 7
+    cache.set_version(8)  # escritura de la API en la primaria
+    cache.put("k", 8, b"{}", "application/json", compute_ms=1.0)
+
+    # La réplica todavía no ve el bump: la versión y la entrada se mantienen.
+    assert cache.version(lambda: 7) == 8
+    assert cache.get("k", 8) is not None
+    # Sin data_version no se cachea, y tampoco se vuelve atrás después.
+    assert cache.version(lambda: None) is None
+    assert cache.version(lambda: 7) is None
+    assert cache.version(lambda: 9) == 9
+
+
+def test_bump_is_a_noop_without_the_migration():
+    cur = MagicMock()
+    cur.fetchone.return_value = (False,)
+    assert data_version.bump(cur, "poll") is None
+    assert cur.execute.call_count == 1
+
+
+def test_window_end_is_stable_within_a_bucket():
+    from datetime import datetime
+
+    from app import window_end
+
+    assert window_end(datetime(2026, 10, 19, 10, 0, 5)) == window_end(datetime(2026, 10, 19, 10, 0, 59))
+    assert window_end(datetime(2026, 10, 19, 10, 0, 0)) == datetime(2026, 10, 19, 10, 0, 0)
+
+
+def test_conditional_get_returns_304_without_touching_the_database(monkeypatch):
+    from datetime import datetime
+
+    import app as api
+
+    monkeypatch.setattr(api, "response_cache", ResponseCache(max_entries=0, version_check_interval=60))
+    monkeypatch.setattr(api, "load_data_version", lambda: 7)
+    monkeypatch.setattr(api, "window_end", lambda now=None: datetime(2026, 10, 19, 10, 1))
+    monkeypatch.setattr(api, "get_db_connection", MagicMock(side_effect=AssertionError("sin base de datos")))
+    with api.app.test_request_context("/api/queries?fields=id"):
+        etag = api.response_etag(7, api.request_cache_key())
+
+    response = api.app.test_client().get("/api/queries?fields=id", headers={"If-None-Match": f'"{etag}"'})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{etag}"'
+    assert response.headers["Cache-Control"] == api.CACHE_CONTROL
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.db import rollups
+
+
+def test_choose_granularity():
+    now = datetime(2025, 9, 1)
+    assert rollups.choose_granularity(now - timedelta(hours=24), now) == "hour"
+    assert rollups.choose_granularity(now - timedelta(days=7), now) == "hour"
+    assert rollups.choose_granularity(now - timedelta(days=30), now) == "day"
+
+
+def test_window_bounds_reads_whole_buckets_from_rollups_and_edges_from_mentions():
+    start, end = datetime(2025, 9, 1, 10, 30), datetime(2025, 9, 2, 9, 15)
+
+    bounds = rollups.window_bounds(start, end, "hour")
+
+    # Half-open: 11:00 es el primer bucket entero y el de las 9:00 es borde.
+    assert bounds == {"start": start, "end": end,
+                      "first": datetime(2025, 9, 1, 11), "stop": datetime(2025, 9, 2, 9)}
+    assert rollups.window_bounds(start, end, "week")["first"] == start  # todo es borde
+    assert rollups.bucket_start(datetime(2025, 9, 3, 8, 5), "week") == datetime(2025, 9, 1)
+
+
+def test_fetch_totals_window_not_starting_on_a_bucket_boundary():
+    cur = MagicMock()
+    cur.fetchone.return_value = (3, 0.0, 0, 0, 0)
+    start, end = datetime(2025, 9, 1, 10, 30), datetime(2025, 9, 1, 13, 0)
+
+    rollups.fetch_totals(cur, start, end)
+
+    sql, params = cur.execute.call_args[0]
+    assert "bucket >= %(first)s AND bucket < %(stop)s" in sql
+    assert "created_at >= %(start)s AND created_at < %(first)s" in sql
+    assert "created_at >= %(stop)s AND created_at <= %(end)s" in sql
+    assert (params["first"], params["stop"]) == (datetime(2025, 9, 1, 11), datetime(2025, 9, 1, 13))
+
+
+def test_fetch_totals_averages_from_sums():
+    cur = MagicMock()
+    cur.fetchone.return_value = (10, 3.0, 6, 4, 2)
+    now = datetime(2025, 9, 1)
+
+    totals = rollups.fetch_totals(cur, now - timedelta(days=1), now, engine="gpt-4")
+
+    assert totals == {"mentions": 10, "avg_sentiment": 0.5, "positive": 4, "negative": 2}
+    sql, params = cur.execute.call_args[0]
+    assert sql.count("AND engine = %(engine)s") == 2
+    assert params["granularity"] == "hour" and params["engine"] == "gpt-4"
+
+
+def test_fetch_totals_without_sentiment():
+    cur = MagicMock()
+    cur.fetchone.return_value = (0, 0, 0, 0, 0)
+    now = datetime(2025, 9, 1)
+
+    assert rollups.fetch_totals(cur, now - timedelta(days=30), now)["avg_sentiment"] == 0.0
+
+
+def test_fetch_window_totals_reads_rollups_once():
+    cur = MagicMock()
+    cur.fetchone.return_value = (10, 3.0, 6, 4, 2) + (70, 0, 0, 20, 9)
+    now = datetime(2025, 9, 1)
+
+    totals = rollups.fetch_window_totals(cur, {"day": (now - timedelta(days=1), now), "week": (now - timedelta(days=7), now)})
+
+    assert totals["day"] == {"mentions": 10, "avg_sentiment": 0.5, "positive": 4, "negative": 2}
+    assert totals["week"] == {"mentions": 70, "avg_sentiment": 0.0, "positive": 20, "negative": 9}
+    assert cur.execute.call_count == 1
+    sql, params = cur.execute.call_args[0]
+    assert sql.count("FILTER") == 10
+    # Rollups de la unión de las ventanas (ambas acaban en un bucket exacto).
+    assert params["first"] == now - timedelta(days=7) and params["stop"] == now
+    assert params["start_0"] == now - timedelta(days=1) and params["end_1"] == now
+
+
+def test_skip_in_transaction_sets_a_local_setting_checked_by_the_trigger():
+    cur = MagicMock()
+
+    rollups.skip_in_transaction(cur)
+
+    sql, params = cur.execute.call_args[0]
+    assert sql == "SELECT set_config(%s, 'on', true)" and params == (rollups.SKIP_SETTING,)
+    assert f"current_setting('{rollups.SKIP_SETTING}', true) = 'on'" in rollups.SCHEMA_SQL
+
+
+def test_triggers_cover_insert_update_and_delete_with_signed_rows():
+    for event in ("insert", "update", "delete"):
+        assert f"AFTER {event.upper()} ON mentions" in rollups.SCHEMA_SQL
+        assert f"mention_rollups_after_{event}()" in rollups.SCHEMA_SQL
+    assert "-1 AS sign FROM old_rows o" in rollups.SIGNED_SOURCES["delete"]
+    # Un UPDATE solo mueve las filas que cambian columnas de los rollups.
+    assert "IS DISTINCT FROM" in rollups.SIGNED_SOURCES["update"]
+    assert "m.status = 'active'" in rollups.AGGREGATE_SQL
+
+
+def test_rebuild_only_touches_buckets_wholly_inside_the_range():
+    cur = MagicMock()
+    since, until = datetime(2025, 8, 1), datetime(2025, 9, 1)
+
+    rollups.rebuild(cur, since=since, until=until)
+
+    statements = [c.args for c in cur.execute.call_args_list]
+    assert statements[0][0] == "LOCK TABLE mentions IN SHARE MODE"
+    delete_sql, params = statements[1]
+    assert delete_sql == ("DELETE FROM mention_rollups WHERE TRUE AND bucket >= %(since)s "
+                          "AND bucket + ('1 ' || granularity)::interval <= %(until)s")
+    assert params == {"since": since, "until": until}
+    sql, _params = statements[2]
+    assert "1 AS sign FROM mentions m" in sql and "m.status = 'active'" in sql
+    assert "date_trunc(g.granularity, m.created_at) >= %(since)s" in sql
+
+
+def test_rebuild_keeps_buckets_that_start_before_since(pg):
+    from tests.conftest import require_tables
+
+    with pg.cursor() as cur:
+        require_tables(cur, "mention_rollups")
+        cur.execute("SELECT MIN(created_at) FROM mentions")
+        oldest = cur.fetchone()[0] or datetime(2025, 9, 1)
+        # Un miércoles: su semana empieza antes de `since` y no se puede recalcular.
+        since = datetime.combine(oldest.date(), datetime.min.time()) + timedelta(days=7)
+        since += timedelta(days=(2 - since.weekday()) % 7)
+        cur.execute("INSERT INTO queries (query) VALUES ('rollups test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        cold = [("week", rollups.bucket_start(since, "week")), ("day", since - timedelta(days=1))]
+        for granularity, bucket in cold:
+            cur.execute("""
+                INSERT INTO mention_rollups (granularity, bucket, query_id, engine, mention_count)
+                VALUES (%s, %s, %s, 'archivado', 7)
+            """, (granularity, bucket, query_id))
+
+        rollups.rebuild(cur, since=since)
+
+        cur.execute("SELECT granularity, bucket FROM mention_rollups WHERE query_id = %s ORDER BY 1 DESC",
+                    (query_id,))
+        assert cur.fetchall() == cold
+        cur.execute("""
+            SELECT date_trunc('day', created_at), COUNT(*) FROM mentions
+            WHERE created_at >= %(since)s AND status = 'active' GROUP BY 1
+            EXCEPT
+            SELECT bucket, SUM(mention_count) FROM mention_rollups
+            WHERE granularity = 'day' AND bucket >= %(since)s GROUP BY 1
+        """, {"since": since})
+        assert cur.fetchall() == []
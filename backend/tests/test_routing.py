@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+from src.db.routing import ReplicaRouter
+
+PRIMARY = {"host": "primary", "database": "ai_visibility"}
+REPLICA = "postgresql://replica/ai_visibility"
+
+
+def replica_conn(*fetchone):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value.fetchone.side_effect = list(fetchone)
+    return conn
+
+
+@patch("src.db.routing.psycopg2.connect")
+def test_reads_go_to_replica_and_writes_to_primary(connect):
+    replica = replica_conn((0.4,))
+    connect.side_effect = lambda *args, **kwargs: replica if args == (REPLICA,) else MagicMock()
+    router = ReplicaRouter(PRIMARY, REPLICA, max_lag=5)
+
+    assert router.connect(read_only=True)[1] == "replica"
+    assert router.connect(read_only=False)[1] == "primary"
+    assert ReplicaRouter(PRIMARY).connect(read_only=True)[1] == "primary"
+    assert router.status() == {"replica": "ok", "lag_seconds": 0.4, "max_lag_seconds": 5}
+
+
+@patch("src.db.routing.psycopg2.connect")
+def test_lagging_or_down_replica_falls_back_to_primary(connect):
+    connect.side_effect = lambda *args, **kwargs: replica_conn((12.0,)) if args == (REPLICA,) else MagicMock()
+    router = ReplicaRouter(PRIMARY, REPLICA, max_lag=5, check_interval=60)
+
+    assert router.connect(read_only=True)[1] == "primary"
+    # Hasta la siguiente comprobación ni se intenta conectar a la réplica.
+    connect.reset_mock()
+    assert router.connect(read_only=True)[1] == "primary"
+    assert connect.call_args_list == [((), PRIMARY)]
+    assert router.status()["replica"] == "lagging"
+
+    def refuse_replica(*args, **kwargs):
+        if args == (REPLICA,):
+            raise psycopg2.OperationalError("connection refused")
+        return MagicMock()
+
+    down = ReplicaRouter(PRIMARY, REPLICA)
+    connect.side_effect = refuse_replica
+    assert down.connect(read_only=True)[1] == "primary"
+    assert down.status() == {"replica": "down"}
+
+
+@patch("src.db.routing.psycopg2.connect")
+def test_pinned_endpoint_reads_primary_until_replica_catches_up(connect):
+    router = ReplicaRouter(PRIMARY, REPLICA, check_interval=60)
+    primary = replica_conn(("0/3A016450",))
+    router.note_write(primary, ["get_mentions"])
+
+    connect.side_effect = [replica_conn((0.0,), (False,)), MagicMock()]
+    assert router.connect(read_only=True, endpoint="get_mentions")[1] == "primary"
+    connect.side_effect = [replica_conn((True,))]
+    assert router.connect(read_only=True, endpoint="get_mentions")[1] == "replica"
+    # Alcanzada la escritura, el pin desaparece.
+    connect.side_effect = [replica_conn()]
+    assert router.connect(read_only=True, endpoint="get_mentions")[1] == "replica"
+
+
+@patch("src.db.routing.ThreadedConnectionPool")
+def test_pooled_connections_are_reused_per_route(pool_class):
+    pool = pool_class.return_value
+    conn = pool.getconn.return_value
+    conn.closed = 0
+    router = ReplicaRouter(PRIMARY, pool_size=3)
+
+    assert router.choose(read_only=True) == "primary"
+    for _ in range(2):
+        with router.pooled("primary") as pooled:
+            assert pooled is conn
+
+    pool_class.assert_called_once_with(0, 3, **PRIMARY)
+    assert conn.rollback.call_count == 2
+    pool.putconn.assert_called_with(conn, close=False)
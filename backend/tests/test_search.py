@@ -0,0 +1,59 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.db import search
+from src.utils.pagination import decode_cursor, decode_keyset, encode_cursor
+
+
+def test_cursor_roundtrip():
+    position = [0.05000000074505806, "2025-09-01T10:00:00.123456", 9633]
+    assert decode_cursor(encode_cursor(position)) == position
+    assert encode_cursor(None) is None and decode_cursor("") is None
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
+
+
+def test_decode_keyset_converts_and_rejects_bad_positions():
+    cursor = encode_cursor(["2025-09-01T10:00:00", 7])
+    assert decode_keyset(cursor, datetime.fromisoformat, int) == (datetime(2025, 9, 1, 10), 7)
+    assert decode_keyset(None, datetime.fromisoformat, int) is None
+
+    for position in (["2025-09-01T10:00:00"], [123, 7], ["2025-09-01T10:00:00", None], ["ayer", 7]):
+        with pytest.raises(ValueError, match="cursor inválido"):
+            decode_keyset(encode_cursor(position), datetime.fromisoformat, int)
+
+
+def test_tsquery_uses_constant_configs():
+    assert search.build_tsquery_sql("es") == "websearch_to_tsquery('spanish', %(q)s)"
+    combined = search.build_tsquery_sql()
+    assert all(f"'{config}'" in combined for config in search.SEARCH_CONFIGS)
+
+
+def test_search_returns_next_position_on_full_page():
+    created_at = datetime(2025, 9, 1, 10, 0)
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        (7, created_at, "gpt-4", 0.4, "resumen", None, "best cookies", 0.2, "<mark>oreo</mark>"),
+    ]
+
+    results, next_after = search.search_mentions(cur, "oreo", limit=1, after=(0.3, "2025-09-02T00:00:00", 9))
+
+    assert results[0]["highlight"] == "<mark>oreo</mark>"
+    assert next_after == (0.2, created_at.isoformat(), 7)
+    params = cur.execute.call_args[0][1]
+    assert params["after_id"] == 9
+
+
+def test_estimate_count_reads_plan_rows():
+    from src.utils.pagination import estimate_count
+
+    cur = MagicMock()
+    cur.fetchone.return_value = ([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}],)
+
+    assert estimate_count(cur, "SELECT 1 FROM mentions m WHERE m.status = %(status)s", {"status": "active"}) == 1234
+    assert cur.execute.call_args[0][0].startswith("EXPLAIN (FORMAT JSON) SELECT 1")
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.db import topics
+from tests.conftest import empty_month, require_tables
+
+
+def test_bucket_ranges_cover_window_with_weeks_and_edge_days():
+    # Jueves 2 de enero a domingo 30 de marzo de 2025.
+    start, end = datetime(2025, 1, 2, 15, 30), datetime(2025, 3, 30, 18)
+
+    ranges = topics.bucket_ranges(start, end)
+
+    assert ranges == [
+        ("day", datetime(2025, 1, 2), datetime(2025, 1, 6)),
+        ("week", datetime(2025, 1, 6), datetime(2025, 3, 24)),
+        ("day", datetime(2025, 3, 24), end),
+    ]
+    # Hasta 7 días, horas; sin una semana completa dentro, solo días.
+    assert topics.bucket_ranges(end - timedelta(days=7), end) == [("hour", datetime(2025, 3, 23, 18), end)]
+    assert topics.bucket_ranges(datetime(2025, 3, 19), datetime(2025, 3, 28)) == [
+        ("day", datetime(2025, 3, 19), datetime(2025, 3, 28))
+    ]
+
+
+def test_fetch_topics_splits_words_and_themes():
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        ("word", "Galleta", 12, 40),
+        ("word", "café", 7, 40),
+        ("theme", "Precio", 5, 3),
+    ]
+    now = datetime(2025, 9, 3, 12)
+
+    data = topics.fetch_topics(cur, now - timedelta(days=90), now, words=2)
+
+    assert data == {
+        "words": [{"text": "Galleta", "value": 12}, {"text": "café", "value": 7}],
+        "themes": [{"name": "Precio", "count": 5}],
+        "words_found": 40, "themes_found": 3,
+    }
+    sql, params = cur.execute.call_args[0]
+    assert cur.execute.call_count == 1 and sql.count("granularity = ") == 3
+    assert params["words"] == 2 and params["granularity_1"] == "week"
+
+
+def test_triggers_keep_rollups_equal_to_a_recomputation(pg):
+    with pg.cursor() as cur:
+        require_tables(cur, "topic_rollups")
+        month = empty_month(cur, "insights", "insight_items")
+        times = {"t1": month + timedelta(hours=9), "t2": month + timedelta(days=3, hours=4),
+                 "t3": month + timedelta(days=9, hours=2)}
+        cur.execute("""
+            INSERT INTO insights (payload, created_at) VALUES
+                ('{"topic_frequency": {"Galleta": 2, "café ": 1}, "top_themes": ["Precio"]}', %(t1)s),
+                ('{"topic_frequency": {"galleta": 3}, "top_themes": ["precio", ""]}', %(t2)s),
+                ('{"topic_frequency": {"Cafe": 4}}', %(t3)s)
+            RETURNING id
+        """, times)
+        ids = [row[0] for row in cur.fetchall()]
+        cur.execute("""UPDATE insights SET payload = '{"topic_frequency": {"Galleta": 5}}', created_at = %s
+                       WHERE id = %s""", (month + timedelta(days=10), ids[0]))
+        cur.execute("DELETE FROM insights WHERE id = %s", (ids[1],))
+
+        cur.execute(topics.TABLE_SQL.format(table="expected_rollups", table_labels="expected_labels")
+                    .replace("CREATE TABLE", "CREATE TEMP TABLE"))
+        cur.execute(topics.upsert_sql(
+            "SELECT payload, created_at, 1 AS sign FROM insights WHERE created_at >= %(since)s AND created_at < %(until)s",
+            table="expected_rollups",
+        ), {"since": month, "until": month + timedelta(days=28)})
+        rollups = {}
+        for table in ("topic_rollups", "expected_rollups"):
+            cur.execute(f"""
+                SELECT granularity, bucket, kind, topic, count FROM {table}
+                WHERE bucket >= %(since)s AND bucket < %(until)s AND count <> 0
+                ORDER BY 1, 2, 3, 4
+            """, {"since": month, "until": month + timedelta(days=28)})
+            rollups[table] = cur.fetchall()
+
+    assert rollups["topic_rollups"] == rollups["expected_rollups"]
+    # "Cafe" y "café " comparten clave; el insight actualizado pasó a la segunda semana.
+    assert ("week", month + timedelta(days=7), "word", "cafe", 4) in rollups["topic_rollups"]
+    assert ("week", month + timedelta(days=7), "word", "galleta", 5) in rollups["topic_rollups"]
+    assert not any(row[0] == "week" and row[1] == month for row in rollups["topic_rollups"])
@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.db import visibility
+from tests.conftest import empty_month, require_tables
+
+
+def test_fetch_visibility_splits_grouping_sets():
+    cur = MagicMock()
+    cur.fetchall.return_value = [
+        (visibility.QUERY_ROWS, 7, None, 3, 4, 2),
+        (visibility.QUERY_ROWS, 9, None, 1, 5, 3),
+        (visibility.QUERY_ROWS, 11, None, 0, 0, 1),
+        (visibility.DAY_ROWS, None, date(2025, 9, 1), 4, 9, 5),
+        (visibility.TOTAL_ROW, None, None, 4, 9, 6),
+    ]
+    now = datetime(2025, 9, 2)
+
+    data = visibility.fetch_visibility(cur, now - timedelta(days=30), now)
+
+    assert data["positive"] == 4 and data["total"] == 9 and data["insights"] == 6
+    # La query 11 solo tiene insights sin oportunidades, riesgos ni tendencias.
+    assert data["per_query"] == [(7, 3, 4), (9, 1, 5)]
+    assert data["series"] == [(date(2025, 9, 1), 4, 9)]
+    sql, params = cur.execute.call_args[0]
+    assert "GROUPING SETS" in sql and cur.execute.call_count == 1
+    assert params["granularity"] == "day"
+
+
+def test_triggers_keep_rollups_equal_to_a_recomputation(pg):
+    with pg.cursor() as cur:
+        require_tables(cur, "visibility_rollups")
+        month = empty_month(cur, "insights", "insight_items")
+        cur.execute("INSERT INTO queries (query) VALUES ('visibility rollups test') RETURNING id")
+        query_id = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO insights (query_id, payload, created_at) VALUES
+                (%(q)s, '{"opportunities": ["a", "b"], "risks": ["c"]}', %(t1)s),
+                (%(q)s, '{"trends": ["d", " "]}', %(t1)s),
+                (%(q)s, '{"opportunities": ["e"], "risks": []}', %(t2)s)
+            RETURNING id
+        """, {"q": query_id, "t1": month + timedelta(hours=9, minutes=5), "t2": month + timedelta(days=1, hours=3)})
+        ids = [row[0] for row in cur.fetchall()]
+        # Cambiar el payload y moverlo de día; borrar otro.
+        cur.execute("UPDATE insights SET payload = '{\"risks\": [\"x\", \"y\"]}', created_at = %s WHERE id = %s",
+                    (month + timedelta(days=2, hours=1), ids[0]))
+        cur.execute("DELETE FROM insights WHERE id = %s", (ids[1],))
+
+        cur.execute(visibility.TABLE_SQL.format(table="expected_rollups").replace("CREATE TABLE", "CREATE TEMP TABLE"))
+        cur.execute(visibility.upsert_sql(
+            f"SELECT query_id, payload, created_at, 1 AS sign FROM insights WHERE query_id = {query_id}",
+            table="expected_rollups",
+        ))
+        rollups = {}
+        for table in ("visibility_rollups", "expected_rollups"):
+            cur.execute(f"""
+                SELECT granularity, bucket, opportunities, risks, trends, insights FROM {table}
+                WHERE query_id = %s AND (opportunities, risks, trends, insights) <> (0, 0, 0, 0)
+                ORDER BY 1, 2
+            """, (query_id,))
+            rollups[table] = cur.fetchall()
+
+    assert rollups["visibility_rollups"] == rollups["expected_rollups"]
+    assert ("day", month + timedelta(days=2), 0, 2, 0, 1) in rollups["visibility_rollups"]
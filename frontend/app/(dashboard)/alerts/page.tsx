@@ -89,6 +89,8 @@ export default function AlertsPage() {
     params.set('limit', '100');
     // El backend debería filtrar por un campo "status", aquí simulamos el filtro
     // En una implementación real, sería: params.set('status', view);
+    // El listado no trae el texto completo por defecto; las alertas lo muestran.
+    params.set('include', 'response');
     if (view === 'active') {
        params.set('sentiment', 'negative'); // Filtramos por sentimiento negativo para simular alertas
     }
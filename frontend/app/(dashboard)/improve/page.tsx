@@ -95,7 +95,7 @@ function EnhancedCTASection() {
       mutate(optimisticUpdate, { revalidate: false })
 
       // 2. Enviar al backend
-      const response = await fetch(`/api/insights/${id}`, {
+      const response = await fetch(`/api/insight-items/${id}`, {
         method: "PATCH",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ done: newDoneStatus }),
@@ -127,7 +127,7 @@ function EnhancedCTASection() {
     try {
       // Marcar todas como completadas en paralelo
       const promises = pendingTasks.map(cta => 
-        fetch(`/api/insights/${cta.id}`, {
+        fetch(`/api/insight-items/${cta.id}`, {
           method: "PATCH",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ done: true }),
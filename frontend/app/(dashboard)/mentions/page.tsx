@@ -3,6 +3,7 @@
 "use client"
 import { useMemo, useState } from "react"
 import useSWR from "swr"
+import useSWRInfinite from "swr/infinite"
 import { fetcher } from "@/libs/fetcher"
 import { Mention, Insight } from "@/types"
 import { Card, CardContent } from "@/components/ui/card"
@@ -74,39 +75,58 @@ const MentionCard = ({ mention, onArchive, onUnarchive, isArchivedView }: { ment
     );
 }
 
+const PAGE_SIZE = 50;
+
+type MentionsResponse = {
+    mentions: Mention[];
+    pagination: { limit: number; next_cursor: string | null; has_more: boolean; total: number | null; total_is_estimate: boolean };
+};
+
 export default function MentionsPage() {
     const [view, setView] = useState<'active' | 'archived'>('active');
-    const swrKey = `/api/mentions?status=${view}`;
-    const { data: mentionsData, isLoading, mutate } = useSWR<{ mentions: Mention[] }>(swrKey, fetcher);
+    // Páginas por cursor: cada página trae el cursor de la siguiente.
+    const getKey = (pageIndex: number, previous: MentionsResponse | null) => {
+        if (previous && !previous.pagination?.next_cursor) return null;
+        const cursor = previous ? `&cursor=${previous.pagination.next_cursor}` : '';
+        return `/api/mentions?status=${view}&limit=${PAGE_SIZE}${cursor}`;
+    };
+    const { data: pages, isLoading, isValidating, mutate, size, setSize } = useSWRInfinite<MentionsResponse>(getKey, fetcher);
     
-    const allMentions = useMemo(() => (mentionsData?.mentions || []).filter(m => m && typeof m.id !== 'undefined'), [mentionsData]);
+    const allMentions = useMemo(() => (pages || []).flatMap(page => page.mentions || []).filter(m => m && typeof m.id !== 'undefined'), [pages]);
+    const hasMore = !!pages?.[pages.length - 1]?.pagination?.has_more;
+    const total = pages?.[0]?.pagination?.total;
+
+    const withoutMention = (id: number) => (pages || []).map(page => ({ ...page, mentions: page.mentions.filter(m => m.id !== id) }));
 
     const handleArchive = async (id: number) => {
-        const optimisticData = allMentions.filter(m => m.id !== id);
-        mutate({ mentions: optimisticData }, false);
+        const previous = pages;
+        mutate(withoutMention(id), false);
         try {
             await fetch(`/api/mentions/${id}/archive`, { method: 'PATCH', body: JSON.stringify({ archive: true }), headers: { 'Content-Type': 'application/json' }});
             mutate();
         } catch (error) {
-            mutate({ mentions: allMentions }, false);
+            mutate(previous, false);
         }
     };
 
     const handleUnarchive = async (id: number) => {
-        const optimisticData = allMentions.filter(m => m.id !== id);
-        mutate({ mentions: optimisticData }, false);
+        const previous = pages;
+        mutate(withoutMention(id), false);
         try {
             await fetch(`/api/mentions/${id}/archive`, { method: 'PATCH', body: JSON.stringify({ archive: false }), headers: { 'Content-Type': 'application/json' }});
             mutate();
         } catch (error) {
-            mutate({ mentions: allMentions }, false);
+            mutate(previous, false);
         }
     };
 
     return (
         <div className="space-y-6 p-1 md:p-4 lg:p-8">
             <div className="flex items-center justify-between">
-                <h1 className="text-3xl font-bold">Inbox de Menciones</h1>
+                <h1 className="text-3xl font-bold">
+                    Inbox de Menciones
+                    {typeof total === 'number' && <span className="ml-2 text-base font-normal text-muted-foreground">~{total.toLocaleString()}</span>}
+                </h1>
                 <Tabs value={view} onValueChange={(v) => setView(v as any)}>
                     <TabsList><TabsTrigger value="active">Activas</TabsTrigger><TabsTrigger value="archived">Archivadas</TabsTrigger></TabsList>
                 </Tabs>
@@ -118,6 +138,13 @@ export default function MentionsPage() {
                     ))}
                 </div>
             )}
+            {hasMore && (
+                <div className="flex justify-center">
+                    <Button variant="outline" disabled={isValidating} onClick={() => setSize(size + 1)}>
+                        {isValidating ? 'Cargando...' : 'Cargar más'}
+                    </Button>
+                </div>
+            )}
         </div>
     )
 }
\ No newline at end of file
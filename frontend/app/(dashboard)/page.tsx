@@ -1,7 +1,7 @@
 "use client"
 import useSWR from "swr"
 import { fetcher } from "@/libs/fetcher"
-import type { VisibilityAPI, MentionsResponse } from "@/types"
+import type { VisibilityAPI } from "@/types"
 import { KpiCard } from '@/components/kpi-card'
 import { ChartWrapper } from '@/components/chart-wrapper'
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
@@ -13,7 +13,7 @@ import { MessageSquare, TrendingUp, AlertTriangle, Search } from 'lucide-react'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, AreaChart, ComposedChart, Area } from 'recharts'
 import { HomeToolbar } from '@/components/home-toolbar'
 import { WordCloud } from "@/components/charts/word-cloud"
-import { QuoteCarousel } from "@/components/quote-carousel"
+import { QuoteCarousel, type QuoteItem } from "@/components/quote-carousel"
 import { QueryVisibilityChart } from "@/components/query-visibility-chart"
 import { useEffect, useMemo, useState } from "react"
 
@@ -37,78 +37,47 @@ interface DashboardKPIs {
   queries_delta: number
 }
 
+// Respuesta de /api/dashboard: los widgets con la forma de sus endpoints
+interface DashboardPayload {
+  kpis: DashboardKPIs
+  mention_counts: { "24h": number; "7d": number }
+  visibility: VisibilityAPI
+  topics: TopicsPayload
+  ranking: { ranking: any[] }
+  quotes: QuoteItem[]
+  debug: { db_route: string; workers: number; timings_ms: Record<string, number> }
+}
+
 export default function DashboardPage() {
   // Hook de filtros globales
   const globalFilters = useGlobalFilters()
   const queryParams = buildGlobalQueryParams(globalFilters)
   
-  // SWR con filtros aplicados - TODOS LOS ENDPOINTS REALES
-  const { data: visibility, isLoading: visibilityLoading } = useSWR<VisibilityAPI>(
-    `/api/visibility?${queryParams}`, 
-    fetcher
-  )
-  const { data: topics, isLoading: topicsLoading } = useSWR<TopicsPayload>(
-    `/api/topics?${queryParams}`, 
-    fetcher
-  )
-  
-  // NUEVO: Endpoint específico para KPIs del dashboard
-  const { data: dashboardKPIs, isLoading: kpisLoading } = useSWR<DashboardKPIs>(
-    `/api/dashboard-kpis?${queryParams}`, 
+  // Una sola petición con todos los widgets de la home (ver /api/dashboard en el backend)
+  const { data: dashboard, isLoading } = useSWR<DashboardPayload>(
+    `/api/dashboard?${queryParams}`,
     fetcher
   )
+  const visibility = dashboard?.visibility
+  const topics = dashboard?.topics
+  const dashboardKPIs = dashboard?.kpis
+  const rankingData = dashboard?.ranking
+  const visibilityLoading = isLoading
+  const topicsLoading = isLoading
+  const kpisLoading = isLoading
 
-  // FALLBACK: Obtener menciones para KPIs calculados manualmente (si el endpoint falla)
-  const { data: mentions24h } = useSWR<MentionsResponse>(
-    `/api/mentions?range=24h&limit=1`, 
-    fetcher
-  )
-  const { data: mentionsWeek } = useSWR<MentionsResponse>(
-    `/api/mentions?range=7d&limit=1`, 
-    fetcher
-  )
-
-  // NUEVO: Fetch del endpoint correcto de marcas
-  const { data: rankingData } = useSWR<{ranking: any[]}>(
-    `/api/industry/ranking?${queryParams}`,
-    fetcher
-  )
-
-  // ACTUALIZADO: KPIs reales del backend con fallback manual
   const kpis = useMemo((): DashboardKPIs => {
-    // Priorizar datos del endpoint específico
-    if (dashboardKPIs) {
-      return dashboardKPIs
-    }
-
-    // Fallback: Calcular manualmente si el endpoint no responde
-    const mentions24hCount = mentions24h?.pagination?.total || 0
-    const mentionsWeekCount = mentionsWeek?.pagination?.total || 0
-    const weeklyAvg = mentionsWeekCount / 7
-    const mentions24hDelta = weeklyAvg > 0 ? ((mentions24hCount - weeklyAvg) / weeklyAvg) * 100 : 0
-
-    // Calcular sentimiento positivo de las menciones recientes
-    const recentMentions = mentions24h?.mentions || []
-    const positiveMentions = recentMentions.filter(m => m.sentiment > 0.2).length
-    const positivePercentage = recentMentions.length > 0 ? (positiveMentions / recentMentions.length) * 100 : 0
-    
-    // Delta del sentimiento (comparar con promedio de la semana)
-    const weekMentions = mentionsWeek?.mentions || []
-    const weekPositive = weekMentions.filter(m => m.sentiment > 0.2).length
-    const weekPositivePercentage = weekMentions.length > 0 ? (weekPositive / weekMentions.length) * 100 : 0
-    const sentimentDelta = weekPositivePercentage > 0 ? positivePercentage - weekPositivePercentage : 0
-
-    return {
-      mentions_24h: mentions24hCount,
-      mentions_24h_delta: mentions24hDelta,
-      positive_sentiment: positivePercentage,
-      positive_sentiment_delta: sentimentDelta,
-      alerts_triggered: 0, // Sin datos reales, defaultear a 0
+    return dashboardKPIs ?? {
+      mentions_24h: 0,
+      mentions_24h_delta: 0,
+      positive_sentiment: 0,
+      positive_sentiment_delta: 0,
+      alerts_triggered: 0,
       alerts_delta: 0,
-      active_queries: 0, // Sin datos reales, defaultear a 0
+      active_queries: 0,
       queries_delta: 0
     }
-  }, [dashboardKPIs, mentions24h, mentionsWeek])
+  }, [dashboardKPIs])
 
   // NUEVO: Serie temporal REAL del backend
   const sentimentSeries = useMemo(() => {
@@ -135,7 +104,7 @@ export default function DashboardPage() {
     const realData = {
       visibility: !!visibility && visibility.visibility_score !== undefined,
       topics: !!topics && topics.words && topics.words.length > 0,
-      mentions: !!mentions24h && mentions24h.mentions && mentions24h.mentions.length > 0,
+      mentions: (dashboard?.mention_counts?.["24h"] ?? 0) > 0,
       ranking: !!rankingData && rankingData.ranking && rankingData.ranking.length > 0,
       kpis: !!dashboardKPIs // Nuevo: verificar si KPIs vienen del backend
     }
@@ -148,7 +117,7 @@ export default function DashboardPage() {
       percentage: (realCount / totalCount) * 100,
       isFullyReal: realCount === totalCount
     }
-  }, [visibility, topics, mentions24h, rankingData, dashboardKPIs])
+  }, [visibility, topics, dashboard, rankingData, dashboardKPIs])
 
   return (
     <div className="space-y-6">
@@ -528,7 +497,7 @@ export default function DashboardPage() {
       )}
 
       {/* Quote carousel */}
-      <QuoteCarousel />
+      <QuoteCarousel items={dashboard?.quotes} />
     </div>
   )
 }
\ No newline at end of file
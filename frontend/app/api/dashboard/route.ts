@@ -0,0 +1,14 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { proxyGet } from '@/lib/backend-proxy'
+
+export async function GET(request: NextRequest) {
+  try {
+    return await proxyGet(request, '/api/dashboard')
+  } catch (error) {
+    console.error('Dashboard API Proxy Error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch dashboard data' },
+      { status: 500 }
+    )
+  }
+}
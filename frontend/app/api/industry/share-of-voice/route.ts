@@ -1,28 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server'
-
-const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5050'
+import { proxyGet } from '@/lib/backend-proxy'
 
 export async function GET(request: NextRequest) {
   try {
-    const searchParams = request.nextUrl.searchParams
-    const queryString = searchParams.toString()
-    
-    const response = await fetch(
-      `${API_BASE_URL}/api/industry/share-of-voice${queryString ? `?${queryString}` : ''}`,
-      {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      }
-    )
-    
-    if (!response.ok) {
-      throw new Error(`Backend responded with ${response.status}`)
-    }
-    
-    const data = await response.json()
-    return NextResponse.json(data)
+    return await proxyGet(request, '/api/industry/share-of-voice')
   } catch (error) {
     console.error('Industry SOV API Proxy Error:', error)
     return NextResponse.json(
@@ -0,0 +1,33 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { API_BASE_URL } from '@/lib/backend-proxy'
+
+// Marca un CTA (id de /api/insights?type=cta) como hecho o pendiente.
+export async function PATCH(request: NextRequest, { params }: { params: { id: string } }) {
+  try {
+    const body = await request.json()
+
+    const response = await fetch(
+      `${API_BASE_URL}/api/insight-items/${params.id}`,
+      {
+        method: 'PATCH',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(body)
+      }
+    )
+
+    if (!response.ok) {
+      throw new Error(`Backend responded with ${response.status}`)
+    }
+
+    const data = await response.json()
+    return NextResponse.json(data)
+  } catch (error) {
+    console.error('Insight items PATCH API Proxy Error:', error)
+    return NextResponse.json(
+      { error: 'Failed to update CTA' },
+      { status: 500 }
+    )
+  }
+}
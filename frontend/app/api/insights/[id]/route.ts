@@ -0,0 +1,15 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { proxyGet } from '@/lib/backend-proxy'
+
+// Detalle de un insight por su id (insights.id, p. ej. generated_insight_id de una mención).
+export async function GET(request: NextRequest, { params }: { params: { id: string } }) {
+  try {
+    return await proxyGet(request, `/api/insights/${params.id}`)
+  } catch (error) {
+    console.error('Insight API Proxy Error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch insight' },
+      { status: 500 }
+    )
+  }
+}
@@ -30,7 +30,7 @@ export default function InboxPage() {
       const next = current.filter((c) => c.id !== id)
       mutate(next, { revalidate: false })
       try {
-        await fetch(`/api/insights/${id}`, {
+        await fetch(`/api/insight-items/${id}`, {
           method: "PATCH",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ done: true }),
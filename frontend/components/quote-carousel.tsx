@@ -9,7 +9,7 @@ import SentimentChip from "@/components/sentiment-chip"
 import { fetcher } from "@/libs/fetcher"
 import { cn } from "@/lib/utils"
 
-type QuoteItem = {
+export type QuoteItem = {
   text: string
   domain: string
   emotion: string
@@ -30,13 +30,14 @@ function sentimentFromEmotion(emotion: string): number {
   return 0
 }
 
-export function QuoteCarousel({ className }: { className?: string }) {
-  // Fetch exactly 5 quotes
-  const { data, isLoading } = useSWR<QuoteItem[]>(
-    "/api/insights?type=quote&limit=5",
+export function QuoteCarousel({ className, items }: { className?: string; items?: QuoteItem[] }) {
+  // Fetch exactly 5 quotes (salvo que el padre ya las tenga, p. ej. de /api/dashboard)
+  const { data, isLoading: fetching } = useSWR<QuoteItem[]>(
+    items ? null : "/api/insights?type=quote&limit=5",
     fetcher
   )
-  const quotes = data ?? []
+  const isLoading = !items && fetching
+  const quotes = items ?? data ?? []
   const len = quotes.length
 
   const [index, setIndex] = useState(0)
@@ -0,0 +1,34 @@
+// frontend/lib/backend-proxy.ts
+import { NextRequest, NextResponse } from 'next/server'
+
+export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5050'
+
+// Cabeceras de validación del backend: con ellas el navegador revalida con
+// If-None-Match y el backend contesta 304 sin volver a consultar la base de datos.
+const FORWARDED_HEADERS = ['etag', 'cache-control']
+
+export async function proxyGet(request: NextRequest, path: string) {
+  const queryString = request.nextUrl.searchParams.toString()
+  const headers: Record<string, string> = { 'Content-Type': 'application/json' }
+  const ifNoneMatch = request.headers.get('if-none-match')
+  if (ifNoneMatch) headers['If-None-Match'] = ifNoneMatch
+
+  const response = await fetch(`${API_BASE_URL}${path}${queryString ? `?${queryString}` : ''}`, {
+    method: 'GET',
+    headers,
+    cache: 'no-store',
+  })
+  if (response.status !== 304 && !response.ok) {
+    throw new Error(`Backend responded with ${response.status}`)
+  }
+
+  const forwarded = new Headers()
+  FORWARDED_HEADERS.forEach((name) => {
+    const value = response.headers.get(name)
+    if (value) forwarded.set(name, value)
+  })
+  if (response.status === 304) {
+    return new NextResponse(null, { status: 304, headers: forwarded })
+  }
+  return NextResponse.json(await response.json(), { headers: forwarded })
+}
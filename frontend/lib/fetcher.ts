@@ -1,5 +1,6 @@
+// "no-cache": el navegador revalida con If-None-Match y el backend responde 304 si nada cambió.
 export async function fetcher<T = unknown>(url: string): Promise<T> {
-  const res = await fetch(url, { cache: "no-store" })
+  const res = await fetch(url, { cache: "no-cache" })
   if (!res.ok) throw new Error("Failed to fetch " + url)
   return res.json()
 }
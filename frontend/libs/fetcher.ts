@@ -1,5 +1,6 @@
+// "no-cache": el navegador revalida con If-None-Match y el backend responde 304 si nada cambió.
 export async function fetcher<T>(url: string, init?: RequestInit): Promise<T> {
-  const res = await fetch(url, { cache: "no-store", ...init })
+  const res = await fetch(url, { cache: "no-cache", ...init })
   if (!res.ok) {
     throw new Error(`Failed to fetch ${url}: ${res.status} ${res.statusText}`)
   }
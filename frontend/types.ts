@@ -4,7 +4,7 @@ export interface Mention {
   id: number;
   engine: string;
   source: string;
-  response: string;
+  response?: string; // solo con include=response o en el detalle
   sentiment: number;
   emotion: string;
   confidence_score: number;